@@ -3,6 +3,7 @@ from app.api.v1.health import router as health_router
 from app.api.v1.subnet import router as subnet_router
 from app.api.v1.twitter import router as twitter_router
 from app.api.v1.task import router as task_router
+from app.api.v1.project import router as project_router
 
 router = APIRouter()
 
@@ -17,3 +18,6 @@ router.include_router(twitter_router, prefix="/twitter")
 
 # 注册任务路由
 router.include_router(task_router, prefix="/task")
+
+# 注册项目路由
+router.include_router(project_router, prefix="/project")
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from typing import Dict
+from app.core.metrics import metrics
 
 router = APIRouter(tags=["health"])
 
@@ -11,4 +12,14 @@ async def ping() -> Dict[str, str]:
     Returns:
         Dict[str, str]: 包含 "message" 字段的响应
     """
-    return {"message": "pong"}
\ No newline at end of file
+    return {"message": "pong"}
+
+@router.get("/metrics", response_model=Dict[str, float])
+async def get_metrics() -> Dict[str, float]:
+    """
+    运行指标接口
+    
+    Returns:
+        Dict[str, float]: 指标名称到数值的映射
+    """
+    return metrics.snapshot()
\ No newline at end of file
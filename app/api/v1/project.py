@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.schemas.project import ProjectListResponse
+from app.services.project import ProjectService
+from app.db.replica import get_read_db
+
+router = APIRouter(tags=["project"])
+
+@router.get("/list", response_model=ProjectListResponse)
+async def get_projects_list(
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    after_id: Optional[int] = Query(None, ge=0, description="分页游标，传入上一页返回的 next_cursor"),
+    cached: bool = Query(True, description="是否使用缓存的任务摘要，为 false 时实时统计"),
+    db: Session = Depends(get_read_db)
+) -> ProjectListResponse:
+    """
+    获取项目列表及每个项目的任务数量和最近任务时间
+    
+    Args:
+        limit: 每页数量 (1-100)
+        after_id: 分页游标（可选）
+        cached: 是否使用缓存的任务摘要
+        db: 数据库会话
+        
+    Returns:
+        ProjectListResponse: 项目列表响应
+        
+    Raises:
+        HTTPException: 当获取操作失败时抛出
+    """
+    try:
+        return ProjectService.get_projects_list(
+            db=db,
+            limit=limit,
+            after_id=after_id,
+            cached=cached
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get projects list: {str(e)}"
+        )
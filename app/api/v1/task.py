@@ -1,19 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.task import TaskCreate, TaskResponse, TaskListRequest, TaskListResponse
+from datetime import datetime
+from typing import Optional, Union
+from app.schemas.enums import ExportFormat, TaskType
+from app.schemas.task import TaskCreate, TaskResponse, TaskListRequest, TaskListResponse, QualifyingUsersResponse, MonitorReport
 from app.services.task import TaskService
+from app.services.qualifying import QualifyingService
+from app.services.monitor_reaper import monitor_reaper
 from app.db.base import get_db
+from app.db.replica import get_last_write, get_read_db, replica_router
+from app.core.config import get_settings
+from app.utils import Utils
+
+settings = get_settings()
 
 router = APIRouter(tags=["task"])
 
 @router.post("/create", response_model=TaskResponse)
 async def create_task(
     task_data: TaskCreate,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> TaskResponse:
     """
     创建新的任务和相关项目
     
+    配置备库时，成功响应头带有写入后的主库 WAL 位置，后续只读请求带上该请求头即可读到本次写入
+    
     Args:
         task_data: 任务创建请求数据
         db: 数据库会话
@@ -26,6 +40,10 @@ async def create_task(
     """
     try:
         result = await TaskService.create_task(db, task_data)
+        if result.get("success"):
+            token = replica_router.write_token(db)
+            if token:
+                response.headers[settings.READ_YOUR_WRITES_HEADER] = token
         return TaskResponse(**result)
     except HTTPException as e:
         # 重新抛出 HTTPException 以返回正确的状态码
@@ -39,10 +57,10 @@ async def create_task(
 @router.post("/list", response_model=TaskListResponse)
 async def get_tasks_list(
     request: TaskListRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> TaskListResponse:
     """
-    获取所有任务列表（带分页）
+    获取任务列表（带过滤和分页）
     
     Args:
         request: 任务列表请求数据
@@ -55,11 +73,196 @@ async def get_tasks_list(
         HTTPException: 当获取操作失败时抛出
     """
     try:
-        return TaskService.get_tasks_list(db=db, limit=request.limit, offset=request.offset)
+        return TaskService.get_tasks_list(
+            db=db,
+            limit=request.limit,
+            offset=request.offset,
+            user_wallet=request.user_wallet,
+            project_id=request.project_id,
+            task_type=request.type.value if request.type else None,
+            created_from=request.created_from,
+            created_to=request.created_to
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get tasks list: {str(e)}"
+        )
+
+@router.get("/list", response_model=TaskListResponse)
+async def query_tasks_list(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100, description="每页数量"),
+    offset: int = Query(0, ge=0, description="偏移量"),
+    user_wallet: Optional[str] = Query(None, description="用户钱包地址过滤"),
+    project_id: Optional[int] = Query(None, description="项目ID过滤"),
+    type: Optional[TaskType] = Query(None, description="任务类型过滤"),
+    created_from: Optional[datetime] = Query(None, description="创建时间下限，包含 (ISO format with Z)"),
+    created_to: Optional[datetime] = Query(None, description="创建时间上限，不包含 (ISO format with Z)"),
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag"),
+    db: Session = Depends(get_read_db)
+) -> Union[TaskListResponse, Response]:
+    """
+    获取任务列表（查询参数形式，带过滤和分页）
+    
+    响应带有 ETag，If-None-Match 匹配时返回 304，便于 HTTP 缓存与 CDN 复用
+    
+    Args:
+        limit: 每页数量 (1-100)
+        offset: 偏移量
+        user_wallet: 用户钱包地址（可选）
+        project_id: 项目ID（可选）
+        type: 任务类型（可选）
+        created_from: 创建时间下限（可选）
+        created_to: 创建时间上限（可选）
+        if_none_match: If-None-Match 请求头（可选）
+        db: 数据库会话
+        
+    Returns:
+        TaskListResponse: 任务列表响应
+        
+    Raises:
+        HTTPException: 当获取操作失败时抛出
+    """
+    filters = dict(
+        user_wallet=user_wallet,
+        project_id=project_id,
+        task_type=type.value if type else None,
+        created_from=created_from,
+        created_to=created_to
+    )
+    try:
+        etag = TaskService.get_tasks_list_etag(db=db, limit=limit, offset=offset, **filters)
+        headers = {"ETag": etag, "Cache-Control": settings.TASK_LIST_CACHE_CONTROL}
+        if Utils.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        result = TaskService.get_tasks_list(db=db, limit=limit, offset=offset, **filters)
+        response.headers.update(headers)
+        return result
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get tasks list: {str(e)}"
+        )
+
+@router.get("/export")
+async def export_tasks(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="导出格式 (ndjson, csv)"),
+    created_from: Optional[datetime] = Query(None, description="创建时间下限，包含 (ISO format with Z)"),
+    created_to: Optional[datetime] = Query(None, description="创建时间上限，不包含 (ISO format with Z)"),
+    type: Optional[TaskType] = Query(None, description="任务类型过滤"),
+    user_wallet: Optional[str] = Query(None, description="用户钱包地址过滤"),
+    last_write: Optional[int] = Depends(get_last_write)
+) -> StreamingResponse:
+    """
+    流式导出全部任务及其项目信息
+    
+    Args:
+        format: 导出格式
+        created_from: 创建时间下限（可选）
+        created_to: 创建时间上限（可选）
+        type: 任务类型（可选）
+        user_wallet: 用户钱包地址（可选）
+        last_write: 调用方最近一次写入的 WAL 位置（可选）
+        
+    Returns:
+        StreamingResponse: NDJSON 或 CSV 流
+        
+    Raises:
+        HTTPException: 当时间范围无效时抛出
+    """
+    if created_from and created_to and created_from >= created_to:
+        raise HTTPException(
+            status_code=400,
+            detail="created_from must be earlier than created_to"
+        )
+    
+    if format == ExportFormat.CSV:
+        media_type = "text/csv"
+        headers = {"Content-Disposition": "attachment; filename=tasks.csv"}
+    else:
+        media_type = "application/x-ndjson"
+        headers = {}
+    return StreamingResponse(
+        TaskService.export_tasks(
+            export_format=format,
+            created_from=created_from,
+            created_to=created_to,
+            task_type=type.value if type else None,
+            user_wallet=user_wallet,
+            last_write=last_write
+        ),
+        media_type=media_type,
+        headers=headers
+    )
+
+@router.get("/monitors/report", response_model=MonitorReport)
+async def get_monitor_report(
+    db: Session = Depends(get_read_db)
+) -> MonitorReport:
+    """
+    查询推文监控回收报告
+    
+    Args:
+        db: 数据库会话
+        
+    Returns:
+        MonitorReport: 有效、待回收与已回收的监控数量及回收统计
+        
+    Raises:
+        HTTPException: 当查询失败时抛出
+    """
+    try:
+        return monitor_reaper.report(db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get monitor report: {str(e)}"
+        )
+
+@router.get("/{task_id}/qualifying-users", response_model=QualifyingUsersResponse)
+async def get_qualifying_users(
+    task_id: int,
+    start_time: datetime = Query(..., description="开始时间 (ISO format with Z)"),
+    end_time: datetime = Query(..., description="结束时间 (ISO format with Z)"),
+    limit: int = Query(100, ge=1, le=1000, description="每页数量"),
+    offset: int = Query(0, ge=0, description="偏移量"),
+    db: Session = Depends(get_db)
+) -> QualifyingUsersResponse:
+    """
+    获取任务奖励窗口内 retweet 过任务推文的用户（带分页）
+    
+    Args:
+        task_id: 任务ID
+        start_time: 开始时间
+        end_time: 结束时间
+        limit: 每页数量 (1-1000)
+        offset: 偏移量
+        db: 数据库会话
+        
+    Returns:
+        QualifyingUsersResponse: 合格用户响应
+        
+    Raises:
+        HTTPException: 当获取操作失败时抛出
+    """
+    try:
+        return await QualifyingService.get_qualifying_users(
+            db=db,
+            task_id=task_id,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            offset=offset
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get qualifying users: {str(e)}"
         )
\ No newline at end of file
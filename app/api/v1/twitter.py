@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Query, HTTPException, Request
-from typing import Optional
+from fastapi import APIRouter, Query, HTTPException, Request, Response, Header
+from fastapi.responses import StreamingResponse
+from typing import Optional, Union
 from datetime import datetime
 import httpx
 
-from app.schemas.twitter import TwitterInteractionResponse, SubnetTweetTaskRequest, SubnetTweetTaskResponse, RetweetCheckRequest, RetweetCheckResponse
+from app.schemas.twitter import TwitterInteractionResponse, SubnetTweetTaskRequest, SubnetTweetTaskResponse, RetweetCheckRequest, RetweetCheckResponse, InteractionStatsResponse, LeaderboardResponse, LeaderboardRankResponse, MonitorFrequencyReport, InteractionChangefeedResponse
+from app.schemas.enums import StatsBucket
 from app.services.twitter import TwitterService
+from app.services.interaction_changefeed import InteractionChangefeedService
+from app.services.interaction_feed import interaction_feed
+from app.services.interaction_stats import InteractionStatsService
+from app.services.leaderboard import LeaderboardService
+from app.services.monitor_frequency import monitor_frequency_manager
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -12,17 +19,21 @@ router = APIRouter(tags=["twitter"])
 
 @router.get("/{media_account}/interactions", response_model=TwitterInteractionResponse)
 async def get_twitter_interactions(
+    response: Response,
     media_account: str,
     page: int = Query(1, ge=1, description="页码"),
     per_page: int = Query(10, ge=1, le=100, description="每页数量"),
     username: Optional[str] = Query(None, description="用户名过滤"),
     x_id: Optional[str] = Query(None, description="用户ID过滤"),
     start_time: Optional[datetime] = Query(None, description="开始时间 (ISO format with Z)"),
-    end_time: Optional[datetime] = Query(None, description="结束时间 (ISO format with Z)")
-) -> TwitterInteractionResponse:
+    end_time: Optional[datetime] = Query(None, description="结束时间 (ISO format with Z)"),
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag")
+) -> Union[TwitterInteractionResponse, Response]:
     """
     获取 Twitter 互动数据
     
+    响应带有 ETag，If-None-Match 匹配时返回 304
+    
     Args:
         media_account: 媒体账号
         page: 页码 (>= 1)
@@ -31,10 +42,12 @@ async def get_twitter_interactions(
         x_id: 用户ID过滤（可选）
         start_time: 开始时间（可选，格式：YYYY-MM-DDTHH:mm:ssZ）
         end_time: 结束时间（可选，格式：YYYY-MM-DDTHH:mm:ssZ）
+        if_none_match: If-None-Match 请求头（可选）
     """
     try:
-        return await TwitterService.get_interactions(
+        result, etag = await TwitterService.get_interactions_conditional(
             media_account=media_account,
+            if_none_match=if_none_match,
             page=page,
             per_page=per_page,
             username=username,
@@ -42,6 +55,11 @@ async def get_twitter_interactions(
             start_time=start_time,
             end_time=end_time
         )
+        headers = {"ETag": etag, "Cache-Control": settings.INTERACTIONS_CACHE_CONTROL}
+        if result is None:
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return result
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -50,6 +68,153 @@ async def get_twitter_interactions(
             detail=f"Failed to get Twitter interactions: {str(e)}"
         )
 
+@router.get("/{media_account}/interactions/changes", response_model=InteractionChangefeedResponse)
+async def get_twitter_interaction_changes(
+    media_account: str,
+    cursor: Optional[str] = Query(None, description="上一次响应的 next_cursor"),
+    start_time: Optional[datetime] = Query(None, description="没有游标时的开始时间 (ISO format with Z)，默认且不能晚于 settled_until"),
+    limit: int = Query(100, ge=1, le=100, description="每次查询的最大数量")
+) -> InteractionChangefeedResponse:
+    """
+    增量获取 Twitter 互动数据
+    
+    返回游标之后的新互动与新游标，调用方保存 next_cursor 用于下一次请求；has_more 为 true 时可立即再次请求。
+    只返回 settled_until 之前已稳定的互动
+    
+    Args:
+        media_account: 媒体账号
+        cursor: 游标（可选）
+        start_time: 开始时间（可选，仅在没有游标时使用）
+        limit: 每次查询的最大数量 (1-100)
+    """
+    try:
+        return await InteractionChangefeedService.get_changes(
+            media_account=media_account,
+            cursor=cursor,
+            start_time=start_time,
+            limit=limit
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get Twitter interaction changes: {str(e)}"
+        )
+
+@router.get("/{media_account}/interactions/stream")
+async def stream_twitter_interactions(media_account: str) -> StreamingResponse:
+    """
+    以 Server-Sent Events 实时推送 Twitter 互动数据
+    
+    同一媒体账号的所有订阅者共享一个上游轮询器，消费过慢的订阅者会被断开
+    
+    Args:
+        media_account: 媒体账号
+    """
+    return StreamingResponse(
+        interaction_feed.stream(media_account, heartbeat=settings.FEED_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@router.get("/{media_account}/stats", response_model=InteractionStatsResponse)
+async def get_twitter_interaction_stats(
+    media_account: str,
+    start_time: datetime = Query(..., description="开始时间 (ISO format with Z)"),
+    end_time: Optional[datetime] = Query(None, description="结束时间 (ISO format with Z)，默认当前时间"),
+    bucket: StatsBucket = Query(StatsBucket.HOUR, description="时间粒度 (minute, hour, day)")
+) -> InteractionStatsResponse:
+    """
+    按时间桶统计 Twitter 互动数量
+    
+    Args:
+        media_account: 媒体账号
+        start_time: 开始时间
+        end_time: 结束时间（可选）
+        bucket: 时间粒度
+    """
+    try:
+        return await InteractionStatsService.get_stats(
+            media_account=media_account,
+            bucket=bucket,
+            start_time=start_time,
+            end_time=end_time
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get Twitter interaction stats: {str(e)}"
+        )
+
+@router.get("/{media_account}/leaderboard", response_model=LeaderboardResponse)
+async def get_twitter_leaderboard(
+    media_account: str,
+    limit: int = Query(10, ge=1, le=100, description="返回数量"),
+    since: Optional[datetime] = Query(None, description="窗口开始时间 (ISO format with Z)，为空时返回全部历史排名")
+) -> LeaderboardResponse:
+    """
+    获取媒体账号的加权互动排行榜
+    
+    Args:
+        media_account: 媒体账号
+        limit: 返回数量 (1-100)
+        since: 窗口开始时间（可选，按最近的快照对齐）
+    """
+    try:
+        return await LeaderboardService.get_leaderboard(
+            media_account=media_account,
+            limit=limit,
+            since=since
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get leaderboard: {str(e)}"
+        )
+
+@router.get("/{media_account}/leaderboard/{user_id}", response_model=LeaderboardRankResponse)
+async def get_twitter_leaderboard_rank(
+    media_account: str,
+    user_id: str
+) -> LeaderboardRankResponse:
+    """
+    查询用户在媒体账号排行榜中的排名
+    
+    Args:
+        media_account: 媒体账号
+        user_id: 用户ID
+    """
+    try:
+        return await LeaderboardService.get_user_rank(
+            media_account=media_account,
+            user_id=user_id
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get leaderboard rank: {str(e)}"
+        )
+
+@router.get("/monitor-frequency", response_model=MonitorFrequencyReport)
+async def get_monitor_frequency_report() -> MonitorFrequencyReport:
+    """
+    查询推文监控频率自适应调整报告
+    
+    Returns:
+        MonitorFrequencyReport: 各推文当前更新频率、互动速度与节省的采集服务请求数
+    """
+    return monitor_frequency_manager.report()
+
 @router.post("/tweet_monitor")
 @router.put("/tweet_monitor")
 @router.delete("/tweet_monitor")
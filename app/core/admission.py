@@ -0,0 +1,248 @@
+import asyncio
+import fnmatch
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+settings = get_settings()
+
+# 不做准入控制的路由类别
+EXEMPT_CLASS = "exempt"
+# 未匹配任何规则的路由类别
+DEFAULT_CLASS = "default"
+
+
+class _RouteClassState:
+    """单个路由类别的并发与排队状态"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        # CoDel: 排队时间首次超过目标值后，持续一个观察周期才进入丢弃状态
+        self.first_above_time = 0.0
+        self.dropping = False
+
+
+class AdmissionController:
+    """
+    请求准入控制
+
+    按路由类别限制并发；超过并发上限的请求排队等待，队列满或等待超时时直接拒绝。
+    排队时间参照 CoDel：排队时间持续一个观察周期都高于目标值时进入过载状态，
+    之后新排队的请求最多只等待目标时间，避免所有请求都排队到超时。
+    事件循环延迟超过上限时，新请求直接拒绝。
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        max_queue: int,
+        queue_timeout: float,
+        target_delay: float,
+        interval: float,
+        max_loop_lag: float
+    ):
+        self._limits = limits
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._target_delay = target_delay
+        self._interval = interval
+        self._max_loop_lag = max_loop_lag
+        self._classes: Dict[str, _RouteClassState] = {}
+        self._loop_lag = 0.0
+        self._monitor: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """启动事件循环延迟监测"""
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._monitor_loop_lag())
+
+    async def stop(self) -> None:
+        """停止事件循环延迟监测"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+
+    async def _monitor_loop_lag(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, time.monotonic() - start - self._interval)
+            # 指数平滑，避免单次抖动触发拒绝
+            self._loop_lag = 0.7 * self._loop_lag + 0.3 * lag
+
+    def _state(self, route_class: str) -> _RouteClassState:
+        state = self._classes.get(route_class)
+        if state is None:
+            limit = self._limits.get(route_class, self._limits.get(DEFAULT_CLASS, 64))
+            state = self._classes[route_class] = _RouteClassState(limit)
+        return state
+
+    async def admit(self, route_class: str) -> Optional[str]:
+        """
+        申请执行一个请求，获得许可后需要调用 release
+
+        Args:
+            route_class: 路由类别
+
+        Returns:
+            Optional[str]: 被拒绝时返回原因，获得许可时返回 None
+        """
+        if self._max_loop_lag > 0 and self._loop_lag > self._max_loop_lag:
+            return "loop_lag"
+        state = self._state(route_class)
+        if state.in_flight < state.limit and not state.waiters:
+            state.in_flight += 1
+            return None
+        if len(state.waiters) >= self._max_queue:
+            return "queue_full"
+
+        enqueued = time.monotonic()
+        timeout = self._target_delay if state.dropping else self._queue_timeout
+        future = asyncio.get_running_loop().create_future()
+        state.waiters.append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # 超时的同时获得了许可，正常执行
+                pass
+            else:
+                self._abandon(state, future)
+                self._observe_delay(state, time.monotonic() - enqueued)
+                return "queue_timeout"
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(route_class)
+            else:
+                self._abandon(state, future)
+            raise
+        self._observe_delay(state, time.monotonic() - enqueued)
+        return None
+
+    @staticmethod
+    def _abandon(state: _RouteClassState, future: asyncio.Future) -> None:
+        # 放弃排队的请求立即移出队列，否则在下一次 release 之前仍占用队列长度
+        future.cancel()
+        try:
+            state.waiters.remove(future)
+        except ValueError:
+            pass
+
+    def _observe_delay(self, state: _RouteClassState, delay: float) -> None:
+        now = time.monotonic()
+        if delay < self._target_delay:
+            state.first_above_time = 0.0
+            state.dropping = False
+        elif state.first_above_time == 0.0:
+            state.first_above_time = now + self._interval
+        elif now >= state.first_above_time:
+            state.dropping = True
+
+    def release(self, route_class: str) -> None:
+        """
+        请求执行结束，把许可交给下一个排队的请求
+
+        Args:
+            route_class: 路由类别
+        """
+        state = self._state(route_class)
+        while state.waiters:
+            future = state.waiters.popleft()
+            if not future.done():
+                # 许可直接转交，执行中数量不变
+                future.set_result(None)
+                return
+        state.in_flight -= 1
+        if not state.in_flight:
+            # 空闲时退出过载状态
+            state.first_above_time = 0.0
+            state.dropping = False
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出准入控制指标
+
+        Returns:
+            Dict[str, float]: 各路由类别的执行中、排队数量与过载状态，以及事件循环延迟
+        """
+        result = {"event_loop_lag_seconds": self._loop_lag}
+        for route_class, state in self._classes.items():
+            result[f"admission_in_flight_{route_class}"] = float(state.in_flight)
+            result[f"admission_queued_{route_class}"] = float(len(state.waiters))
+            result[f"admission_dropping_{route_class}"] = 1.0 if state.dropping else 0.0
+        return result
+
+
+class AdmissionMiddleware:
+    """
+    准入控制中间件
+
+    按路径匹配路由类别，获得许可后才进入后续处理；被拒绝的请求立即返回 503 与 Retry-After。
+    exempt 类别（如健康检查）不受限制。
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, route_classes: Dict[str, str], retry_after: int):
+        self.app = app
+        self.controller = controller
+        self.route_classes = route_classes
+        self.retry_after = retry_after
+
+    def _route_class(self, path: str) -> str:
+        for pattern, route_class in self.route_classes.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return route_class
+        return DEFAULT_CLASS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self._route_class(scope["path"])
+        if route_class == EXEMPT_CLASS:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self.controller.admit(route_class)
+        if reason is not None:
+            metrics.inc(f"admission_shed_{route_class}_{reason}")
+            logger.warning(f"请求被拒绝: {scope['method']} {scope['path']}, class={route_class}, reason={reason}")
+            await self._send_overloaded(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+    async def _send_overloaded(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is overloaded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+admission_controller = AdmissionController(
+    limits=settings.admission_limits,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    target_delay=settings.ADMISSION_TARGET_DELAY_SECONDS,
+    interval=settings.ADMISSION_INTERVAL_SECONDS,
+    max_loop_lag=settings.ADMISSION_MAX_LOOP_LAG_SECONDS
+)
+metrics.register_collector(admission_controller.stats)
@@ -0,0 +1,172 @@
+import hashlib
+import math
+from typing import List, Tuple
+
+
+def hash_item(item: str) -> Tuple[int, int]:
+    """
+    计算元素的两个 64 位哈希分量（双重哈希）
+
+    Args:
+        item: 元素
+
+    Returns:
+        Tuple[int, int]: (h1, h2)，h2 为奇数
+    """
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """
+    定长布隆过滤器
+
+    以 hash_item 的两个分量做双重哈希生成 k 个位置。
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        """
+        Args:
+            capacity: 预期元素数量
+            fp_rate: 达到预期数量时的目标误判率
+        """
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @staticmethod
+    def size_in_bytes(capacity: int, fp_rate: float) -> int:
+        """
+        计算指定容量与误判率所需的字节数
+
+        Args:
+            capacity: 预期元素数量
+            fp_rate: 目标误判率
+
+        Returns:
+            int: 位数组字节数
+        """
+        num_bits = max(8, int(math.ceil(-max(1, capacity) * math.log(fp_rate) / (math.log(2) ** 2))))
+        return (num_bits + 7) // 8
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def add(self, item: str) -> bool:
+        """
+        添加元素
+
+        Args:
+            item: 元素
+
+        Returns:
+            bool: 元素此前可能已存在时返回 False
+        """
+        return self.add_hashed(*hash_item(item))
+
+    def add_hashed(self, h1: int, h2: int) -> bool:
+        bits = self._bits
+        m = self.num_bits
+        added = False
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return self.contains_hashed(*hash_item(item))
+
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        bits = self._bits
+        m = self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def estimated_fp_rate(self) -> float:
+        """
+        按当前元素数量估算误判率
+
+        Returns:
+            float: 估算误判率
+        """
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class ScalableBloomFilter:
+    """
+    可扩展布隆过滤器
+
+    当前分段写满后追加一个容量翻倍、误判率减半的新分段，使整体误判率收敛于目标值；
+    总内存达到上限后不再扩展，继续写入最后一个分段（误判率随之上升）。
+    """
+
+    def __init__(self, initial_capacity: int, fp_rate: float, max_bytes: int):
+        """
+        Args:
+            initial_capacity: 第一个分段的容量
+            fp_rate: 整体目标误判率
+            max_bytes: 内存上限（字节）
+        """
+        self.fp_rate = fp_rate
+        self.max_bytes = max_bytes
+        self.stages: List[BloomFilter] = [BloomFilter(initial_capacity, fp_rate / 2)]
+
+    @property
+    def count(self) -> int:
+        return sum(stage.count for stage in self.stages)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(stage.nbytes for stage in self.stages)
+
+    def add(self, item: str) -> None:
+        """
+        添加元素
+
+        Args:
+            item: 元素
+        """
+        hashed = hash_item(item)
+        if self._contains(hashed):
+            return
+        stage = self.stages[-1]
+        if stage.count >= stage.capacity:
+            capacity = stage.capacity * 2
+            stage_fp = stage.fp_rate / 2
+            if self.nbytes + BloomFilter.size_in_bytes(capacity, stage_fp) <= self.max_bytes:
+                stage = BloomFilter(capacity, stage_fp)
+                self.stages.append(stage)
+        stage.add_hashed(*hashed)
+
+    def __contains__(self, item: str) -> bool:
+        return self._contains(hash_item(item))
+
+    def _contains(self, hashed: Tuple[int, int]) -> bool:
+        for stage in self.stages:
+            if stage.contains_hashed(*hashed):
+                return True
+        return False
+
+    def estimated_fp_rate(self) -> float:
+        """
+        估算整体误判率
+
+        Returns:
+            float: 估算误判率
+        """
+        miss = 1.0
+        for stage in self.stages:
+            miss *= 1 - stage.estimated_fp_rate()
+        return 1 - miss
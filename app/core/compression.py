@@ -0,0 +1,157 @@
+import zlib
+from typing import Dict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 未安装 brotli 时只协商 gzip、deflate
+    brotli = None
+
+# 采集服务请求头，只声明能够解码的压缩格式
+UPSTREAM_ACCEPT_ENCODING: Dict[str, str] = {
+    "Accept-Encoding": "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+}
+
+
+class DecodedSizeExceeded(ValueError):
+    """解压后的内容超过上限"""
+
+
+class ContentDecoder:
+    """
+    按 Content-Encoding 增量解压上游响应
+
+    逐块解压，解压后的总大小超过 max_size 时抛出 DecodedSizeExceeded，
+    gzip、deflate 每块最多只解压到上限多一个字节，压缩炸弹不会在内存中展开。
+    """
+
+    def __init__(self, content_encoding: str, max_size: int):
+        """
+        Args:
+            content_encoding: Content-Encoding 响应头，空表示未压缩
+            max_size: 解压后的最大字节数
+
+        Raises:
+            ValueError: 压缩格式不支持时抛出
+        """
+        encoding = content_encoding.strip().lower()
+        self._max_size = max_size
+        self.size = 0
+        self._raw_deflate_fallback = False
+        self._zlib = encoding in ("gzip", "x-gzip", "deflate")
+        if encoding in ("", "identity"):
+            self._decompressor = None
+        elif encoding in ("gzip", "x-gzip"):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._decompressor = zlib.decompressobj()
+            # 部分服务端发送不带 zlib 头的原始 deflate 数据，首块解压失败时改用原始 deflate
+            self._raw_deflate_fallback = True
+        elif encoding == "br" and brotli is not None:
+            self._decompressor = brotli.Decompressor()
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+
+    def _check(self, data: bytes) -> bytes:
+        self.size += len(data)
+        if self.size > self._max_size:
+            raise DecodedSizeExceeded(f"Decoded content exceeds {self._max_size} bytes")
+        return data
+
+    def decode(self, chunk: bytes) -> bytes:
+        """
+        解压一块原始（压缩）内容
+
+        Args:
+            chunk: 原始内容块
+
+        Returns:
+            bytes: 解压后的内容
+        """
+        if self._decompressor is None:
+            return self._check(chunk)
+        if self._zlib:
+            try:
+                data = self._decompressor.decompress(chunk, self._max_size - self.size + 1)
+            except zlib.error:
+                if not self._raw_deflate_fallback:
+                    raise
+                self._raw_deflate_fallback = False
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                data = self._decompressor.decompress(chunk, self._max_size - self.size + 1)
+            self._raw_deflate_fallback = False
+            return self._check(data)
+        return self._check(self._decompressor.process(chunk))
+
+    def flush(self) -> bytes:
+        """
+        结束解压，返回剩余内容
+
+        Returns:
+            bytes: 剩余的解压内容
+        """
+        if self._zlib:
+            return self._check(self._decompressor.flush())
+        return b""
+
+
+# gzip 响应的 ETag 后缀，压缩与未压缩的表示使用不同的 ETag
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def _strip_etag_suffix(if_none_match: str) -> str:
+    """去掉 If-None-Match 中各 ETag 的 gzip 后缀，路由按未压缩的 ETag 比较"""
+    suffix = GZIP_ETAG_SUFFIX + '"'
+    candidates = []
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.endswith(suffix):
+            candidate = candidate[:-len(suffix)] + '"'
+        candidates.append(candidate)
+    return ", ".join(candidates)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    按大小阈值压缩响应的 gzip 中间件
+
+    小于 minimum_size 的响应不压缩。Server-Sent Events 请求直接透传，
+    避免压缩器缓冲事件流导致推送延迟。
+    带 ETag 的响应总是带上 Vary: Accept-Encoding；gzip 响应的 ETag 追加 -gzip 后缀，
+    请求的 If-None-Match 去掉后缀后再交给路由比较，304 响应沿用客户端持有的 ETag。
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if "text/event-stream" in headers.get("Accept", ""):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = headers.get("If-None-Match", "")
+        if GZIP_ETAG_SUFFIX in if_none_match:
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, _strip_etag_suffix(value.decode("latin-1")).encode("latin-1") if key == b"if-none-match" else value)
+                for key, value in scope["headers"]
+            ]
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(raw=message["headers"])
+                etag = response_headers.get("ETag")
+                if etag:
+                    if "accept-encoding" not in response_headers.get("Vary", "").lower():
+                        response_headers.add_vary_header("Accept-Encoding")
+                    gzip_etag = etag[:-1] + GZIP_ETAG_SUFFIX + '"'
+                    gzipped = response_headers.get("Content-Encoding") == "gzip"
+                    if gzipped or (message["status"] == 304 and gzip_etag.removeprefix("W/") in if_none_match):
+                        response_headers["ETag"] = gzip_etag
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_etag)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 from functools import lru_cache
 import os
 from dotenv import load_dotenv
@@ -18,17 +18,255 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "flux_middle")
     DB_USER: str = os.getenv("DB_USER", "litterpigger")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    # 只读备库连接 URL，逗号分隔；未配置时只读查询也使用主库
+    DB_REPLICA_URLS: str = os.getenv("DB_REPLICA_URLS", "")
+    # 复制延迟超过该值的备库移出轮询
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+    # 写入接口返回、只读接口接收的最近写入 WAL 位置请求头（如 16/B374D848），用于读到自己的写入
+    READ_YOUR_WRITES_HEADER: str = os.getenv("READ_YOUR_WRITES_HEADER", "X-Last-Write")
     FLUX_URL: str = os.getenv("FLUX_URL", "")
     
     # Twitter 采集服务配置
     TWITTER_SERVER_IP: str = os.getenv("TWITTER_SERVER_IP", "")
     TWITTER_SERVER_PORT: int = int(os.getenv("TWITTER_SERVER_PORT", "5005"))
     
+    # Retweet 检测结果缓存配置
+    RETWEET_CACHE_MAX_KEYS: int = int(os.getenv("RETWEET_CACHE_MAX_KEYS", "100000"))
+    RETWEET_CACHE_POSITIVE_TTL_SECONDS: int = int(os.getenv("RETWEET_CACHE_POSITIVE_TTL_SECONDS", "604800"))
+    RETWEET_CACHE_CLOSED_TTL_SECONDS: int = int(os.getenv("RETWEET_CACHE_CLOSED_TTL_SECONDS", "86400"))
+    RETWEET_CACHE_OPEN_TTL_SECONDS: int = int(os.getenv("RETWEET_CACHE_OPEN_TTL_SECONDS", "60"))
+    # 采集服务入库延迟，实际使用 interaction_settle_seconds（不小于推文监控的最长更新间隔）
+    RETWEET_CACHE_SETTLE_SECONDS: int = int(os.getenv("RETWEET_CACHE_SETTLE_SECONDS", "3600"))
+    
+    # 每个帖子的 retweet 用户布隆过滤器配置
+    RETWEETER_FILTER_ENABLED: bool = os.getenv("RETWEETER_FILTER_ENABLED", "true").lower() == "true"
+    RETWEETER_FILTER_FP_RATE: float = float(os.getenv("RETWEETER_FILTER_FP_RATE", "0.01"))
+    RETWEETER_FILTER_INITIAL_CAPACITY: int = int(os.getenv("RETWEETER_FILTER_INITIAL_CAPACITY", "10000"))
+    RETWEETER_FILTER_MAX_BYTES_PER_POST: int = int(os.getenv("RETWEETER_FILTER_MAX_BYTES_PER_POST", str(4 * 1024 * 1024)))
+    RETWEETER_FILTER_MAX_POSTS: int = int(os.getenv("RETWEETER_FILTER_MAX_POSTS", "1000"))
+    RETWEETER_FILTER_REFRESH_SECONDS: int = int(os.getenv("RETWEETER_FILTER_REFRESH_SECONDS", "60"))
+    # 扫描失败后的重试退避时间
+    RETWEETER_FILTER_RETRY_SECONDS: int = int(os.getenv("RETWEETER_FILTER_RETRY_SECONDS", "300"))
+    
+    # 互动数据实时订阅（SSE）配置
+    FEED_POLL_INTERVAL_SECONDS: float = float(os.getenv("FEED_POLL_INTERVAL_SECONDS", "5"))
+    FEED_QUEUE_SIZE: int = int(os.getenv("FEED_QUEUE_SIZE", "500"))
+    FEED_HEARTBEAT_SECONDS: float = float(os.getenv("FEED_HEARTBEAT_SECONDS", "15"))
+    
+    # 采集服务多页遍历配置：去重用的已见 interaction_id 上限，total_items 减少时的回退次数上限，检测到遗漏时的补扫次数上限
+    SNAPSHOT_SEEN_MAX_IDS: int = int(os.getenv("SNAPSHOT_SEEN_MAX_IDS", "100000"))
+    SNAPSHOT_MAX_STEP_BACKS: int = int(os.getenv("SNAPSHOT_MAX_STEP_BACKS", "3"))
+    SNAPSHOT_MAX_RESCANS: int = int(os.getenv("SNAPSHOT_MAX_RESCANS", "1"))
+    
+    # 互动统计已关闭时间桶缓存上限
+    STATS_CACHE_MAX_BUCKETS: int = int(os.getenv("STATS_CACHE_MAX_BUCKETS", "100000"))
+    
+    # 互动排行榜配置，权重格式: 互动类型:权重，逗号分隔
+    LEADERBOARD_WEIGHTS: str = os.getenv("LEADERBOARD_WEIGHTS", "like:1,reply:2,quote:3,retweet:3")
+    LEADERBOARD_REFRESH_SECONDS: int = int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "30"))
+    LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS: int = int(os.getenv("LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS", "3600"))
+    LEADERBOARD_MAX_SNAPSHOTS: int = int(os.getenv("LEADERBOARD_MAX_SNAPSHOTS", "48"))
+    # 内存中最多保留的账号排行榜数量，超出时淘汰最久未访问的账号
+    LEADERBOARD_MAX_ACCOUNTS: int = int(os.getenv("LEADERBOARD_MAX_ACCOUNTS", "200"))
+    
+    # 后台 retweet 持续校验配置
+    VERIFIER_ENABLED: bool = os.getenv("VERIFIER_ENABLED", "false").lower() == "true"
+    VERIFIER_INTERVAL_SECONDS: float = float(os.getenv("VERIFIER_INTERVAL_SECONDS", "300"))
+    VERIFIER_BATCH_SIZE: int = int(os.getenv("VERIFIER_BATCH_SIZE", "100"))
+    # 相邻两次推送到 Flux 的最小间隔
+    VERIFIER_PUSH_INTERVAL_SECONDS: float = float(os.getenv("VERIFIER_PUSH_INTERVAL_SECONDS", "1"))
+    FLUX_VERIFICATION_PATH: str = os.getenv("FLUX_VERIFICATION_PATH", "/v1/task-verification/batch")
+    
+    # 响应 gzip 压缩配置，小于 RESPONSE_GZIP_MIN_SIZE 字节的响应不压缩
+    RESPONSE_GZIP_ENABLED: bool = os.getenv("RESPONSE_GZIP_ENABLED", "true").lower() == "true"
+    RESPONSE_GZIP_MIN_SIZE: int = int(os.getenv("RESPONSE_GZIP_MIN_SIZE", "1024"))
+    RESPONSE_GZIP_LEVEL: int = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+    
+    # 单请求性能分析配置，开启后携带 PROFILING_HEADER 请求头（值需等于 PROFILING_TOKEN，未配置令牌时任意值）的请求会被分析
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_HEADER: str = os.getenv("PROFILING_HEADER", "X-Profile")
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    
+    # 请求截止时间配置，客户端可通过 REQUEST_DEADLINE_HEADER 请求头（秒数）缩短截止时间
+    REQUEST_DEADLINE_ENABLED: bool = os.getenv("REQUEST_DEADLINE_ENABLED", "true").lower() == "true"
+    REQUEST_DEADLINE_HEADER: str = os.getenv("REQUEST_DEADLINE_HEADER", "X-Request-Timeout")
+    REQUEST_DEADLINE_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", "30"))
+    REQUEST_DEADLINE_MAX_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_MAX_SECONDS", "120"))
+    # 按路由配置的默认截止时间，格式: 路径通配符:秒数，逗号分隔，0 表示不限（流式接口）
+    REQUEST_DEADLINE_ROUTES: str = os.getenv("REQUEST_DEADLINE_ROUTES", "/api/v1/twitter/*/interactions/stream:0,/api/v1/task/export:0")
+    # 上游请求（采集服务、Flux）的超时上限，请求有截止时间时取两者较小值
+    UPSTREAM_TIMEOUT_SECONDS: float = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "30"))
+    # 采集服务响应逐块读取的块大小与解压后的最大字节数
+    UPSTREAM_READ_CHUNK_BYTES: int = int(os.getenv("UPSTREAM_READ_CHUNK_BYTES", str(64 * 1024)))
+    UPSTREAM_MAX_DECODED_BYTES: int = int(os.getenv("UPSTREAM_MAX_DECODED_BYTES", str(32 * 1024 * 1024)))
+    
+    # 推文监控更新频率自适应调整配置
+    MONITOR_FREQUENCY_ENABLED: bool = os.getenv("MONITOR_FREQUENCY_ENABLED", "false").lower() == "true"
+    MONITOR_FREQUENCY_INTERVAL_SECONDS: float = float(os.getenv("MONITOR_FREQUENCY_INTERVAL_SECONDS", "300"))
+    # 新建监控任务使用的默认更新频率（分钟）
+    MONITOR_DEFAULT_FREQUENCY_MINUTES: int = int(os.getenv("MONITOR_DEFAULT_FREQUENCY_MINUTES", "10"))
+    # 可选的更新频率档位（分钟，逗号分隔），只使用 MIN 与 MAX 之间的档位
+    MONITOR_FREQUENCY_LEVELS: str = os.getenv("MONITOR_FREQUENCY_LEVELS", "5,10,15,30,60,120,180,360")
+    MONITOR_MIN_FREQUENCY_MINUTES: int = int(os.getenv("MONITOR_MIN_FREQUENCY_MINUTES", "5"))
+    MONITOR_MAX_FREQUENCY_MINUTES: int = int(os.getenv("MONITOR_MAX_FREQUENCY_MINUTES", "360"))
+    # 统计互动速度的观察窗口（分钟）
+    MONITOR_VELOCITY_WINDOW_MINUTES: int = int(os.getenv("MONITOR_VELOCITY_WINDOW_MINUTES", "60"))
+    # 每次轮询期望采集到的新互动数，决定理想更新间隔
+    MONITOR_TARGET_INTERACTIONS_PER_POLL: float = float(os.getenv("MONITOR_TARGET_INTERACTIONS_PER_POLL", "20"))
+    # 滞后系数：理想间隔超出当前间隔的该倍数区间才调整
+    MONITOR_FREQUENCY_HYSTERESIS: float = float(os.getenv("MONITOR_FREQUENCY_HYSTERESIS", "1.5"))
+    # 放慢更新频率前当前频率需要保持的最短时间
+    MONITOR_FREQUENCY_MIN_DWELL_SECONDS: float = float(os.getenv("MONITOR_FREQUENCY_MIN_DWELL_SECONDS", "1800"))
+    
+    # 互动变更流配置，时间窗口随数据密度在 1 秒与上限之间自适应调整
+    CHANGEFEED_INITIAL_WINDOW_SECONDS: int = int(os.getenv("CHANGEFEED_INITIAL_WINDOW_SECONDS", "3600"))
+    CHANGEFEED_MAX_WINDOW_SECONDS: int = int(os.getenv("CHANGEFEED_MAX_WINDOW_SECONDS", "86400"))
+    # 在账号推文的最长更新间隔之外额外等待的入库时间
+    CHANGEFEED_SETTLE_MARGIN_SECONDS: int = int(os.getenv("CHANGEFEED_SETTLE_MARGIN_SECONDS", "60"))
+    
+    # 到期推文监控回收配置
+    REAPER_ENABLED: bool = os.getenv("REAPER_ENABLED", "false").lower() == "true"
+    REAPER_INTERVAL_SECONDS: float = float(os.getenv("REAPER_INTERVAL_SECONDS", "600"))
+    # 每批处理的到期任务数量
+    REAPER_BATCH_SIZE: int = int(os.getenv("REAPER_BATCH_SIZE", "100"))
+    # DELETE /subnet_tweet_task 的最大并发数
+    REAPER_CONCURRENCY: int = int(os.getenv("REAPER_CONCURRENCY", "4"))
+    
+    # 准入控制配置，路由类别格式: 路径通配符:类别，逗号分隔，exempt 类别不受限制，未匹配的路由为 default
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_ROUTE_CLASSES: str = os.getenv(
+        "ADMISSION_ROUTE_CLASSES",
+        "/api/v1/health/*:exempt,/api/v1/twitter/*/interactions/stream:sse,/api/v1/task/export:stream,/api/v1/task/create:write"
+    )
+    # 各路由类别的并发上限，格式: 类别:并发数，逗号分隔
+    # SSE 连接在整个订阅期间占用许可，sse 的上限即单进程同时在线的订阅数；同一账号的订阅共用一个轮询任务，开销主要是连接本身
+    ADMISSION_LIMITS: str = os.getenv("ADMISSION_LIMITS", "default:64,write:16,stream:32,sse:1024")
+    # 每个类别最多排队的请求数与排队最长等待时间
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "1"))
+    # CoDel 目标排队时间与观察周期，排队时间持续一个周期高于目标值时，新排队请求最多等待目标时间
+    ADMISSION_TARGET_DELAY_SECONDS: float = float(os.getenv("ADMISSION_TARGET_DELAY_SECONDS", "0.05"))
+    ADMISSION_INTERVAL_SECONDS: float = float(os.getenv("ADMISSION_INTERVAL_SECONDS", "0.1"))
+    # 事件循环延迟超过该值时直接拒绝新请求，0 表示不检查
+    ADMISSION_MAX_LOOP_LAG_SECONDS: float = float(os.getenv("ADMISSION_MAX_LOOP_LAG_SECONDS", "0.5"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+    
+    # 链路追踪配置，导出器可选 stdout（每个 span 一行 JSON）或 memory（保存在内存中，用于测试）
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "stdout")
+    
+    # 各接口的 Cache-Control 响应头，配合 ETag 条件请求使用
+    INTERACTIONS_CACHE_CONTROL: str = os.getenv("INTERACTIONS_CACHE_CONTROL", "private, no-cache")
+    TASK_LIST_CACHE_CONTROL: str = os.getenv("TASK_LIST_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+    
+    # 任务导出时每批从服务端游标读取的行数
+    TASK_EXPORT_BATCH_SIZE: int = int(os.getenv("TASK_EXPORT_BATCH_SIZE", "1000"))
+    
+    # 采集服务上游请求调度配置
+    OUTBOUND_MAX_CONCURRENCY: int = int(os.getenv("OUTBOUND_MAX_CONCURRENCY", "16"))
+    # 为交互请求保留的并发数，批量请求最多使用 OUTBOUND_MAX_CONCURRENCY - 该值
+    OUTBOUND_INTERACTIVE_RESERVED: int = int(os.getenv("OUTBOUND_INTERACTIVE_RESERVED", "4"))
+    # 媒体账号权重，格式: 媒体账号:权重，逗号分隔，未配置的账号权重为 1
+    OUTBOUND_ACCOUNT_WEIGHTS: str = os.getenv("OUTBOUND_ACCOUNT_WEIGHTS", "")
+    
+    # 采集服务上游请求限流配置（令牌桶，速率单位: 次/秒）
+    OUTBOUND_GLOBAL_RATE: float = float(os.getenv("OUTBOUND_GLOBAL_RATE", "20"))
+    OUTBOUND_GLOBAL_BURST: float = float(os.getenv("OUTBOUND_GLOBAL_BURST", "40"))
+    OUTBOUND_ACCOUNT_RATE: float = float(os.getenv("OUTBOUND_ACCOUNT_RATE", "5"))
+    OUTBOUND_ACCOUNT_BURST: float = float(os.getenv("OUTBOUND_ACCOUNT_BURST", "10"))
+    # 等待令牌的最长时间，超过则直接返回 429
+    OUTBOUND_RATE_MAX_WAIT_SECONDS: float = float(os.getenv("OUTBOUND_RATE_MAX_WAIT_SECONDS", "10"))
+    # 收到 429 时速率乘以 DECREASE_FACTOR（不低于基础速率的 MIN_FACTOR 倍），每次成功恢复基础速率的 INCREASE_STEP 倍
+    OUTBOUND_RATE_DECREASE_FACTOR: float = float(os.getenv("OUTBOUND_RATE_DECREASE_FACTOR", "0.5"))
+    OUTBOUND_RATE_MIN_FACTOR: float = float(os.getenv("OUTBOUND_RATE_MIN_FACTOR", "0.1"))
+    OUTBOUND_RATE_INCREASE_STEP: float = float(os.getenv("OUTBOUND_RATE_INCREASE_STEP", "0.05"))
+    # 上游限流响应缺少 Retry-After 时的默认等待秒数
+    OUTBOUND_DEFAULT_RETRY_AFTER_SECONDS: float = float(os.getenv("OUTBOUND_DEFAULT_RETRY_AFTER_SECONDS", "5"))
+    
     @property
     def DATABASE_URL(self) -> str:
         """获取数据库 URL"""
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_SERVER_HOST}:{self.DB_SERVER_PORT}/{self.DB_NAME}"
     
+    @property
+    def db_replica_urls(self) -> List[str]:
+        """获取只读备库连接 URL 列表"""
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+    
+    @property
+    def leaderboard_weights(self) -> Dict[str, float]:
+        """获取排行榜互动类型权重"""
+        weights = {}
+        for item in self.LEADERBOARD_WEIGHTS.split(","):
+            if ":" in item:
+                interaction_type, weight = item.split(":", 1)
+                weights[interaction_type.strip().lower()] = float(weight)
+        return weights
+    
+    @property
+    def outbound_account_weights(self) -> Dict[str, float]:
+        """获取上游请求调度的媒体账号权重"""
+        weights = {}
+        for item in self.OUTBOUND_ACCOUNT_WEIGHTS.split(","):
+            if ":" in item:
+                media_account, weight = item.split(":", 1)
+                weights[media_account.strip()] = float(weight)
+        return weights
+    
+    @property
+    def request_deadline_routes(self) -> Dict[str, float]:
+        """获取按路由配置的默认截止时间"""
+        routes = {}
+        for item in self.REQUEST_DEADLINE_ROUTES.split(","):
+            if ":" in item:
+                pattern, seconds = item.rsplit(":", 1)
+                routes[pattern.strip()] = float(seconds)
+        return routes
+    
+    @property
+    def interaction_settle_seconds(self) -> int:
+        """
+        获取互动数据的稳定时间（秒）
+
+        采集服务在下一次轮询推文时才按真实 interaction_time 写入互动，互动最多晚一个更新间隔入库。
+        结束时间早于 now - 该值 的时间窗口视为已关闭；取 RETWEET_CACHE_SETTLE_SECONDS 与
+        推文监控可能使用的最长更新间隔（启用频率调整时为 MONITOR_MAX_FREQUENCY_MINUTES，否则为默认频率）中的较大值
+        """
+        slowest = self.MONITOR_MAX_FREQUENCY_MINUTES if self.MONITOR_FREQUENCY_ENABLED else self.MONITOR_DEFAULT_FREQUENCY_MINUTES
+        return max(self.RETWEET_CACHE_SETTLE_SECONDS, slowest * 60)
+    
+    @property
+    def monitor_frequency_levels(self) -> List[int]:
+        """获取推文监控更新频率档位（分钟），包含默认频率"""
+        levels = {int(item) for item in self.MONITOR_FREQUENCY_LEVELS.split(",") if item.strip()}
+        levels.add(self.MONITOR_DEFAULT_FREQUENCY_MINUTES)
+        return sorted(
+            level for level in levels
+            if self.MONITOR_MIN_FREQUENCY_MINUTES <= level <= self.MONITOR_MAX_FREQUENCY_MINUTES
+        ) or [self.MONITOR_DEFAULT_FREQUENCY_MINUTES]
+    
+    @property
+    def admission_route_classes(self) -> Dict[str, str]:
+        """获取准入控制的路由类别规则"""
+        classes = {}
+        for item in self.ADMISSION_ROUTE_CLASSES.split(","):
+            if ":" in item:
+                pattern, route_class = item.rsplit(":", 1)
+                classes[pattern.strip()] = route_class.strip()
+        return classes
+    
+    @property
+    def admission_limits(self) -> Dict[str, int]:
+        """获取准入控制各路由类别的并发上限"""
+        limits = {}
+        for item in self.ADMISSION_LIMITS.split(","):
+            if ":" in item:
+                route_class, limit = item.split(":", 1)
+                limits[route_class.strip()] = int(limit)
+        return limits
+    
     @property
     def twitter_service_url(self) -> str:
         """获取 Twitter 服务完整 URL"""
@@ -0,0 +1,270 @@
+import asyncio
+import fnmatch
+import json
+import math
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Coroutine, Dict, Iterator, Optional
+
+import aiohttp
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+settings = get_settings()
+
+# 当前请求的截止时间（time.monotonic），None 表示没有截止时间
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# 连接上记录本事务是否已设置 statement_timeout 的键
+_STATEMENT_TIMEOUT_KEY = "deadline_statement_timeout"
+
+# 截止时间到达后再等待的秒数，让应用自身的超时错误响应优先返回
+CANCEL_GRACE_SECONDS = 0.1
+
+
+class DeadlineExceeded(Exception):
+    """请求的剩余时间已经用完"""
+
+
+class Deadline:
+    """请求截止时间工具，截止时间保存在 contextvars 中，随请求内的协程与线程池调用传递"""
+
+    @staticmethod
+    def remaining() -> Optional[float]:
+        """
+        获取剩余时间
+
+        Returns:
+            Optional[float]: 剩余秒数（可能为负），没有截止时间时返回 None
+        """
+        deadline = _deadline.get()
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    @staticmethod
+    def check() -> None:
+        """
+        检查截止时间
+
+        Raises:
+            DeadlineExceeded: 剩余时间已用完时抛出
+        """
+        remaining = Deadline.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded()
+
+    @staticmethod
+    def timeout(cap: Optional[float] = None) -> Optional[float]:
+        """
+        计算下一次调用可用的超时时间：剩余时间与上限取较小值
+
+        Args:
+            cap: 超时上限（秒），None 表示不设上限
+
+        Returns:
+            Optional[float]: 超时秒数，两者都没有时返回 None
+
+        Raises:
+            DeadlineExceeded: 剩余时间已用完时抛出
+        """
+        remaining = Deadline.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        return remaining if cap is None else min(remaining, cap)
+
+    @staticmethod
+    def client_timeout() -> aiohttp.ClientTimeout:
+        """
+        构建上游请求的 aiohttp 超时：剩余时间与 UPSTREAM_TIMEOUT_SECONDS 取较小值
+
+        Returns:
+            aiohttp.ClientTimeout: 总超时
+
+        Raises:
+            DeadlineExceeded: 剩余时间已用完时抛出
+        """
+        return aiohttp.ClientTimeout(total=Deadline.timeout(settings.UPSTREAM_TIMEOUT_SECONDS))
+
+    @staticmethod
+    @contextmanager
+    def scope(seconds: Optional[float]) -> Iterator[None]:
+        """
+        在当前上下文中设置截止时间，已有更早的截止时间时保持不变
+
+        Args:
+            seconds: 从现在起的秒数，None 或不大于 0 表示不设置
+        """
+        deadline = _deadline.get()
+        if seconds is not None and seconds > 0:
+            candidate = time.monotonic() + seconds
+            deadline = candidate if deadline is None else min(deadline, candidate)
+        token = _deadline.set(deadline)
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+
+
+def create_background_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    在空白上下文中启动后台任务
+
+    asyncio.create_task 会复制当前上下文，请求内启动的后台任务会继承请求的截止时间，
+    请求结束后其上游调用全部立即超时。请求处理中启动、生命周期超出请求的任务需经此启动。
+
+    Args:
+        coro: 协程
+
+    Returns:
+        asyncio.Task: 后台任务
+    """
+    return asyncio.create_task(coro, context=Context())
+
+
+def install_statement_timeout(engine: Engine) -> None:
+    """
+    为 PostgreSQL 引擎注册事件：事务内第一条语句执行前，按请求剩余时间设置 SET LOCAL statement_timeout
+
+    SET LOCAL 只在当前事务内有效，提交或回滚后自动恢复，不会影响连接池中的其他请求。
+
+    Args:
+        engine: 数据库引擎
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _apply_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+        if _STATEMENT_TIMEOUT_KEY in conn.info:
+            return
+        remaining = Deadline.remaining()
+        if remaining is None:
+            return
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        cursor.execute(f"SET LOCAL statement_timeout = {max(1, math.ceil(remaining * 1000))}")
+        conn.info[_STATEMENT_TIMEOUT_KEY] = True
+
+    @event.listens_for(engine, "commit")
+    @event.listens_for(engine, "rollback")
+    def _reset_statement_timeout(conn):
+        conn.info.pop(_STATEMENT_TIMEOUT_KEY, None)
+
+
+class DeadlineMiddleware:
+    """
+    请求截止时间中间件
+
+    截止时间取请求头（秒数，不超过上限）或按路由配置的默认值，保存到请求上下文中，
+    上游调用与数据库语句据此设置超时。截止时间到达或客户端断开连接时取消请求处理，
+    尚未开始响应时返回 504。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str,
+        default_seconds: float,
+        max_seconds: float,
+        route_defaults: Dict[str, float]
+    ):
+        self.app = app
+        self.header = header.lower()
+        self.default_seconds = default_seconds
+        self.max_seconds = max_seconds
+        self.route_defaults = route_defaults
+
+    def _budget(self, scope: Scope) -> Optional[float]:
+        seconds = self.default_seconds
+        for pattern, value in self.route_defaults.items():
+            if fnmatch.fnmatchcase(scope["path"], pattern):
+                if value <= 0:
+                    # 不限时的路由（流式接口）忽略请求头，避免客户端给共享的后台轮询设置截止时间
+                    return None
+                seconds = value
+                break
+        value = Headers(scope=scope).get(self.header)
+        if value:
+            try:
+                requested = float(value)
+            except ValueError:
+                requested = None
+            if requested is not None and requested > 0:
+                seconds = min(requested, seconds) if seconds > 0 else requested
+        if seconds <= 0:
+            return None
+        return min(seconds, self.max_seconds) if self.max_seconds > 0 else seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self._budget(scope)
+        queue: asyncio.Queue = asyncio.Queue()
+        response_started = False
+
+        async def receive_from_queue() -> Message:
+            return await queue.get()
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        with Deadline.scope(budget):
+            app_task = asyncio.create_task(self.app(scope, receive_from_queue, send_tracking))
+
+        async def pump() -> None:
+            # 代替应用读取请求消息，发现客户端断开时取消请求处理
+            while True:
+                message = await receive()
+                await queue.put(message)
+                if message["type"] == "http.disconnect":
+                    if not app_task.done():
+                        metrics.inc("request_cancelled_client_disconnect")
+                        app_task.cancel()
+                    return
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            done, _ = await asyncio.wait({app_task}, timeout=None if budget is None else budget + CANCEL_GRACE_SECONDS)
+            if not done:
+                app_task.cancel()
+                await asyncio.gather(app_task, return_exceptions=True)
+                metrics.inc("request_deadline_exceeded")
+                logger.warning(f"请求超过截止时间已取消: {scope['method']} {scope['path']}, budget={budget}s")
+                if not response_started:
+                    await self._send_timeout(send)
+                return
+            try:
+                app_task.result()
+            except asyncio.CancelledError:
+                # 客户端已断开，无需响应
+                return
+        finally:
+            for task in (app_task, pump_task):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(app_task, pump_task, return_exceptions=True)
+
+    @staticmethod
+    async def _send_timeout(send: Send) -> None:
+        body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,79 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+
+class Metrics:
+    """进程内指标注册表（计数器、仪表值与派生指标）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        """
+        累加计数器
+
+        Args:
+            name: 指标名称
+            value: 累加值
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        设置仪表值
+
+        Args:
+            name: 指标名称
+            value: 当前值
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        记录一次观测值（累计次数、总和与最大值）
+
+        Args:
+            name: 指标名称
+            value: 观测值
+        """
+        with self._lock:
+            self._counters[f"{name}_count"] += 1
+            self._counters[f"{name}_sum"] += value
+            key = f"{name}_max"
+            if value > self._gauges.get(key, 0.0):
+                self._gauges[key] = value
+
+    def register_collector(self, collector: Callable[[], Dict[str, float]]) -> None:
+        """
+        注册派生指标采集函数，在导出时调用
+
+        Args:
+            collector: 返回指标字典的函数
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        导出当前全部指标
+
+        Returns:
+            Dict[str, float]: 指标名称到数值的映射
+        """
+        with self._lock:
+            result = dict(self._counters)
+            result.update(self._gauges)
+            collectors = list(self._collectors)
+        for collector in collectors:
+            result.update(collector())
+        return dict(sorted(result.items()))
+
+
+# 全局指标注册表
+metrics = Metrics()
@@ -0,0 +1,90 @@
+import cProfile
+import os
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logger import logger
+
+
+class ProfilingMiddleware:
+    """
+    单请求性能分析中间件
+
+    只有在配置开启时才会注册；请求携带指定请求头（且与令牌匹配）时，对该请求启用 cProfile，
+    分析结果写入本地目录，并通过 Server-Timing 响应头返回总耗时、CPU 时间与等待 I/O 时间。
+
+    cProfile 作用于事件循环线程，分析期间同时运行的其他请求也会计入；
+    同一时间只分析一个请求。
+    """
+
+    def __init__(self, app: ASGIApp, header: str, token: str, output_dir: str):
+        self.app = app
+        self.header = header.lower()
+        self.token = token
+        self.output_dir = output_dir
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = Headers(scope=scope).get(self.header)
+        if value is None or (self.token and value != self.token):
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            # 已有请求在分析中，本请求不分析
+            await self.app(scope, receive, self._with_headers(send, {"X-Profile": "busy"}))
+            return
+        await self._profile(scope, receive, send)
+
+    @staticmethod
+    def _with_headers(send: Send, extra: dict) -> Send:
+        async def wrapped(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for key, value in extra.items():
+                    headers.append(key, value)
+            await send(message)
+        return wrapped
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}.prof"
+        profiler = cProfile.Profile()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                wall = (time.perf_counter() - wall_start) * 1000
+                cpu = (time.thread_time() - cpu_start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f"total;dur={wall:.1f}, cpu;dur={cpu:.1f}, io-wait;dur={max(0.0, wall - cpu):.1f}"
+                )
+                headers.append("X-Profile", filename)
+            await send(message)
+
+        self._active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profiler.disable()
+            self._active = False
+            self._dump(profiler, filename)
+
+    def _dump(self, profiler: cProfile.Profile, filename: str) -> None:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, filename)
+            profiler.dump_stats(path)
+            logger.info(f"请求性能分析已保存: {path}")
+        except OSError as e:
+            logger.error(f"保存请求性能分析失败: {str(e)}")
@@ -0,0 +1,230 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.core.deadline import Deadline
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+settings = get_settings()
+
+
+class RateLimitExceeded(Exception):
+    """在最长等待时间内无法获得令牌"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    令牌桶，速率可按上游反馈自适应调整（AIMD）
+
+    收到限流响应时速率按比例下降并在 Retry-After 期间暂停发放，
+    之后每次成功请求按固定步长恢复，直到配置的基础速率。
+    """
+
+    def __init__(self, rate: float, capacity: float, min_factor: float, decrease_factor: float, increase_step: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._min_rate = rate * min_factor
+        self._decrease_factor = decrease_factor
+        self._increase_step = rate * increase_step
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        # 暂停期间不补充令牌
+        start = max(self._updated, self.blocked_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """
+        获取一个令牌需要等待的时间
+
+        Args:
+            now: 当前单调时钟
+
+        Returns:
+            float: 等待秒数
+        """
+        self._refill(now)
+        deficit = max(0.0, 1 - self.tokens)
+        return max(0.0, self.blocked_until - now) + deficit / self.rate
+
+    def take(self, now: float) -> None:
+        """预占一个令牌，令牌数可以为负，表示已排队的请求"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def penalize(self, now: float, retry_after: float) -> None:
+        """
+        收到上游限流响应后降低速率
+
+        Args:
+            now: 当前单调时钟
+            retry_after: 上游要求的等待秒数
+        """
+        self._refill(now)
+        self.rate = max(self._min_rate, self.rate * self._decrease_factor)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.tokens = min(self.tokens, 0.0)
+
+    def reward(self) -> None:
+        """成功请求后逐步恢复速率"""
+        if self.rate < self.base_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.base_rate, self.rate + self._increase_step)
+
+
+class OutboundRateLimiter:
+    """
+    采集服务上游请求限流器
+
+    每个媒体账号一个令牌桶，另有一个全局令牌桶，请求需要同时从两者获得令牌。
+    无法立即获得令牌时最多等待 max_wait 秒（且不超过请求剩余时间），超过则直接拒绝。
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        global_burst: float,
+        account_rate: float,
+        account_burst: float,
+        max_wait: float,
+        min_factor: float,
+        decrease_factor: float,
+        increase_step: float
+    ):
+        self._account_rate = account_rate
+        self._account_burst = account_burst
+        self._max_wait = max_wait
+        self._min_factor = min_factor
+        self._decrease_factor = decrease_factor
+        self._increase_step = increase_step
+        self._global = self._new_bucket(global_rate, global_burst)
+        self._accounts: Dict[str, TokenBucket] = {}
+
+    def _new_bucket(self, rate: float, capacity: float) -> TokenBucket:
+        return TokenBucket(
+            rate=rate,
+            capacity=capacity,
+            min_factor=self._min_factor,
+            decrease_factor=self._decrease_factor,
+            increase_step=self._increase_step
+        )
+
+    def _account(self, media_account: str) -> TokenBucket:
+        bucket = self._accounts.get(media_account)
+        if bucket is None:
+            bucket = self._accounts[media_account] = self._new_bucket(self._account_rate, self._account_burst)
+        return bucket
+
+    async def acquire(self, media_account: str) -> None:
+        """
+        获取一次上游请求的配额，必要时等待
+
+        Args:
+            media_account: 媒体账号
+
+        Raises:
+            RateLimitExceeded: 需要等待的时间超过上限时抛出
+        """
+        now = time.monotonic()
+        account = self._account(media_account)
+        wait = max(self._global.wait_time(now), account.wait_time(now))
+        # 等待时间不超过请求剩余时间
+        if wait > Deadline.timeout(self._max_wait):
+            metrics.inc("outbound_rate_limited")
+            raise RateLimitExceeded(wait)
+        self._global.take(now)
+        account.take(now)
+        if wait > 0:
+            metrics.observe("outbound_rate_limit_wait_seconds", wait)
+            await asyncio.sleep(wait)
+
+    def penalize(self, media_account: str, retry_after: float) -> None:
+        """
+        收到 429 等限流响应后降低该账号与全局速率
+
+        Args:
+            media_account: 媒体账号
+            retry_after: 上游要求的等待秒数
+        """
+        now = time.monotonic()
+        account = self._account(media_account)
+        account.penalize(now, retry_after)
+        self._global.penalize(now, retry_after)
+        metrics.inc("outbound_upstream_throttled")
+        logger.warning(f"采集服务限流: media_account={media_account}, retry_after={retry_after}, account_rate={account.rate:.2f}, global_rate={self._global.rate:.2f}")
+
+    def reward(self, media_account: str) -> None:
+        """
+        成功请求后逐步恢复速率
+
+        Args:
+            media_account: 媒体账号
+        """
+        self._account(media_account).reward()
+        self._global.reward()
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str], default: float) -> float:
+        """
+        解析 Retry-After 响应头（秒数或 HTTP 日期）
+
+        Args:
+            value: 响应头取值
+            default: 缺失或无法解析时使用的秒数
+
+        Returns:
+            float: 等待秒数
+        """
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出限流指标
+
+        Returns:
+            Dict[str, float]: 全局速率与被降速的账号数量
+        """
+        return {
+            "outbound_global_rate": self._global.rate,
+            "outbound_throttled_accounts": float(
+                sum(1 for bucket in self._accounts.values() if bucket.rate < bucket.base_rate)
+            )
+        }
+
+
+outbound_limiter = OutboundRateLimiter(
+    global_rate=settings.OUTBOUND_GLOBAL_RATE,
+    global_burst=settings.OUTBOUND_GLOBAL_BURST,
+    account_rate=settings.OUTBOUND_ACCOUNT_RATE,
+    account_burst=settings.OUTBOUND_ACCOUNT_BURST,
+    max_wait=settings.OUTBOUND_RATE_MAX_WAIT_SECONDS,
+    min_factor=settings.OUTBOUND_RATE_MIN_FACTOR,
+    decrease_factor=settings.OUTBOUND_RATE_DECREASE_FACTOR,
+    increase_step=settings.OUTBOUND_RATE_INCREASE_STEP
+)
+metrics.register_collector(outbound_limiter.stats)
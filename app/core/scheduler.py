@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.schemas.enums import RequestPriority
+
+settings = get_settings()
+
+# 按优先级从高到低排列
+PRIORITY_ORDER = (RequestPriority.INTERACTIVE, RequestPriority.BATCH)
+
+
+class OutboundScheduler:
+    """
+    采集服务上游请求调度器
+
+    全局并发数有上限。交互请求严格优先于批量请求，并且为交互请求保留一部分并发，
+    批量请求占满时交互请求仍能立即获得执行机会。同一优先级内按媒体账号做加权公平排队
+    （start-time fair queuing），单个账号的大批量扫描不会饿死其他账号。
+    """
+
+    def __init__(self, max_concurrency: int, interactive_reserved: int, account_weights: Dict[str, float]):
+        self._max_concurrency = max(1, max_concurrency)
+        self._batch_limit = max(1, self._max_concurrency - max(0, interactive_reserved))
+        self._account_weights = account_weights
+        self._in_flight: Dict[RequestPriority, int] = {p: 0 for p in PRIORITY_ORDER}
+        # 每个优先级一个按 (start_tag, seq) 排序的等待堆
+        self._queues: Dict[RequestPriority, List[Tuple[float, int, asyncio.Future]]] = {p: [] for p in PRIORITY_ORDER}
+        self._virtual_time: Dict[RequestPriority, float] = {p: 0.0 for p in PRIORITY_ORDER}
+        self._finish_tags: Dict[Tuple[RequestPriority, str], float] = {}
+        self._seq = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, media_account: str, priority: RequestPriority) -> AsyncIterator[None]:
+        """
+        获取一个上游请求执行槽位，退出时释放
+
+        Args:
+            media_account: 媒体账号
+            priority: 请求优先级
+        """
+        await self._acquire(media_account, priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, media_account: str, priority: RequestPriority) -> None:
+        enqueued = time.monotonic()
+        key = (priority, media_account)
+        start_tag = max(self._virtual_time[priority], self._finish_tags.get(key, 0.0))
+        self._finish_tags[key] = start_tag + 1.0 / self._account_weights.get(media_account, 1.0)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queues[priority], (start_tag, next(self._seq), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 已分配槽位但调用方被取消，归还槽位
+                self._release(priority)
+            raise
+        metrics.observe(f"outbound_queue_wait_seconds_{priority.value}", time.monotonic() - enqueued)
+
+    def _release(self, priority: RequestPriority) -> None:
+        self._in_flight[priority] -= 1
+        self._dispatch()
+
+    def _total_in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def _dispatch(self) -> None:
+        while self._total_in_flight() < self._max_concurrency:
+            for priority in PRIORITY_ORDER:
+                if priority == RequestPriority.BATCH and self._in_flight[priority] >= self._batch_limit:
+                    continue
+                if self._grant_next(priority):
+                    break
+            else:
+                return
+
+    def _grant_next(self, priority: RequestPriority) -> bool:
+        queue = self._queues[priority]
+        while queue:
+            start_tag, _, future = heapq.heappop(queue)
+            if future.done():
+                # 等待期间已被取消
+                continue
+            self._virtual_time[priority] = start_tag
+            self._in_flight[priority] += 1
+            future.set_result(None)
+            return True
+        if not self._in_flight[priority]:
+            # 该优先级已空闲，清理账号的虚拟时间标签
+            self._virtual_time[priority] = 0.0
+            for key in [k for k in self._finish_tags if k[0] == priority]:
+                del self._finish_tags[key]
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出调度指标
+
+        Returns:
+            Dict[str, float]: 各优先级执行中与排队中的请求数量
+        """
+        result = {}
+        for priority in PRIORITY_ORDER:
+            result[f"outbound_in_flight_{priority.value}"] = float(self._in_flight[priority])
+            result[f"outbound_queued_{priority.value}"] = float(
+                sum(1 for _, _, future in self._queues[priority] if not future.done())
+            )
+        return result
+
+
+outbound_scheduler = OutboundScheduler(
+    max_concurrency=settings.OUTBOUND_MAX_CONCURRENCY,
+    interactive_reserved=settings.OUTBOUND_INTERACTIVE_RESERVED,
+    account_weights=settings.outbound_account_weights
+)
+metrics.register_collector(outbound_scheduler.stats)
@@ -0,0 +1,281 @@
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logger import logger
+
+settings = get_settings()
+
+# W3C Trace Context: version-trace_id-parent_id-flags
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    """一次被追踪的操作，记录所属链路、父子关系、耗时与属性"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_time", "duration_ms", "attributes", "error", "_start")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        设置属性
+
+        Args:
+            key: 属性名
+            value: 属性值
+        """
+        self.attributes[key] = value
+
+    def finish(self) -> None:
+        """结束计时"""
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    @property
+    def traceparent(self) -> str:
+        """以当前 span 为父节点的 traceparent 请求头取值"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为可序列化的字典
+
+        Returns:
+            Dict[str, Any]: span 数据
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class SpanExporter:
+    """span 导出器基类"""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+
+class StdoutJsonExporter(SpanExporter):
+    """每个 span 输出一行 JSON 到标准输出"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+
+class InMemoryExporter(SpanExporter):
+    """在内存中保存已结束的 span，便于测试断言"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        """清空已保存的 span"""
+        with self._lock:
+            self.spans.clear()
+
+    def find(self, name: str) -> List[Span]:
+        """
+        按名称查找 span
+
+        Args:
+            name: span 名称
+
+        Returns:
+            List[Span]: 匹配的 span 列表
+        """
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# 来自上游请求头、尚未创建本地 span 时的父链路 (trace_id, parent_id)
+_remote_parent: ContextVar[Optional[tuple]] = ContextVar("remote_parent", default=None)
+
+
+class Tracer:
+    """
+    进程内轻量级链路追踪
+
+    当前 span 保存在 contextvars 中，同一请求内的协程自动继承父子关系；
+    未配置导出器时 span() 不做任何记录，开销可以忽略。
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def set_exporter(self, exporter: Optional[SpanExporter]) -> None:
+        """
+        替换导出器，传入 None 关闭追踪
+
+        Args:
+            exporter: span 导出器
+        """
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        在当前上下文中开启一个子 span，同步与异步代码均可使用
+
+        Args:
+            name: span 名称
+            **attributes: 初始属性
+
+        Yields:
+            Optional[Span]: 新建的 span，追踪关闭时为 None
+        """
+        if self.exporter is None:
+            yield None
+            return
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = _remote_parent.get() or (secrets.token_hex(16), None)
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        exporter = self.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export(span)
+        except Exception as e:
+            logger.error(f"导出 span 失败: {str(e)}")
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """获取当前 span"""
+        return _current_span.get()
+
+    @staticmethod
+    def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        在出站请求头中加入 traceparent，把链路传递到下游服务
+
+        Args:
+            headers: 原有请求头，不会被修改
+
+        Returns:
+            Dict[str, str]: 新的请求头
+        """
+        result = dict(headers) if headers else {}
+        span = _current_span.get()
+        if span is not None:
+            result["traceparent"] = span.traceparent
+        return result
+
+    @staticmethod
+    def parse_traceparent(value: Optional[str]) -> Optional[tuple]:
+        """
+        解析 traceparent 请求头
+
+        Args:
+            value: 请求头取值
+
+        Returns:
+            Optional[tuple]: (trace_id, parent_id)，格式无效时返回 None
+        """
+        if not value:
+            return None
+        match = TRACEPARENT_RE.match(value.strip().lower())
+        if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+            return None
+        return match.group(1), match.group(2)
+
+
+class TracingMiddleware:
+    """
+    请求链路追踪中间件
+
+    延续请求头中的 traceparent（没有则新建链路），为整个请求创建根 span，
+    并在响应头中返回 traceparent 便于关联日志。
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        remote = Tracer.parse_traceparent(Headers(scope=scope).get("traceparent"))
+        remote_token = _remote_parent.set(remote)
+        try:
+            with self.tracer.span(f"{scope['method']} {scope['path']}", method=scope["method"], path=scope["path"]) as span:
+                async def send_with_trace(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        span.set_attribute("status_code", message["status"])
+                        MutableHeaders(scope=message).append("traceparent", span.traceparent)
+                    await send(message)
+
+                await self.app(scope, receive, send_with_trace)
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    # 使用路由模板作为名称，便于按接口聚合
+                    span.name = f"{scope['method']} {route.path}"
+        finally:
+            _remote_parent.reset(remote_token)
+
+
+def _build_exporter() -> Optional[SpanExporter]:
+    if not settings.TRACING_ENABLED:
+        return None
+    if settings.TRACING_EXPORTER == "memory":
+        return InMemoryExporter()
+    return StdoutJsonExporter()
+
+
+tracer = Tracer(_build_exporter())
@@ -1,6 +1,8 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import delete, insert, inspect, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.db.base import Base
 
@@ -8,15 +10,29 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# 单条 INSERT ... VALUES 语句的最大行数，避免超出参数数量上限
+UPSERT_CHUNK_SIZE = 1000
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
         CRUD对象与SQLAlchemy模型类一起使用
         """
         self.model = model
+        # 直接读取表结构，避免在模型未全部导入时触发映射配置
+        self._pk = getattr(model, list(model.__table__.primary_key.columns)[0].key)
+        self._columns = set(model.__table__.columns.keys())
+
+    def _values(self, obj_in: Union[BaseModel, Dict[str, Any]], exclude_unset: bool) -> Dict[str, Any]:
+        """只保留模型中存在的列"""
+        if isinstance(obj_in, dict):
+            data = obj_in
+        else:
+            data = obj_in.model_dump(exclude_unset=exclude_unset)
+        return {key: value for key, value in data.items() if key in self._columns}
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+        return db.query(self.model).filter(self._pk == id).first()
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
@@ -38,21 +54,170 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in self._values(obj_in, exclude_unset=True).items():
+            setattr(db_obj, field, value)
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
+        # 提交后属性已过期，下次访问时再加载，无需额外 refresh
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
+    def remove(self, db: Session, *, id: Any) -> Optional[ModelType]:
+        if inspect(self.model).relationships:
+            # 有关联关系的模型保留 ORM 删除，执行关系上的级联与外键处理
+            obj = self.get(db, id)
+            if obj is None:
+                return None
+            db.delete(obj)
+        else:
+            obj = self.delete_by_id(db, id=id)
         db.commit()
         return obj
+
+    def update_by_id(
+        self,
+        db: Session,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Optional[ModelType]:
+        """
+        单条 UPDATE ... RETURNING 更新一行（不提交）
+
+        Args:
+            db: 数据库会话
+            id: 主键
+            obj_in: 更新数据（模型只取已设置的字段）
+
+        Returns:
+            Optional[ModelType]: 更新后的对象，不存在时返回 None
+        """
+        rows = self.update_many(db, ids=[id], obj_in=obj_in)
+        return rows[0] if rows else None
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        ids: Sequence[Any],
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> List[ModelType]:
+        """
+        单条 UPDATE ... WHERE pk IN (...) RETURNING 将多行更新为相同的值（不提交）
+
+        Args:
+            db: 数据库会话
+            ids: 主键列表
+            obj_in: 更新数据（模型只取已设置的字段）
+
+        Returns:
+            List[ModelType]: 更新后的对象列表
+        """
+        values = self._values(obj_in, exclude_unset=True)
+        if not ids or not values:
+            return []
+        stmt = (
+            update(self.model)
+            .where(self._pk.in_(ids))
+            .values(**values)
+            .returning(self.model)
+        )
+        return list(db.scalars(stmt, execution_options={"synchronize_session": "fetch"}).all())
+
+    def delete_by_id(self, db: Session, *, id: Any) -> Optional[ModelType]:
+        """
+        单条 DELETE ... RETURNING 删除一行（不提交）
+
+        不经过 ORM 删除流程，关系上的 cascade 不会执行，只依赖数据库外键的 ondelete；
+        需要 ORM 级联的模型使用 remove
+
+        Args:
+            db: 数据库会话
+            id: 主键
+
+        Returns:
+            Optional[ModelType]: 被删除的对象，不存在时返回 None
+        """
+        rows = self.delete_many(db, ids=[id])
+        return rows[0] if rows else None
+
+    def delete_many(self, db: Session, *, ids: Sequence[Any]) -> List[ModelType]:
+        """
+        单条 DELETE ... WHERE pk IN (...) RETURNING 删除多行（不提交，不执行 ORM 级联）
+
+        Args:
+            db: 数据库会话
+            ids: 主键列表
+
+        Returns:
+            List[ModelType]: 被删除的对象列表
+        """
+        if not ids:
+            return []
+        stmt = delete(self.model).where(self._pk.in_(ids)).returning(self.model)
+        objs = list(db.scalars(stmt, execution_options={"synchronize_session": "fetch"}).all())
+        # 行已删除，移出会话以保留 RETURNING 读取到的属性（提交时不会过期）
+        for obj in objs:
+            db.expunge(obj)
+        return objs
+
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> int:
+        """
+        使用 executemany 批量插入（不提交，不返回 ORM 对象）
+
+        Args:
+            db: 数据库会话
+            objs_in: 创建数据列表
+
+        Returns:
+            int: 插入的行数
+        """
+        rows = [self._values(obj_in, exclude_unset=False) for obj_in in objs_in]
+        if not rows:
+            return 0
+        db.execute(insert(self.model), rows)
+        return len(rows)
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        INSERT ... ON CONFLICT 批量写入（PostgreSQL，不提交）
+
+        Args:
+            db: 数据库会话
+            objs_in: 写入数据列表
+            index_elements: 冲突判断使用的唯一索引列
+            update_fields: 冲突时更新的列，默认更新除 index_elements 外的全部写入列；
+                传入空列表表示冲突时忽略
+
+        Returns:
+            int: 插入或更新的行数
+        """
+        rows = [self._values(obj_in, exclude_unset=False) for obj_in in objs_in]
+        if not rows:
+            return 0
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in index_elements]
+
+        affected = 0
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = pg_insert(self.model).values(rows[i:i + UPSERT_CHUNK_SIZE])
+            if update_fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(index_elements),
+                    set_={field: stmt.excluded[field] for field in update_fields}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+            affected += db.execute(stmt).rowcount
+        return affected
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true, Row
 from app.models.project import Project
-from typing import Optional
+from app.models.task import Task
+from typing import Optional, List
 
 class ProjectCRUD:
     @staticmethod
@@ -43,3 +45,43 @@ class ProjectCRUD:
             Optional[Project]: 项目对象，如果不存在则返回 None
         """
         return db.query(Project).filter(Project.name == name).first()
+    
+    @staticmethod
+    def get_projects_with_summary(
+        db: Session,
+        limit: int = 20,
+        after_id: Optional[int] = None,
+        cached: bool = True
+    ) -> List[Row]:
+        """
+        按项目ID做 keyset 分页，获取项目及其任务数量与最近任务时间
+        
+        Args:
+            db: 数据库会话
+            limit: 每页数量
+            after_id: 上一页最后一个项目ID（可选）
+            cached: 为 True 时读取项目表中由 tasks 触发器维护的摘要列，否则通过 LATERAL 子查询实时统计当前页项目
+            
+        Returns:
+            List[Row]: (Project, task_count, last_task_time) 行列表
+        """
+        if cached:
+            stmt = select(Project, Project.task_count, Project.last_task_time)
+        else:
+            # 只统计当前页的项目，每个项目使用 (project_id, created_time) 索引
+            summary = (
+                select(
+                    func.count(Task.task_id).label("task_count"),
+                    func.max(Task.created_time).label("last_task_time")
+                )
+                .where(Task.project_id == Project.id)
+                .lateral("task_summary")
+            )
+            stmt = (
+                select(Project, summary.c.task_count, summary.c.last_task_time)
+                .outerjoin(summary, true())
+            )
+        if after_id is not None:
+            stmt = stmt.where(Project.id > after_id)
+        stmt = stmt.order_by(Project.id).limit(limit)
+        return db.execute(stmt).all()
@@ -0,0 +1,98 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from app.models.qualifying import QualifyingSnapshot, QualifyingUser
+from datetime import datetime
+from typing import Dict, Optional, List
+
+class QualifyingSnapshotCRUD:
+    @staticmethod
+    def get_snapshot(
+        db: Session,
+        task_id: int,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[QualifyingSnapshot]:
+        """
+        查找任务在指定时间窗口的合格用户快照
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            Optional[QualifyingSnapshot]: 快照对象，如果不存在则返回 None
+        """
+        return db.query(QualifyingSnapshot).filter(
+            QualifyingSnapshot.task_id == task_id,
+            QualifyingSnapshot.start_time == start_time,
+            QualifyingSnapshot.end_time == end_time
+        ).first()
+    
+    @staticmethod
+    def create_snapshot(
+        db: Session,
+        task_id: int,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        users: Dict[str, datetime]
+    ) -> QualifyingSnapshot:
+        """
+        创建快照及其用户列表但不提交
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+            users: 用户ID到首次 retweet 时间的映射
+            
+        Returns:
+            QualifyingSnapshot: 创建的快照对象（未提交）
+        """
+        db_snapshot = QualifyingSnapshot(
+            task_id=task_id,
+            post_id=post_id,
+            start_time=start_time,
+            end_time=end_time,
+            user_count=len(users)
+        )
+        db.add(db_snapshot)
+        # 刷新会话以获取快照ID
+        db.flush()
+        if users:
+            # 使用 executemany 批量写入用户
+            db.execute(
+                insert(QualifyingUser),
+                [
+                    {"snapshot_id": db_snapshot.id, "user_id": user_id, "interaction_time": interaction_time}
+                    for user_id, interaction_time in users.items()
+                ]
+            )
+        return db_snapshot
+    
+    @staticmethod
+    def get_users_with_pagination(
+        db: Session,
+        snapshot_id: int,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[QualifyingUser]:
+        """
+        分页获取快照中的用户（按 user_id 排序）
+        
+        Args:
+            db: 数据库会话
+            snapshot_id: 快照ID
+            limit: 每页数量
+            offset: 偏移量
+            
+        Returns:
+            List[QualifyingUser]: 用户列表
+        """
+        return db.query(QualifyingUser).filter(
+            QualifyingUser.snapshot_id == snapshot_id
+        ).order_by(QualifyingUser.user_id).offset(offset).limit(limit).all()
\ No newline at end of file
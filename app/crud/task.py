@@ -1,8 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, contains_eager
+from sqlalchemy import case, func, or_, select, tuple_, update, Row
 from app.models.task import Task
 from app.models.project import Project
-from typing import Optional, List, Tuple
+from app.schemas.enums import MonitorState
+from datetime import datetime
+from typing import Dict, Iterator, Optional, List, Tuple
 
 class TaskCRUD:
     @staticmethod
@@ -14,6 +16,7 @@ class TaskCRUD:
         twitter_url: str,
         description: Optional[str] = None,
         user_wallet: Optional[str] = None,
+        end_time: Optional[datetime] = None,
     ) -> Task:
         """
         创建任务但不提交
@@ -26,6 +29,7 @@ class TaskCRUD:
             twitter_url: Twitter URL
             description: 任务描述（可选）
             user_wallet: 用户钱包地址（可选）
+            end_time: 任务结束时间（可选）
             
         Returns:
             Task: 创建的任务对象（未提交）
@@ -36,32 +40,297 @@ class TaskCRUD:
             description=description,
             type=task_type,
             url=twitter_url,
-            user_wallet=user_wallet
+            user_wallet=user_wallet,
+            end_time=end_time
         )
         db.add(db_task)
         return db_task
     
+    @staticmethod
+    def get_task_by_id(db: Session, task_id: int) -> Optional[Task]:
+        """
+        通过ID查找任务
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            
+        Returns:
+            Optional[Task]: 任务对象，如果不存在则返回 None
+        """
+        return db.query(Task).filter(Task.task_id == task_id).first()
+    
+    @staticmethod
+    def get_active_tasks(db: Session, task_type: str) -> List[Task]:
+        """
+        获取需要持续校验的任务（推文监控尚未回收）
+        
+        Args:
+            db: 数据库会话
+            task_type: 任务类型
+            
+        Returns:
+            List[Task]: 任务列表
+        """
+        return (
+            db.query(Task)
+            .filter(Task.type == task_type, Task.monitor_state == MonitorState.ACTIVE.value)
+            .order_by(Task.task_id)
+            .all()
+        )
+    
+    @staticmethod
+    def get_expired_monitors(
+        db: Session,
+        now: datetime,
+        limit: Optional[int] = None,
+        keys: Optional[List[Tuple[str, str]]] = None
+    ) -> List[Task]:
+        """
+        获取已到结束时间、推文监控尚未回收的任务
+        
+        Args:
+            db: 数据库会话
+            now: 当前时间
+            limit: 最多返回的数量（可选）
+            keys: (媒体账号, 任务URL) 过滤（可选）
+            
+        Returns:
+            List[Task]: 任务列表，按结束时间升序
+        """
+        query = db.query(Task).filter(Task.monitor_state == MonitorState.ACTIVE.value, Task.end_time <= now)
+        if keys is not None:
+            query = query.filter(tuple_(Task.twitter_name, Task.url).in_(keys))
+        query = query.order_by(Task.end_time, Task.task_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def get_live_monitors(db: Session, twitter_names: List[str], now: datetime) -> List[Tuple[str, str]]:
+        """
+        获取指定媒体账号下仍然有效（未到结束时间且未回收）的推文监控
+        
+        Args:
+            db: 数据库会话
+            twitter_names: 媒体账号列表
+            now: 当前时间
+            
+        Returns:
+            List[Tuple[str, str]]: (媒体账号, 任务URL) 列表
+        """
+        if not twitter_names:
+            return []
+        rows = (
+            db.query(Task.twitter_name, Task.url)
+            .filter(
+                Task.twitter_name.in_(twitter_names),
+                Task.monitor_state == MonitorState.ACTIVE.value,
+                or_(Task.end_time.is_(None), Task.end_time > now)
+            )
+            .all()
+        )
+        return [(twitter_name, url) for twitter_name, url in rows]
+    
+    @staticmethod
+    def mark_monitors_reaped(db: Session, task_ids: List[int], reaped_time: datetime) -> int:
+        """
+        将任务的推文监控标记为已回收（不提交）
+        
+        Args:
+            db: 数据库会话
+            task_ids: 任务ID列表
+            reaped_time: 回收时间
+            
+        Returns:
+            int: 更新的行数
+        """
+        if not task_ids:
+            return 0
+        result = db.execute(
+            update(Task)
+            .where(Task.task_id.in_(task_ids), Task.monitor_state == MonitorState.ACTIVE.value)
+            .values(monitor_state=MonitorState.REAPED.value, monitor_reaped_time=reaped_time)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def count_monitors(db: Session, now: datetime) -> Dict[str, int]:
+        """
+        统计推文监控状态
+        
+        Args:
+            db: 数据库会话
+            now: 当前时间
+            
+        Returns:
+            Dict[str, int]: active（有效）、expired（已到期待回收）、reaped（已回收）的数量
+        """
+        is_active = Task.monitor_state == MonitorState.ACTIVE.value
+        active, expired, reaped = db.query(
+            func.count(case((is_active & or_(Task.end_time.is_(None), Task.end_time > now), 1))),
+            func.count(case((is_active & (Task.end_time <= now), 1))),
+            func.count(case((Task.monitor_state == MonitorState.REAPED.value, 1)))
+        ).one()
+        return {"active": active, "expired": expired, "reaped": reaped}
+    
+    @staticmethod
+    def _list_filters(
+        user_wallet: Optional[str],
+        project_id: Optional[int],
+        task_type: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> List:
+        filters = []
+        if user_wallet is not None:
+            filters.append(Task.user_wallet == user_wallet)
+        if project_id is not None:
+            filters.append(Task.project_id == project_id)
+        if task_type is not None:
+            filters.append(Task.type == task_type)
+        if created_from is not None:
+            filters.append(Task.created_time >= created_from)
+        if created_to is not None:
+            filters.append(Task.created_time < created_to)
+        return filters
+    
+    @staticmethod
+    def get_tasks_version(
+        db: Session,
+        user_wallet: Optional[str] = None,
+        project_id: Optional[int] = None,
+        task_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> Tuple[int, Optional[datetime], Optional[int], Optional[datetime]]:
+        """
+        获取符合过滤条件的任务集合的版本信息，用于计算 ETag
+        
+        Args:
+            db: 数据库会话
+            user_wallet: 用户钱包地址过滤（可选）
+            project_id: 项目ID过滤（可选）
+            task_type: 任务类型过滤（可选）
+            created_from: 创建时间下限（包含，可选）
+            created_to: 创建时间上限（不包含，可选）
+            
+        Returns:
+            Tuple[int, Optional[datetime], Optional[int], Optional[datetime]]:
+                (任务数量, 最大创建时间, 最大任务ID, 最近监控回收时间)
+        """
+        filters = TaskCRUD._list_filters(user_wallet, project_id, task_type, created_from, created_to)
+        count, max_created_time, max_task_id, max_reaped_time = db.query(
+            func.count(Task.task_id),
+            func.max(Task.created_time),
+            func.max(Task.task_id),
+            func.max(Task.monitor_reaped_time)
+        ).filter(*filters).one()
+        return count, max_created_time, max_task_id, max_reaped_time
+    
     @staticmethod
     def get_tasks_with_pagination(
         db: Session,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        user_wallet: Optional[str] = None,
+        project_id: Optional[int] = None,
+        task_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
     ) -> Tuple[List[Task], int]:
         """
-        获取所有任务（带分页）
+        获取任务（带过滤和分页），按创建时间倒序
+        
+        每种过滤条件及钱包、项目与任务类型的组合都有对应的 created_time 复合索引
         
         Args:
             db: 数据库会话
             limit: 每页数量
             offset: 偏移量
+            user_wallet: 用户钱包地址过滤（可选）
+            project_id: 项目ID过滤（可选）
+            task_type: 任务类型过滤（可选）
+            created_from: 创建时间下限（包含，可选）
+            created_to: 创建时间上限（不包含，可选）
             
         Returns:
             Tuple[List[Task], int]: (任务列表, 总数量)
         """
+        filters = TaskCRUD._list_filters(user_wallet, project_id, task_type, created_from, created_to)
+        
         # 获取总数
-        total_count = db.query(func.count(Task.task_id)).scalar()
+        total_count = db.query(func.count(Task.task_id)).filter(*filters).scalar()
         
-        # 获取分页数据，包含关联的 project 信息
-        tasks = db.query(Task).join(Project).offset(offset).limit(limit).all()
+        # 获取分页数据，关联的 project 信息在同一查询中加载
+        tasks = TaskCRUD._list_page_query(db, filters, limit, offset).all()
         
         return tasks, total_count
+    
+    @staticmethod
+    def _list_page_query(db: Session, filters: List, limit: int, offset: int) -> Query:
+        return (
+            db.query(Task)
+            .join(Project)
+            .options(contains_eager(Task.project))
+            .filter(*filters)
+            .order_by(Task.created_time.desc(), Task.task_id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+    
+    @staticmethod
+    def iter_tasks_with_project(
+        db: Session,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        task_type: Optional[str] = None,
+        user_wallet: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        使用服务端游标逐批读取任务及其项目信息
+        
+        Args:
+            db: 数据库会话
+            created_from: 创建时间下限（包含，可选）
+            created_to: 创建时间上限（不包含，可选）
+            task_type: 任务类型过滤（可选）
+            user_wallet: 用户钱包地址过滤（可选）
+            batch_size: 每批从游标读取的行数
+            
+        Returns:
+            Iterator[Row]: 任务与项目字段的行迭代器
+        """
+        stmt = (
+            select(
+                Task.task_id,
+                Task.twitter_name,
+                Task.description,
+                Task.type,
+                Task.url,
+                Task.user_wallet,
+                Task.created_time,
+                Project.id.label("project_id"),
+                Project.name.label("project_name"),
+                Project.description.label("project_description"),
+                Project.icon.label("project_icon"),
+                Project.created_time.label("project_created_time")
+            )
+            .join(Project, Task.project_id == Project.id)
+            .order_by(Task.task_id)
+        )
+        if created_from is not None:
+            stmt = stmt.where(Task.created_time >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(Task.created_time < created_to)
+        if task_type is not None:
+            stmt = stmt.where(Task.type == task_type)
+        if user_wallet is not None:
+            stmt = stmt.where(Task.user_wallet == user_wallet)
+        
+        # stream_results 使用服务端游标，内存占用只与 batch_size 相关
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        for partition in result.partitions():
+            yield from partition
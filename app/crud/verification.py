@@ -0,0 +1,105 @@
+import json
+from sqlalchemy.orm import Session
+from sqlalchemy import update, tuple_, func
+from sqlalchemy.dialects.postgresql import insert
+from app.models.verification import VerifierCheckpoint, VerifiedRetweet
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+INSERT_CHUNK_SIZE = 1000
+
+class VerificationCRUD:
+    @staticmethod
+    def get_checkpoint(db: Session, task_id: int) -> Optional[VerifierCheckpoint]:
+        """
+        获取任务的校验检查点
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            
+        Returns:
+            Optional[VerifierCheckpoint]: 检查点对象，如果不存在则返回 None
+        """
+        return db.query(VerifierCheckpoint).filter(VerifierCheckpoint.task_id == task_id).first()
+    
+    @staticmethod
+    def save_checkpoint(
+        db: Session,
+        task_id: int,
+        last_interaction_time: Optional[datetime],
+        boundary_ids: Set[str]
+    ) -> None:
+        """
+        保存任务的校验检查点但不提交
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            last_interaction_time: 已处理到的 interaction_time
+            boundary_ids: 该秒内已处理的 interaction_id
+        """
+        db.merge(VerifierCheckpoint(
+            task_id=task_id,
+            last_interaction_time=last_interaction_time,
+            boundary_ids=json.dumps(sorted(boundary_ids))
+        ))
+    
+    @staticmethod
+    def add_verified_retweets(db: Session, task_id: int, users: Dict[str, datetime]) -> int:
+        """
+        写入新校验通过的 (task, user)，已存在的跳过，不提交
+        
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            users: 用户ID到 retweet 时间的映射
+            
+        Returns:
+            int: 新写入的数量
+        """
+        rows = [
+            {"task_id": task_id, "user_id": user_id, "interaction_time": interaction_time, "pushed": False}
+            for user_id, interaction_time in users.items()
+        ]
+        inserted = 0
+        # 分块写入，避免超出单条语句的参数数量上限
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = insert(VerifiedRetweet).values(rows[i:i + INSERT_CHUNK_SIZE]).on_conflict_do_nothing(
+                index_elements=["task_id", "user_id"]
+            )
+            inserted += db.execute(stmt).rowcount
+        return inserted
+    
+    @staticmethod
+    def get_pending(db: Session, limit: int = 100) -> List[VerifiedRetweet]:
+        """
+        获取尚未推送到 Flux 的校验结果
+        
+        Args:
+            db: 数据库会话
+            limit: 数量上限
+            
+        Returns:
+            List[VerifiedRetweet]: 待推送的校验结果
+        """
+        return db.query(VerifiedRetweet).filter(
+            VerifiedRetweet.pushed.is_(False)
+        ).order_by(VerifiedRetweet.task_id, VerifiedRetweet.interaction_time).limit(limit).all()
+    
+    @staticmethod
+    def mark_pushed(db: Session, pairs: List[Tuple[int, str]]) -> None:
+        """
+        将校验结果标记为已推送但不提交
+        
+        Args:
+            db: 数据库会话
+            pairs: (task_id, user_id) 列表
+        """
+        if not pairs:
+            return
+        db.execute(
+            update(VerifiedRetweet)
+            .where(tuple_(VerifiedRetweet.task_id, VerifiedRetweet.user_id).in_(pairs))
+            .values(pushed=True, pushed_time=func.now())
+        )
\ No newline at end of file
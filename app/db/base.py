@@ -3,6 +3,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.core.deadline import install_statement_timeout
 
 settings = get_settings()
 
@@ -10,6 +11,8 @@ engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
 )
+# 按请求剩余时间设置语句超时
+install_statement_timeout(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
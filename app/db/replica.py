@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.core.deadline import install_statement_timeout
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.db.base import SessionLocal, engine
+
+settings = get_settings()
+
+# 主库当前 WAL 位置
+PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()")
+# 备库已回放的 WAL 位置及最后回放事务距今的秒数
+REPLICA_STATUS_SQL = text(
+    "SELECT pg_last_wal_replay_lsn(), EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+)
+
+
+def parse_lsn(value: str) -> int:
+    """
+    解析 PostgreSQL WAL 位置
+
+    Args:
+        value: 形如 16/B374D848 的 WAL 位置
+
+    Returns:
+        int: 可比较大小的整数位置
+
+    Raises:
+        ValueError: 格式无效时抛出
+    """
+    high, low = value.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+class _Replica:
+    """单个只读备库的连接与复制状态"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = create_engine(url, pool_pre_ping=True)
+        install_statement_timeout(self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # 首次检查通过前不参与读流量
+        self.healthy = False
+        self.lag: Optional[float] = None
+        # 该 WAL 位置之前的写入已在备库回放
+        self.replayed_lsn = 0
+
+
+class ReplicaRouter:
+    """
+    只读查询路由
+
+    只读查询轮询分发到健康的备库；复制延迟超过上限或检查失败的备库暂时移出轮询。
+    复制延迟以主库当前 WAL 位置为准：备库已回放到该位置时为 0，否则为最后回放事务距今的秒数，
+    因此 WAL 接收中断时延迟会持续增长而不是停在 0。
+    调用方提供最近一次写入的 WAL 位置时，只选择已回放到该位置的备库，否则回到主库，保证读到自己的写入。
+    未配置备库时全部查询使用主库。
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float):
+        self._replicas = [_Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._round_robin = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    def start(self) -> None:
+        """启动备库复制延迟检查"""
+        if self._replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"备库复制延迟检查已启动: replicas={len(self._replicas)}")
+
+    async def stop(self) -> None:
+        """停止备库复制延迟检查"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.check_once)
+            await asyncio.sleep(self._check_interval)
+
+    def check_once(self) -> None:
+        """检查一次所有备库的复制延迟"""
+        try:
+            # 先读取主库位置，备库回放到该位置即视为没有延迟
+            with engine.connect() as conn:
+                primary_lsn = parse_lsn(conn.execute(PRIMARY_LSN_SQL).scalar())
+        except Exception as e:
+            logger.warning(f"读取主库 WAL 位置失败，本轮跳过备库检查: error={str(e)}")
+            return
+        for replica in self._replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    replay_lsn, replay_age = conn.execute(REPLICA_STATUS_SQL).one()
+                replayed_lsn = parse_lsn(replay_lsn) if replay_lsn else 0
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"备库检查失败，移出轮询: {replica.name}, error={str(e)}")
+                replica.healthy = False
+                replica.lag = None
+                continue
+            if replayed_lsn >= primary_lsn:
+                lag = 0.0
+            elif replay_age is not None:
+                lag = max(0.0, float(replay_age))
+            else:
+                # 尚未回放过任何事务
+                lag = float("inf")
+            healthy = lag <= self._max_lag
+            if healthy != replica.healthy:
+                logger.warning(f"备库状态变化: {replica.name}, healthy={healthy}, lag={lag:.2f}s")
+            replica.healthy = healthy
+            replica.lag = lag
+            replica.replayed_lsn = replayed_lsn
+
+    def write_token(self, db: Session) -> Optional[str]:
+        """
+        读取写入后的主库 WAL 位置，作为读到自己写入的令牌
+
+        Args:
+            db: 已提交写入的主库会话
+
+        Returns:
+            Optional[str]: WAL 位置；未配置备库或读取失败时返回 None
+        """
+        if not self._replicas:
+            return None
+        try:
+            return str(db.execute(PRIMARY_LSN_SQL).scalar())
+        except Exception as e:
+            logger.warning(f"读取主库 WAL 位置失败: error={str(e)}")
+            return None
+
+    def read_session(self, last_write: Optional[int] = None) -> Session:
+        """
+        创建只读查询使用的会话
+
+        Args:
+            last_write: 调用方最近一次写入的 WAL 位置（可选）
+
+        Returns:
+            Session: 备库会话；没有满足条件的备库时为主库会话
+        """
+        candidates = [
+            replica for replica in self._replicas
+            if replica.healthy and (last_write is None or replica.replayed_lsn >= last_write)
+        ]
+        if not candidates:
+            metrics.inc("db_reads_primary")
+            return SessionLocal()
+        replica = candidates[next(self._round_robin) % len(candidates)]
+        metrics.inc("db_reads_replica")
+        return replica.session_factory()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出备库指标
+
+        Returns:
+            Dict[str, float]: 健康备库数量与各备库复制延迟
+        """
+        result = {"db_replicas_healthy": float(sum(1 for replica in self._replicas if replica.healthy))}
+        for replica in self._replicas:
+            if replica.lag is not None:
+                result[f"db_{replica.name}_lag_seconds"] = replica.lag
+        return result
+
+
+def get_last_write(request: Request) -> Optional[int]:
+    """
+    读取请求头中的最近写入 WAL 位置
+
+    Args:
+        request: 请求对象
+
+    Returns:
+        Optional[int]: WAL 位置，缺失或格式无效时返回 None
+    """
+    value = request.headers.get(settings.READ_YOUR_WRITES_HEADER)
+    if not value:
+        return None
+    try:
+        return parse_lsn(value)
+    except ValueError:
+        return None
+
+
+replica_router = ReplicaRouter(
+    urls=settings.db_replica_urls,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS
+)
+metrics.register_collector(replica_router.stats)
+
+
+# 只读查询依赖项
+def get_read_db(request: Request):
+    db = replica_router.read_session(get_last_write(request))
+    try:
+        yield db
+    finally:
+        db.close()
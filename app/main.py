@@ -1,15 +1,52 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import get_settings
 from app.core.logger import logger
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.compression import CompressionMiddleware
+from app.core.deadline import DeadlineMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import TracingMiddleware, tracer
 from app.api.v1.api import router as api_v1_router
+from app.db.replica import replica_router
+from app.services.interaction_feed import interaction_feed
+from app.services.monitor_frequency import monitor_frequency_manager
+from app.services.monitor_reaper import monitor_reaper
+from app.services.verifier import retweet_verifier
 
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 启动事件循环延迟监测
+    if settings.ADMISSION_ENABLED:
+        admission_controller.start()
+    # 启动备库复制延迟检查（未配置备库时不启动）
+    replica_router.start()
+    # 启动后台 retweet 持续校验
+    if settings.VERIFIER_ENABLED:
+        retweet_verifier.start()
+    # 启动推文监控频率自适应调整
+    if settings.MONITOR_FREQUENCY_ENABLED:
+        monitor_frequency_manager.start()
+    # 启动到期推文监控回收
+    if settings.REAPER_ENABLED:
+        monitor_reaper.start()
+    yield
+    # 停止后台轮询任务
+    await interaction_feed.shutdown()
+    await retweet_verifier.stop()
+    await monitor_frequency_manager.stop()
+    await monitor_reaper.stop()
+    await admission_controller.stop()
+    await replica_router.stop()
+
 app = FastAPI(
     title="Hetu Middleware",
     description="Hetu Middleware API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 logger.info("Starting Hetu Middleware API")
@@ -23,6 +60,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩
+if settings.RESPONSE_GZIP_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_GZIP_MIN_SIZE,
+        compresslevel=settings.RESPONSE_GZIP_LEVEL,
+    )
+
+# 请求截止时间，超时或客户端断开时取消请求处理
+if settings.REQUEST_DEADLINE_ENABLED:
+    app.add_middleware(
+        DeadlineMiddleware,
+        header=settings.REQUEST_DEADLINE_HEADER,
+        default_seconds=settings.REQUEST_DEADLINE_SECONDS,
+        max_seconds=settings.REQUEST_DEADLINE_MAX_SECONDS,
+        route_defaults=settings.request_deadline_routes,
+    )
+
+# 准入控制，过载时提前拒绝请求（位于截止时间中间件外层，排队时间不占用请求截止时间）
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        route_classes=settings.admission_route_classes,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
+# 单请求性能分析（关闭时不注册，没有额外开销）
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        header=settings.PROFILING_HEADER,
+        token=settings.PROFILING_TOKEN,
+        output_dir=settings.PROFILING_DIR,
+    )
+
+# 请求链路追踪（最后注册，位于最外层，span 覆盖其余中间件）
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
 # 注册 V1 版本的 API 路由
 app.include_router(api_v1_router, prefix=settings.API_V1_STR)
 
@@ -11,6 +11,9 @@ class Project(Base):
     icon = Column(String(255))  # URL for the icon
     description = Column(Text)
     created_time = Column(DateTime(timezone=True), server_default=func.now())
+    # 任务数量摘要，由 tasks 表的触发器在同一事务中维护（创建、删除、修改 project_id 均会更新）
+    task_count = Column(Integer, nullable=False, server_default="0")
+    last_task_time = Column(DateTime(timezone=True))
     
     # 关系定义
     tasks = relationship("Task", back_populates="project")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class QualifyingSnapshot(Base):
+    __tablename__ = "qualifying_snapshots"
+    __table_args__ = (
+        UniqueConstraint('task_id', 'start_time', 'end_time', name='uq_qualifying_snapshots_window'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, ForeignKey('tasks.task_id', ondelete='CASCADE'), nullable=False)
+    post_id = Column(String(50), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+    user_count = Column(Integer, nullable=False, default=0)
+    created_time = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # 关系定义
+    users = relationship("QualifyingUser", back_populates="snapshot", cascade="all, delete-orphan", passive_deletes=True)
+
+class QualifyingUser(Base):
+    __tablename__ = "qualifying_users"
+
+    snapshot_id = Column(Integer, ForeignKey('qualifying_snapshots.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(String(50), primary_key=True)
+    interaction_time = Column(DateTime(timezone=True), nullable=False)  # 窗口内首次 retweet 时间
+    
+    # 关系定义
+    snapshot = relationship("QualifyingSnapshot", back_populates="users")
\ No newline at end of file
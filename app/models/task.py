@@ -1,10 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 列表查询的过滤条件 + created_time 倒序排序
+        Index('ix_tasks_user_wallet_created_time', 'user_wallet', 'created_time'),
+        Index('ix_tasks_project_id_created_time', 'project_id', 'created_time'),
+        Index('ix_tasks_type_created_time', 'type', 'created_time'),
+        Index('ix_tasks_created_time', 'created_time'),
+        # 钱包、项目与任务类型组合过滤
+        Index('ix_tasks_user_wallet_type_created_time', 'user_wallet', 'type', 'created_time'),
+        Index('ix_tasks_project_id_type_created_time', 'project_id', 'type', 'created_time'),
+        # 回收到期监控时按状态与结束时间查找
+        Index('ix_tasks_monitor_state_end_time', 'monitor_state', 'end_time'),
+    )
 
     task_id = Column(Integer, primary_key=True, autoincrement=True)
     twitter_name = Column(String(100), nullable=False)
@@ -13,6 +25,9 @@ class Task(Base):
     url = Column(String(255), nullable=False)  # 可能是 Twitter URL 或其他 URL
     user_wallet = Column(String(100))  # 用户钱包地址
     created_time = Column(DateTime(timezone=True), server_default=func.now())
+    end_time = Column(DateTime(timezone=True))  # 任务结束时间，为空表示长期有效
+    monitor_state = Column(String(20), nullable=False, server_default='active')  # 采集服务推文监控状态
+    monitor_reaped_time = Column(DateTime(timezone=True))  # 推文监控回收时间
     
     # 外键关联
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
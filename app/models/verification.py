@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class VerifierCheckpoint(Base):
+    __tablename__ = "verifier_checkpoints"
+
+    task_id = Column(Integer, ForeignKey('tasks.task_id', ondelete='CASCADE'), primary_key=True)
+    last_interaction_time = Column(DateTime(timezone=True))  # 已处理到的 interaction_time（精确到秒）
+    boundary_ids = Column(Text, nullable=False, default="[]")  # 该秒内已处理的 interaction_id（JSON 数组）
+    updated_time = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class VerifiedRetweet(Base):
+    __tablename__ = "verified_retweets"
+    __table_args__ = (
+        Index('ix_verified_retweets_pending', 'pushed', 'task_id'),
+    )
+
+    task_id = Column(Integer, ForeignKey('tasks.task_id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(String(50), primary_key=True)
+    interaction_time = Column(DateTime(timezone=True), nullable=False)
+    pushed = Column(Boolean, nullable=False, default=False)  # 是否已推送到 Flux
+    pushed_time = Column(DateTime(timezone=True))
+    created_time = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -2,4 +2,25 @@ from enum import Enum
 
 class TaskType(str, Enum):
     """任务类型枚举"""
-    TWITTER_RETWEET = "twitter_retweet"
\ No newline at end of file
+    TWITTER_RETWEET = "twitter_retweet"
+
+class StatsBucket(str, Enum):
+    """互动统计时间粒度枚举"""
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+class RequestPriority(str, Enum):
+    """上游请求优先级枚举"""
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+class ExportFormat(str, Enum):
+    """导出格式枚举"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class MonitorState(str, Enum):
+    """推文监控状态枚举"""
+    ACTIVE = "active"
+    REAPED = "reaped"
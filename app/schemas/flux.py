@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
 from app.schemas.enums import TaskType
 class FluxTaskCreateRequest(BaseModel):
     """Flux 任务创建请求"""
@@ -18,3 +19,19 @@ class FluxTaskCreateResponse(BaseModel):
     task_id: Optional[str] = Field(None, description="任务ID")
     message: str = Field(..., description="响应消息")
     vlc_value: Optional[int] = Field(None, description="VLC值")
+
+class FluxVerifiedRetweet(BaseModel):
+    """校验通过的 retweet"""
+    task_id: int = Field(..., description="任务ID")
+    tweet_id: str = Field(..., description="推文ID")
+    user_id: str = Field(..., description="用户ID")
+    interaction_time: datetime = Field(..., description="retweet 时间")
+
+class FluxVerificationBatchRequest(BaseModel):
+    """Flux 批量校验结果推送请求"""
+    verifications: List[FluxVerifiedRetweet] = Field(..., description="校验通过的 retweet 列表")
+
+class FluxVerificationBatchResponse(BaseModel):
+    """Flux 批量校验结果推送响应"""
+    success: bool = Field(..., description="操作是否成功")
+    message: str = Field(..., description="响应消息")
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class ProjectSummary(BaseModel):
+    """项目及其任务摘要"""
+    id: int = Field(..., description="项目ID")
+    name: str = Field(..., description="项目名称")
+    description: Optional[str] = Field(None, description="项目描述")
+    icon: Optional[str] = Field(None, description="项目图标URL")
+    created_time: datetime = Field(..., description="创建时间")
+    task_count: int = Field(..., description="任务数量")
+    last_task_time: Optional[datetime] = Field(None, description="最近一次创建任务的时间")
+
+class ProjectListResponse(BaseModel):
+    """项目列表响应"""
+    projects: List[ProjectSummary] = Field(..., description="项目列表")
+    limit: int = Field(..., description="每页数量")
+    next_cursor: Optional[int] = Field(None, description="下一页游标（传入 after_id），没有更多数据时为空")
+    has_more: bool = Field(..., description="是否还有更多数据")
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, HttpUrl
 from typing import Optional, List
 from datetime import datetime
-from app.schemas.enums import TaskType
+from app.schemas.enums import MonitorState, TaskType
 
 class TaskCreate(BaseModel):
     """创建任务的请求模型"""
@@ -12,6 +12,7 @@ class TaskCreate(BaseModel):
     twitter_name: str = Field(..., description="Twitter 用户名")
     twitter_url: HttpUrl = Field(..., description="Twitter URL")
     user_wallet: Optional[str] = Field(None, description="用户钱包地址")
+    end_time: Optional[datetime] = Field(None, description="任务结束时间，到期后自动停止推文监控 (ISO format with Z)")
 
 class TaskResponse(BaseModel):
     """任务创建响应"""
@@ -36,12 +37,19 @@ class TaskInfo(BaseModel):
     url: str = Field(..., description="任务URL")
     user_wallet: Optional[str] = Field(None, description="用户钱包地址")
     created_time: datetime = Field(..., description="创建时间")
+    end_time: Optional[datetime] = Field(None, description="任务结束时间")
+    monitor_state: MonitorState = Field(..., description="推文监控状态")
     project: ProjectInfo = Field(..., description="关联的项目信息")
 
 class TaskListRequest(BaseModel):
     """任务列表请求"""
     limit: int = Field(10, ge=1, le=100, description="每页数量")
     offset: int = Field(0, ge=0, description="偏移量")
+    user_wallet: Optional[str] = Field(None, description="用户钱包地址过滤")
+    project_id: Optional[int] = Field(None, description="项目ID过滤")
+    type: Optional[TaskType] = Field(None, description="任务类型过滤")
+    created_from: Optional[datetime] = Field(None, description="创建时间下限（包含）")
+    created_to: Optional[datetime] = Field(None, description="创建时间上限（不包含）")
 
 class TaskListResponse(BaseModel):
     """任务列表响应"""
@@ -50,3 +58,30 @@ class TaskListResponse(BaseModel):
     limit: int = Field(..., description="每页数量")
     offset: int = Field(..., description="偏移量")
     has_more: bool = Field(..., description="是否还有更多数据")
+
+class QualifyingUserInfo(BaseModel):
+    """合格用户信息"""
+    user_id: str = Field(..., description="用户ID")
+    interaction_time: datetime = Field(..., description="窗口内首次 retweet 时间")
+
+class QualifyingUsersResponse(BaseModel):
+    """任务奖励窗口合格用户响应"""
+    task_id: int = Field(..., description="任务ID")
+    post_id: str = Field(..., description="帖子ID")
+    start_time: datetime = Field(..., description="开始时间")
+    end_time: datetime = Field(..., description="结束时间")
+    snapshot_id: Optional[int] = Field(None, description="快照ID（窗口已关闭时返回）")
+    users: List[QualifyingUserInfo] = Field(..., description="合格用户列表")
+    total_count: int = Field(..., description="总数量")
+    limit: int = Field(..., description="每页数量")
+    offset: int = Field(..., description="偏移量")
+    has_more: bool = Field(..., description="是否还有更多数据")
+
+class MonitorReport(BaseModel):
+    """推文监控回收报告"""
+    active: int = Field(..., description="有效的推文监控数量")
+    expired: int = Field(..., description="已到结束时间、等待回收的数量")
+    reaped: int = Field(..., description="已回收的数量")
+    last_run_time: Optional[datetime] = Field(None, description="最近一次回收时间")
+    deletes_sent: int = Field(..., description="进程启动以来发出的 DELETE 请求数")
+    delete_failures: int = Field(..., description="进程启动以来失败的 DELETE 请求数")
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
+from pydantic import BaseModel, HttpUrl, Field, TypeAdapter
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from app.schemas.enums import StatsBucket
+from app.utils import Utils
 
 class Interaction(BaseModel):
     """Twitter 互动数据模型"""
@@ -14,6 +16,76 @@ class Interaction(BaseModel):
     post_id: str
     post_time: datetime
 
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+class InteractionRecord:
+    """
+    内部扫描使用的精简互动记录
+    
+    只保留扫描需要的字段，不做 URL 等校验；interaction_type 已转为小写，
+    interaction_time 已转换为 UTC。
+    """
+    __slots__ = ("interaction_id", "user_id", "post_id", "interaction_type", "interaction_time")
+    
+    def __init__(self, interaction_id: str, user_id: str, post_id: str, interaction_type: str, interaction_time: datetime):
+        self.interaction_id = interaction_id
+        self.user_id = user_id
+        self.post_id = post_id
+        self.interaction_type = interaction_type
+        self.interaction_time = interaction_time
+    
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "InteractionRecord":
+        """
+        从采集服务返回的原始字典解码
+        
+        Args:
+            raw: 单条互动数据的原始字典
+            
+        Returns:
+            InteractionRecord: 精简互动记录
+        """
+        value = raw["interaction_time"]
+        try:
+            interaction_time = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            # 非 ISO 格式时退回 pydantic 的解析规则
+            interaction_time = _DATETIME_ADAPTER.validate_python(value)
+        return cls(
+            str(raw["interaction_id"]),
+            str(raw["user_id"]),
+            str(raw["post_id"]),
+            raw["interaction_type"].lower(),
+            Utils.to_utc(interaction_time)
+        )
+
+class InteractionRecordPage:
+    """一页精简互动记录"""
+    __slots__ = ("records", "has_next", "total_items")
+    
+    def __init__(self, records: List[InteractionRecord], has_next: bool, total_items: int):
+        self.records = records
+        self.has_next = has_next
+        self.total_items = total_items
+    
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any]) -> "InteractionRecordPage":
+        """
+        从采集服务返回的原始分页数据解码
+        
+        Args:
+            data: 原始响应数据
+            
+        Returns:
+            InteractionRecordPage: 精简记录分页
+        """
+        pagination = data["pagination"]
+        return cls(
+            [InteractionRecord.from_raw(raw) for raw in data.get("interactions", [])],
+            bool(pagination["has_next"]),
+            int(pagination["total_items"])
+        )
+
 class PaginationInfo(BaseModel):
     """分页信息"""
     current_page: int
@@ -30,6 +102,14 @@ class TwitterInteractionResponse(BaseModel):
     pagination: PaginationInfo
     interactions: List[Interaction]
 
+class InteractionChangefeedResponse(BaseModel):
+    """互动变更流响应"""
+    media_account: str = Field(..., description="媒体账号")
+    interactions: List[Interaction] = Field(..., description="游标之后的新互动，按 interaction_time、interaction_id 升序；只包含稳定时间之前的互动，更晚入库的互动不会返回")
+    next_cursor: str = Field(..., description="下一次请求使用的游标")
+    has_more: bool = Field(..., description="是否还有未查询的历史数据，为 true 时可立即再次请求")
+    settled_until: datetime = Field(..., description="已稳定的时间上限，游标追上后需等待其推进；按账号推文的当前更新间隔计算")
+
 class SubnetTweetTaskRequest(BaseModel):
     """子网推文任务请求"""
     media_account: str
@@ -41,6 +121,22 @@ class SubnetTweetTaskResponse(BaseModel):
     success: bool
     message: str
 
+class MonitorFrequencyItem(BaseModel):
+    """单条推文的监控频率"""
+    media_account: str = Field(..., description="媒体账号")
+    tweet_id: str = Field(..., description="推文ID")
+    update_frequency: str = Field(..., description="当前更新频率")
+    velocity_per_hour: float = Field(..., description="观察窗口内的互动速度（次/小时）")
+    polls_saved: float = Field(..., description="相对默认频率节省的采集服务轮询次数，为负表示加快")
+
+class MonitorFrequencyReport(BaseModel):
+    """推文监控频率调整报告"""
+    tweets: List[MonitorFrequencyItem] = Field(..., description="各推文的监控频率")
+    default_frequency: str = Field(..., description="默认更新频率")
+    frequency_updates: int = Field(..., description="发出的频率更新请求数")
+    velocity_requests: int = Field(..., description="统计互动速度发出的采集服务请求数")
+    net_requests_saved: float = Field(..., description="扣除以上请求后净节省的采集服务请求数")
+
 class RetweetCheckRequest(BaseModel):
     """Retweet检测请求"""
     media_account: str = Field(..., description="媒体账号")
@@ -53,3 +149,43 @@ class RetweetCheckResponse(BaseModel):
     """Retweet检测响应"""
     has_retweet: bool = Field(..., description="是否有retweet操作")
     message: str = Field(..., description="响应消息")
+
+class InteractionStatsEntry(BaseModel):
+    """单个时间桶内的互动计数"""
+    bucket_start: datetime = Field(..., description="时间桶开始时间")
+    interaction_type: str = Field(..., description="互动类型")
+    post_id: str = Field(..., description="帖子ID")
+    count: int = Field(..., description="互动数量")
+
+class InteractionStatsResponse(BaseModel):
+    """互动统计响应"""
+    media_account: str = Field(..., description="媒体账号")
+    bucket: StatsBucket = Field(..., description="时间粒度")
+    start_time: datetime = Field(..., description="开始时间")
+    end_time: datetime = Field(..., description="结束时间")
+    total: int = Field(..., description="互动总数")
+    stats: List[InteractionStatsEntry] = Field(..., description="按时间桶、互动类型和帖子分组的计数")
+
+class LeaderboardEntry(BaseModel):
+    """排行榜条目"""
+    rank: int = Field(..., description="排名（从 1 开始）")
+    user_id: str = Field(..., description="用户ID")
+    username: Optional[str] = Field(None, description="用户名")
+    score: float = Field(..., description="加权互动得分")
+
+class LeaderboardResponse(BaseModel):
+    """排行榜响应"""
+    media_account: str = Field(..., description="媒体账号")
+    window_start: Optional[datetime] = Field(None, description="实际统计窗口开始时间，为空表示全部历史")
+    settled_until: Optional[datetime] = Field(None, description="得分已统计到的时间，之后的互动尚未稳定")
+    total_users: int = Field(..., description="参与互动的用户总数")
+    entries: List[LeaderboardEntry] = Field(..., description="排行榜条目")
+
+class LeaderboardRankResponse(BaseModel):
+    """单个用户排名响应"""
+    media_account: str = Field(..., description="媒体账号")
+    user_id: str = Field(..., description="用户ID")
+    rank: Optional[int] = Field(None, description="排名，用户没有互动时为空")
+    score: float = Field(..., description="加权互动得分")
+    settled_until: Optional[datetime] = Field(None, description="得分已统计到的时间，之后的互动尚未稳定")
+    total_users: int = Field(..., description="参与互动的用户总数")
@@ -1,9 +1,12 @@
 from typing import Optional
+import asyncio
 import aiohttp
 from fastapi import HTTPException
 
 from app.core.config import get_settings
-from app.schemas.flux import FluxTaskCreateRequest, FluxTaskCreateResponse
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.tracing import tracer
+from app.schemas.flux import FluxTaskCreateRequest, FluxTaskCreateResponse, FluxVerificationBatchRequest, FluxVerificationBatchResponse
 
 settings = get_settings()
 
@@ -43,31 +46,39 @@ class FluxService:
             request_data["project_icon"] = task_data.project_icon
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=request_data) as response:
-                    # 解析响应数据
-                    data = await response.json()
-                    
-                    if response.status >= 400:
-                        return FluxTaskCreateResponse(
-                            success=False,
-                            message=data.get("message", f"Request failed with status {response.status}")
-                        )
-                    
-                    # 根据响应的 success 字段判断成功与否
-                    if data.get("success"):
-                        return FluxTaskCreateResponse(
-                            success=True,
-                            task_id=data.get("task_id"),
-                            message=data.get("message", "Task created successfully"),
-                            vlc_value=data.get("vlc_value")
-                        )
-                    else:
-                        return FluxTaskCreateResponse(
-                            success=False,
-                            message=data.get("message", "Task creation failed")
-                        )
-                    
+            with tracer.span("flux.create_task", url=url) as span:
+                async with aiohttp.ClientSession(timeout=Deadline.client_timeout()) as session:
+                    async with session.post(url, json=request_data, headers=tracer.inject_headers()) as response:
+                        if span is not None:
+                            span.set_attribute("status_code", response.status)
+                        # 解析响应数据
+                        data = await response.json()
+                        
+                        if response.status >= 400:
+                            return FluxTaskCreateResponse(
+                                success=False,
+                                message=data.get("message", f"Request failed with status {response.status}")
+                            )
+                        
+                        # 根据响应的 success 字段判断成功与否
+                        if data.get("success"):
+                            return FluxTaskCreateResponse(
+                                success=True,
+                                task_id=data.get("task_id"),
+                                message=data.get("message", "Task created successfully"),
+                                vlc_value=data.get("vlc_value")
+                            )
+                        else:
+                            return FluxTaskCreateResponse(
+                                success=False,
+                                message=data.get("message", "Task creation failed")
+                            )
+                        
+        except (DeadlineExceeded, asyncio.TimeoutError):
+            raise HTTPException(
+                status_code=504,
+                detail="Timed out waiting for Flux service"
+            )
         except aiohttp.ClientError as e:
             raise HTTPException(
                 status_code=500,
@@ -78,3 +89,46 @@ class FluxService:
                 status_code=500,
                 detail=f"Internal server error: {str(e)}"
             )
+    
+    @staticmethod
+    async def push_verified_retweets(batch: FluxVerificationBatchRequest) -> FluxVerificationBatchResponse:
+        """
+        批量推送校验通过的 retweet
+        
+        Args:
+            batch: 批量推送请求数据
+            
+        Returns:
+            FluxVerificationBatchResponse: 推送响应（连接失败时 success 为 False）
+        """
+        url = f"{settings.FLUX_URL}{settings.FLUX_VERIFICATION_PATH}"
+        
+        try:
+            with tracer.span("flux.push_verified_retweets", url=url, count=len(batch.verifications)):
+                async with aiohttp.ClientSession(timeout=Deadline.client_timeout()) as session:
+                    async with session.post(url, json=batch.model_dump(mode="json"), headers=tracer.inject_headers()) as response:
+                        try:
+                            data = await response.json()
+                        except Exception:
+                            data = {}
+                        
+                        if response.status >= 400 or not data.get("success", False):
+                            return FluxVerificationBatchResponse(
+                                success=False,
+                                message=data.get("message", f"Request failed with status {response.status}")
+                            )
+                        return FluxVerificationBatchResponse(
+                            success=True,
+                            message=data.get("message", "Verifications accepted")
+                        )
+                        
+        except (DeadlineExceeded, asyncio.TimeoutError):
+            return FluxVerificationBatchResponse(
+                success=False,
+                message="Timed out waiting for Flux service"
+            )
+        except aiohttp.ClientError as e:
+            return FluxVerificationBatchResponse(
+                success=False,
+                message=f"Failed to connect to Flux service: {str(e)}"
+            )
@@ -0,0 +1,217 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.schemas.enums import RequestPriority
+from app.schemas.twitter import Interaction, InteractionChangefeedResponse, TwitterInteractionResponse
+from app.services.monitor_frequency import monitor_frequency_manager
+from app.services.twitter import TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+
+class ChangefeedCursor:
+    """
+    互动变更流游标
+
+    after_time 之前的互动已返回给调用方，after_time 总是对齐到秒；window 为下一次查询的时间窗口（秒），
+    随数据密度自适应调整；page 不为 0 时表示 after_time 所在的一秒内互动超过一页，已返回前 page 页。
+    编码为不透明字符串，绑定媒体账号。
+    """
+
+    __slots__ = ("after_time", "window", "page")
+
+    def __init__(self, after_time: datetime, window: int, page: int = 0):
+        self.after_time = Utils.to_utc(after_time).replace(microsecond=0)
+        self.window = window
+        self.page = page
+
+    def encode(self, media_account: str) -> str:
+        """
+        编码为不透明游标
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            str: URL 安全的 base64 字符串
+        """
+        payload = {"a": media_account, "t": self.after_time.isoformat(), "w": self.window}
+        if self.page:
+            payload["p"] = self.page
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str, media_account: str) -> "ChangefeedCursor":
+        """
+        解码游标
+
+        Args:
+            value: 游标字符串
+            media_account: 媒体账号
+
+        Returns:
+            ChangefeedCursor: 游标
+
+        Raises:
+            HTTPException: 游标格式无效或不属于该媒体账号时抛出
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+            if payload["a"] != media_account:
+                raise ValueError("media account mismatch")
+            return cls(
+                datetime.fromisoformat(payload["t"]),
+                max(1, int(payload["w"])),
+                max(0, int(payload.get("p", 0)))
+            )
+        except Exception:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor"
+            )
+
+
+class InteractionChangefeedService:
+    """互动变更流服务"""
+
+    @staticmethod
+    def _key(interaction: Interaction) -> Tuple[datetime, str]:
+        return Utils.to_utc(interaction.interaction_time), interaction.interaction_id
+
+    @staticmethod
+    def settled_until(media_account: str) -> datetime:
+        """
+        获取媒体账号已稳定的时间上限
+
+        采集服务在下一次轮询推文时才写入互动，互动最多晚账号推文的最长更新间隔入库，
+        另留出 CHANGEFEED_SETTLE_MARGIN_SECONDS 的入库时间。
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            datetime: 该时间之前的互动已全部入库（对齐到秒）
+        """
+        settle = monitor_frequency_manager.settle_seconds(media_account) + settings.CHANGEFEED_SETTLE_MARGIN_SECONDS
+        return (datetime.now(timezone.utc) - timedelta(seconds=settle)).replace(microsecond=0)
+
+    @staticmethod
+    async def _query_page(
+        media_account: str,
+        window_start: datetime,
+        window_end: datetime,
+        limit: int,
+        page: int = 1
+    ) -> TwitterInteractionResponse:
+        return await TwitterService.get_interactions(
+            media_account=media_account,
+            page=page,
+            per_page=limit,
+            start_time=window_start,
+            end_time=window_end,
+            priority=RequestPriority.INTERACTIVE
+        )
+
+    @staticmethod
+    async def get_changes(
+        media_account: str,
+        cursor: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        limit: int = 100
+    ) -> InteractionChangefeedResponse:
+        """
+        获取游标之后的新互动数据
+
+        按 (interaction_time, interaction_id) 排序，每次只查询游标之后的一个时间窗口：
+        窗口内数据超过一页时按比例缩小窗口重新查询，数据稀疏时下一次扩大窗口，
+        因此稳定状态下每次轮询只需请求采集服务一页，与历史数据量无关。
+        一秒内的互动超过一页时无法再缩小窗口，游标记录页码，每次轮询续读一页。
+        只返回 settled_until 之前的互动，稳定时间按该账号推文的当前更新间隔计算。
+
+        Args:
+            media_account: 媒体账号
+            cursor: 上一次返回的 next_cursor（可选）
+            start_time: 没有游标时的开始时间（可选，默认 settled_until，不能晚于 settled_until）
+            limit: 每次查询的最大数量（1-100）
+
+        Returns:
+            InteractionChangefeedResponse: 新互动数据与下一次使用的游标
+
+        Raises:
+            HTTPException: 游标无效、开始时间晚于 settled_until 或请求失败时抛出
+        """
+        # 只查询已稳定的时间范围，给采集服务留出入库时间
+        horizon = InteractionChangefeedService.settled_until(media_account)
+        if cursor:
+            state = ChangefeedCursor.decode(cursor, media_account)
+        elif start_time is not None and Utils.to_utc(start_time) > horizon:
+            raise HTTPException(
+                status_code=400,
+                detail=f"start_time must not be later than settled_until ({horizon.isoformat()})"
+            )
+        else:
+            state = ChangefeedCursor(start_time or horizon, settings.CHANGEFEED_INITIAL_WINDOW_SECONDS)
+
+        window_start = state.after_time
+        if window_start >= horizon:
+            return InteractionChangefeedResponse(
+                media_account=media_account,
+                interactions=[],
+                next_cursor=state.encode(media_account),
+                has_more=False,
+                settled_until=horizon
+            )
+
+        if state.page:
+            # 续读超过一页的那一秒
+            window = 1
+            window_end = window_start + timedelta(seconds=1)
+            page = state.page + 1
+            response = await InteractionChangefeedService._query_page(media_account, window_start, window_end, limit, page)
+        else:
+            window = min(state.window, settings.CHANGEFEED_MAX_WINDOW_SECONDS)
+            page = 1
+            while True:
+                window_end = min(window_start + timedelta(seconds=window), horizon)
+                span = int((window_end - window_start).total_seconds())
+                response = await InteractionChangefeedService._query_page(media_account, window_start, window_end, limit)
+                if not response.pagination.has_next or span <= 1:
+                    break
+                metrics.inc("changefeed_window_shrinks")
+                # 按数据密度缩小到预计一页能容纳的窗口
+                window = max(1, min(span - 1, span * limit // max(response.pagination.total_items, 1)))
+
+        # 采集服务的时间过滤精确到秒，窗口结束那一秒留给下一个窗口
+        changes = sorted(
+            (
+                interaction for interaction in response.interactions
+                if window_start <= Utils.to_utc(interaction.interaction_time) < window_end
+            ),
+            key=InteractionChangefeedService._key
+        )
+        if response.pagination.has_next:
+            # 一秒内的互动超过一页，下一次续读下一页
+            next_cursor = ChangefeedCursor(window_start, 1, page)
+            has_more = True
+        else:
+            if len(response.interactions) * 2 < limit:
+                window = min(window * 2, settings.CHANGEFEED_MAX_WINDOW_SECONDS)
+            # 整个窗口已返回，游标推进到窗口结束
+            next_cursor = ChangefeedCursor(window_end, window)
+            has_more = window_end < horizon
+
+        metrics.inc("changefeed_interactions", len(changes))
+        return InteractionChangefeedResponse(
+            media_account=media_account,
+            interactions=changes,
+            next_cursor=next_cursor.encode(media_account),
+            has_more=has_more,
+            settled_until=horizon
+        )
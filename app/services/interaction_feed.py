@@ -0,0 +1,183 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+from app.core.deadline import create_background_task
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.schemas.twitter import Interaction
+from app.services.twitter import InteractionWatermark, TwitterService
+
+settings = get_settings()
+
+
+class FeedSubscriber:
+    """单个订阅者，持有有界队列"""
+
+    def __init__(self, media_account: str, queue_size: int):
+        self.media_account = media_account
+        self.queue: "asyncio.Queue[Optional[Interaction]]" = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, interaction: Interaction) -> bool:
+        """
+        非阻塞投递一条互动数据
+
+        Args:
+            interaction: 互动数据
+
+        Returns:
+            bool: 队列已满时返回 False
+        """
+        try:
+            self.queue.put_nowait(interaction)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self) -> None:
+        """丢弃积压数据并通知消费端结束"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class _AccountPoller:
+    """单个媒体账号的共享上游轮询器"""
+
+    def __init__(self, media_account: str):
+        self.media_account = media_account
+        self.subscribers: Set[FeedSubscriber] = set()
+        self.watermark = InteractionWatermark(since=datetime.now(timezone.utc))
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                interactions = await TwitterService.fetch_interactions_since(
+                    self.media_account, self.watermark
+                )
+                if interactions:
+                    self.fan_out(interactions)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"互动订阅轮询失败: media_account={self.media_account}, error={str(e)}")
+            await asyncio.sleep(interval)
+
+    def fan_out(self, interactions: List[Interaction]) -> None:
+        for subscriber in list(self.subscribers):
+            for interaction in interactions:
+                if not subscriber.offer(interaction):
+                    # 慢消费者直接断开，不做无界缓冲
+                    logger.warning(f"订阅者消费过慢，断开连接: media_account={self.media_account}")
+                    self.subscribers.discard(subscriber)
+                    subscriber.drop()
+                    metrics.inc("feed_dropped_subscribers")
+                    break
+
+
+class InteractionFeedHub:
+    """
+    互动数据实时订阅中心
+
+    每个媒体账号只运行一个上游轮询器，按水位线增量拉取新数据后分发给全部订阅者。
+    """
+
+    def __init__(self, poll_interval: float, queue_size: int):
+        self._poll_interval = poll_interval
+        self._queue_size = queue_size
+        self._pollers: Dict[str, _AccountPoller] = {}
+
+    def subscribe(self, media_account: str) -> FeedSubscriber:
+        """
+        订阅媒体账号的新互动数据，必要时启动轮询器
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            FeedSubscriber: 订阅者
+        """
+        poller = self._pollers.get(media_account)
+        if poller is None:
+            poller = self._pollers[media_account] = _AccountPoller(media_account)
+            poller.task = create_background_task(poller.run(self._poll_interval))
+            logger.info(f"启动互动订阅轮询器: media_account={media_account}")
+        subscriber = FeedSubscriber(media_account, self._queue_size)
+        poller.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: FeedSubscriber) -> None:
+        """
+        取消订阅，最后一个订阅者离开时停止轮询器
+
+        Args:
+            subscriber: 订阅者
+        """
+        poller = self._pollers.get(subscriber.media_account)
+        if poller is None:
+            return
+        poller.subscribers.discard(subscriber)
+        if not poller.subscribers:
+            poller.task.cancel()
+            del self._pollers[subscriber.media_account]
+            logger.info(f"停止互动订阅轮询器: media_account={subscriber.media_account}")
+
+    async def stream(self, media_account: str, heartbeat: float) -> AsyncIterator[str]:
+        """
+        以 Server-Sent Events 格式输出新互动数据
+
+        Args:
+            media_account: 媒体账号
+            heartbeat: 心跳间隔（秒）
+
+        Yields:
+            str: SSE 事件文本
+        """
+        subscriber = self.subscribe(media_account)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    interaction = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if interaction is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                yield (
+                    f"id: {interaction.interaction_id}\n"
+                    f"event: interaction\n"
+                    f"data: {interaction.model_dump_json()}\n\n"
+                )
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def shutdown(self) -> None:
+        """停止全部轮询器"""
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for poller in pollers:
+            poller.task.cancel()
+        await asyncio.gather(*(p.task for p in pollers), return_exceptions=True)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出订阅指标
+
+        Returns:
+            Dict[str, float]: 轮询器与订阅者数量
+        """
+        return {
+            "feed_pollers": float(len(self._pollers)),
+            "feed_subscribers": float(sum(len(p.subscribers) for p in self._pollers.values()))
+        }
+
+
+interaction_feed = InteractionFeedHub(
+    poll_interval=settings.FEED_POLL_INTERVAL_SECONDS,
+    queue_size=settings.FEED_QUEUE_SIZE
+)
+metrics.register_collector(interaction_feed.stats)
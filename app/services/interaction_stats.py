@@ -0,0 +1,165 @@
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.schemas.enums import StatsBucket
+from app.schemas.twitter import InteractionStatsEntry, InteractionStatsResponse
+from app.services.twitter import TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+BUCKET_SECONDS = {
+    StatsBucket.MINUTE: 60,
+    StatsBucket.HOUR: 3600,
+    StatsBucket.DAY: 86400,
+}
+
+
+class ClosedBucketCache:
+    """已关闭时间桶的计数缓存，桶内计数以 (interaction_type, post_id) 为键（按桶数量做 LRU 淘汰）"""
+
+    def __init__(self, max_buckets: int):
+        self._max_buckets = max_buckets
+        self._buckets: "OrderedDict[Tuple[str, StatsBucket, datetime], Counter]" = OrderedDict()
+
+    def get(self, media_account: str, bucket: StatsBucket, bucket_start: datetime) -> Optional[Counter]:
+        key = (media_account, bucket, bucket_start)
+        counts = self._buckets.get(key)
+        if counts is not None:
+            self._buckets.move_to_end(key)
+        return counts
+
+    def put(self, media_account: str, bucket: StatsBucket, bucket_start: datetime, counts: Counter) -> None:
+        key = (media_account, bucket, bucket_start)
+        self._buckets[key] = counts
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_buckets:
+            self._buckets.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        return {"interaction_stats_cached_buckets": float(len(self._buckets))}
+
+
+closed_buckets = ClosedBucketCache(max_buckets=settings.STATS_CACHE_MAX_BUCKETS)
+metrics.register_collector(closed_buckets.stats)
+
+
+class InteractionStatsService:
+    """互动统计服务"""
+
+    @staticmethod
+    def floor_time(value: datetime, bucket: StatsBucket) -> datetime:
+        """
+        将时间向下取整到时间桶边界
+
+        Args:
+            value: UTC 时间
+            bucket: 时间粒度
+
+        Returns:
+            datetime: 时间桶开始时间
+        """
+        width = BUCKET_SECONDS[bucket]
+        seconds = int(value.timestamp()) // width * width
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+    @staticmethod
+    async def get_stats(
+        media_account: str,
+        bucket: StatsBucket,
+        start_time: datetime,
+        end_time: Optional[datetime] = None
+    ) -> InteractionStatsResponse:
+        """
+        按时间桶、互动类型和帖子统计互动数量
+
+        时间窗口开头连续的已关闭时间桶直接读取缓存，其余部分对采集服务分页数据做一次流式遍历，
+        内存占用只与时间桶数量相关。
+
+        Args:
+            media_account: 媒体账号
+            bucket: 时间粒度
+            start_time: 开始时间
+            end_time: 结束时间（默认当前时间）
+
+        Returns:
+            InteractionStatsResponse: 互动统计响应
+
+        Raises:
+            HTTPException: 当时间窗口无效或请求失败时抛出
+        """
+        now = datetime.now(timezone.utc)
+        start_time = Utils.to_utc(start_time)
+        end_time = Utils.to_utc(end_time) if end_time else now
+        if start_time >= end_time:
+            raise HTTPException(
+                status_code=400,
+                detail="start_time must be earlier than end_time"
+            )
+
+        width = timedelta(seconds=BUCKET_SECONDS[bucket])
+        closed_before = now - timedelta(seconds=settings.interaction_settle_seconds)
+
+        # 收集窗口开头连续命中缓存的完整时间桶
+        counts: Dict[datetime, Counter] = {}
+        scan_start = start_time
+        bucket_start = InteractionStatsService.floor_time(start_time, bucket)
+        while bucket_start >= start_time and bucket_start + width <= end_time:
+            cached = closed_buckets.get(media_account, bucket, bucket_start)
+            if cached is None:
+                break
+            counts[bucket_start] = cached
+            bucket_start += width
+            scan_start = bucket_start
+        if bucket_start < start_time:
+            # 起始时间未对齐时第一个时间桶只统计窗口内部分
+            bucket_start += width
+        metrics.inc("interaction_stats_cached_bucket_hits", len(counts))
+
+        if scan_start < end_time:
+            logger.info(f"统计互动数据: media_account={media_account}, bucket={bucket.value}, scan_start={scan_start}, end_time={end_time}")
+            scanned: Dict[datetime, Counter] = {}
+            async for page in TwitterService.iter_interaction_record_pages(
+                media_account=media_account,
+                start_time=scan_start,
+                end_time=end_time
+            ):
+                for record in page.records:
+                    if not scan_start <= record.interaction_time <= end_time:
+                        continue
+                    key = InteractionStatsService.floor_time(record.interaction_time, bucket)
+                    bucket_counts = scanned.get(key)
+                    if bucket_counts is None:
+                        bucket_counts = scanned[key] = Counter()
+                    bucket_counts[(record.interaction_type, record.post_id)] += 1
+
+            # 缓存窗口内完整且已关闭的时间桶（包括没有互动的空桶）
+            while bucket_start + width <= min(end_time, closed_before):
+                closed_buckets.put(media_account, bucket, bucket_start, scanned.get(bucket_start, Counter()))
+                bucket_start += width
+            counts.update(scanned)
+
+        stats = [
+            InteractionStatsEntry(
+                bucket_start=key,
+                interaction_type=interaction_type,
+                post_id=post_id,
+                count=count
+            )
+            for key in sorted(counts)
+            for (interaction_type, post_id), count in sorted(counts[key].items())
+        ]
+        return InteractionStatsResponse(
+            media_account=media_account,
+            bucket=bucket,
+            start_time=start_time,
+            end_time=end_time,
+            total=sum(entry.count for entry in stats),
+            stats=stats
+        )
@@ -0,0 +1,334 @@
+import asyncio
+import heapq
+import random
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.schemas.twitter import Interaction, LeaderboardEntry, LeaderboardResponse, LeaderboardRankResponse
+from app.services.twitter import InteractionWatermark, TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+# 跳表最大层数，足以容纳 2^32 个用户
+_MAX_LEVELS = 32
+
+
+class _SkipNode:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[Tuple[float, str]], levels: int):
+        self.key = key
+        self.next: List[Optional["_SkipNode"]] = [None] * levels
+        # 到同层下一个节点跨过的元素数量
+        self.width = [1] * levels
+
+
+class RankedScores:
+    """
+    可按位置索引的跳表，按 (-score, user_id) 升序保存得分
+
+    插入、删除与排名查询的期望复杂度均为 O(log n)。
+    """
+
+    def __init__(self):
+        self._head = _SkipNode(None, _MAX_LEVELS)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _chain(self, key: Tuple[float, str]) -> Tuple[List[_SkipNode], List[int]]:
+        # 每层最后一个小于 key 的节点，以及在该层前进跨过的元素数量
+        chain: List[_SkipNode] = [self._head] * _MAX_LEVELS
+        steps = [0] * _MAX_LEVELS
+        node = self._head
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def add(self, key: Tuple[float, str]) -> None:
+        """插入一个 (-score, user_id)"""
+        chain, steps_at_level = self._chain(key)
+        levels = 1
+        while levels < _MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        node = _SkipNode(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            node.next[level] = prev.next[level]
+            prev.next[level] = node
+            node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, _MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Tuple[float, str]) -> None:
+        """删除一个 (-score, user_id)，不存在时抛出 KeyError"""
+        chain, _ = self._chain(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+        for level in range(len(node.next), _MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def position(self, key: Tuple[float, str]) -> int:
+        """key 的排名（从 1 开始），即小于 key 的元素数量加一"""
+        _, steps = self._chain(key)
+        return sum(steps) + 1
+
+    def head(self, limit: int) -> Iterable[Tuple[float, str]]:
+        """按顺序返回前 limit 个元素"""
+        node = self._head.next[0]
+        while node is not None and limit > 0:
+            yield node.key
+            node = node.next[0]
+            limit -= 1
+
+
+class AccountLeaderboard:
+    """
+    单个媒体账号的加权互动排行榜
+
+    得分保存在 user_id -> score 字典中，同时维护按 (-score, user_id) 排序的跳表，
+    更新与排名查询均为 O(log n)。另按快照间隔把得分增量记录到时间桶中，最多保留 max_snapshots 个桶，
+    窗口排名为窗口开始之后各桶增量之和；按互动时间入桶，与互动到达的顺序无关。
+    """
+
+    def __init__(self, media_account: str, weights: Dict[str, float], snapshot_interval: int, max_snapshots: int):
+        self.media_account = media_account
+        self._weights = weights
+        self._snapshot_interval = snapshot_interval
+        self._max_snapshots = max(1, max_snapshots)
+        self.scores: Dict[str, float] = {}
+        self.usernames: Dict[str, str] = {}
+        self._ranked = RankedScores()
+        self._buckets: Dict[int, Dict[str, float]] = {}
+        self._latest_bucket: Optional[int] = None
+        self.watermark = InteractionWatermark()
+        self.settled_until: Optional[datetime] = None
+        self.last_refresh = 0.0
+        self.lock = asyncio.Lock()
+
+    def apply(self, interactions: Iterable[Interaction]) -> None:
+        """
+        累加新互动的得分
+
+        Args:
+            interactions: 新互动数据（顺序不限）
+        """
+        for interaction in interactions:
+            weight = self._weights.get(interaction.interaction_type.lower(), 0.0)
+            if not weight:
+                continue
+            self._add_score(interaction.user_id, weight)
+            self.usernames[interaction.user_id] = interaction.username
+            self._add_to_bucket(Utils.to_utc(interaction.interaction_time), interaction.user_id, weight)
+
+    def _add_score(self, user_id: str, weight: float) -> None:
+        old = self.scores.get(user_id)
+        if old is not None:
+            self._ranked.remove((-old, user_id))
+        new = (old or 0.0) + weight
+        self.scores[user_id] = new
+        self._ranked.add((-new, user_id))
+
+    def _add_to_bucket(self, interaction_time: datetime, user_id: str, weight: float) -> None:
+        bucket = int(interaction_time.timestamp()) // self._snapshot_interval * self._snapshot_interval
+        if self._latest_bucket is None or bucket > self._latest_bucket:
+            self._latest_bucket = bucket
+            oldest = self._retained_from()
+            for expired in [start for start in self._buckets if start < oldest]:
+                del self._buckets[expired]
+        if bucket < self._retained_from():
+            # 早于保留范围的互动只计入总分
+            return
+        deltas = self._buckets.setdefault(bucket, defaultdict(float))
+        deltas[user_id] += weight
+
+    def _retained_from(self) -> int:
+        return self._latest_bucket - (self._max_snapshots - 1) * self._snapshot_interval
+
+    def top(self, limit: int, since: Optional[datetime] = None) -> Tuple[Optional[datetime], List[LeaderboardEntry]]:
+        """
+        获取排行榜前 limit 名
+
+        Args:
+            limit: 返回数量
+            since: 窗口开始时间（可选，为空时返回全部历史排名）
+
+        Returns:
+            Tuple[Optional[datetime], List[LeaderboardEntry]]: (实际窗口开始时间, 排行榜条目)
+        """
+        if since is None:
+            window_start = None
+            ranked = [(-neg_score, user_id) for neg_score, user_id in self._ranked.head(limit)]
+        else:
+            start = int(Utils.to_utc(since).timestamp()) // self._snapshot_interval * self._snapshot_interval
+            if self._latest_bucket is not None:
+                # 更早的桶已被淘汰，退化为保留的最早桶
+                start = max(start, self._retained_from())
+            window_start = datetime.fromtimestamp(start, tz=timezone.utc)
+            window_scores: Dict[str, float] = defaultdict(float)
+            for bucket, deltas in self._buckets.items():
+                if bucket >= start:
+                    for user_id, weight in deltas.items():
+                        window_scores[user_id] += weight
+            ranked = [
+                (-neg_score, user_id)
+                for neg_score, user_id in heapq.nsmallest(
+                    limit,
+                    ((-score, user_id) for user_id, score in window_scores.items())
+                )
+            ]
+        return window_start, [
+            LeaderboardEntry(rank=index + 1, user_id=user_id, username=self.usernames.get(user_id), score=score)
+            for index, (score, user_id) in enumerate(ranked)
+        ]
+
+    def rank(self, user_id: str) -> Tuple[Optional[int], float]:
+        """
+        查询单个用户的排名
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            Tuple[Optional[int], float]: (排名, 得分)，用户没有得分时排名为 None
+        """
+        score = self.scores.get(user_id)
+        if score is None:
+            return None, 0.0
+        return self._ranked.position((-score, user_id)), score
+
+
+class LeaderboardService:
+    """互动排行榜服务"""
+
+    # 按最近使用顺序保存，超过 LEADERBOARD_MAX_ACCOUNTS 时淘汰最久未使用的账号
+    _boards: "OrderedDict[str, AccountLeaderboard]" = OrderedDict()
+
+    @staticmethod
+    async def _refresh(board: AccountLeaderboard) -> None:
+        # 采集服务在下一次轮询推文时才写入互动，只统计已稳定的数据，避免迟到的互动落在水位线之前
+        settled_until = datetime.now(timezone.utc) - timedelta(seconds=settings.interaction_settle_seconds)
+        # 本轮按原水位线判断，推进后的水位线在遍历结束后替换
+        advanced = InteractionWatermark(since=board.watermark.since, boundary_ids=board.watermark.boundary_ids)
+        applied = 0
+        # 逐页累加，不把整个历史读入内存
+        async for response in TwitterService.iter_interaction_pages(
+            media_account=board.media_account,
+            start_time=board.watermark.since,
+            end_time=settled_until
+        ):
+            interactions = [i for i in response.interactions if board.watermark.admits(i)]
+            board.apply(interactions)
+            advanced.advance(interactions)
+            applied += len(interactions)
+        board.watermark = advanced
+        board.settled_until = settled_until
+        metrics.inc("leaderboard_applied_interactions", applied)
+        logger.info(f"排行榜增量更新: media_account={board.media_account}, new_interactions={applied}, users={len(board.scores)}")
+
+    @staticmethod
+    async def _get_board(media_account: str) -> AccountLeaderboard:
+        """
+        获取媒体账号的排行榜，超过刷新间隔时先增量拉取新互动
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            AccountLeaderboard: 排行榜
+        """
+        boards = LeaderboardService._boards
+        board = boards.get(media_account)
+        if board is None:
+            board = boards[media_account] = AccountLeaderboard(
+                media_account,
+                weights=settings.leaderboard_weights,
+                snapshot_interval=settings.LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS,
+                max_snapshots=settings.LEADERBOARD_MAX_SNAPSHOTS
+            )
+            while len(boards) > settings.LEADERBOARD_MAX_ACCOUNTS:
+                boards.popitem(last=False)
+                metrics.inc("leaderboard_evictions")
+        else:
+            boards.move_to_end(media_account)
+        async with board.lock:
+            if time.monotonic() - board.last_refresh >= settings.LEADERBOARD_REFRESH_SECONDS:
+                try:
+                    await LeaderboardService._refresh(board)
+                except BaseException:
+                    # 中途失败时部分互动已计分而水位线未推进，丢弃排行榜，下次重新构建，避免重复计分
+                    if boards.get(media_account) is board:
+                        del boards[media_account]
+                    raise
+                board.last_refresh = time.monotonic()
+        return board
+
+    @staticmethod
+    async def get_leaderboard(
+        media_account: str,
+        limit: int = 10,
+        since: Optional[datetime] = None
+    ) -> LeaderboardResponse:
+        """
+        获取媒体账号的互动排行榜
+
+        Args:
+            media_account: 媒体账号
+            limit: 返回数量
+            since: 窗口开始时间（可选）
+
+        Returns:
+            LeaderboardResponse: 排行榜响应
+        """
+        board = await LeaderboardService._get_board(media_account)
+        window_start, entries = board.top(limit, since)
+        return LeaderboardResponse(
+            media_account=media_account,
+            window_start=window_start,
+            settled_until=board.settled_until,
+            total_users=len(board.scores),
+            entries=entries
+        )
+
+    @staticmethod
+    async def get_user_rank(media_account: str, user_id: str) -> LeaderboardRankResponse:
+        """
+        查询用户在媒体账号排行榜中的排名
+
+        Args:
+            media_account: 媒体账号
+            user_id: 用户ID
+
+        Returns:
+            LeaderboardRankResponse: 用户排名响应
+        """
+        board = await LeaderboardService._get_board(media_account)
+        rank, score = board.rank(user_id)
+        return LeaderboardRankResponse(
+            media_account=media_account,
+            user_id=user_id,
+            rank=rank,
+            score=score,
+            settled_until=board.settled_until,
+            total_users=len(board.scores)
+        )
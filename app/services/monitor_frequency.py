@@ -0,0 +1,326 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.crud.task import TaskCRUD
+from app.db.base import SessionLocal
+from app.schemas.enums import RequestPriority, TaskType
+from app.schemas.twitter import MonitorFrequencyItem, MonitorFrequencyReport, SubnetTweetTaskRequest
+from app.services.twitter import TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+
+def format_frequency(minutes: int) -> str:
+    """
+    转换为采集服务的更新频率格式，如 "10 minutes"、"6 hours"
+
+    Args:
+        minutes: 分钟数
+
+    Returns:
+        str: 更新频率
+    """
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hour" if hours == 1 else f"{hours} hours"
+    return f"{minutes} minute" if minutes == 1 else f"{minutes} minutes"
+
+
+class _TweetState:
+    """单条被监控推文的互动速度与当前更新频率"""
+
+    def __init__(self, minutes: int, now: float, synced: bool = True):
+        self.minutes = minutes
+        # 切换前的更新频率：切换后采集服务的下一次轮询最晚在旧间隔后发生
+        self.previous_minutes = minutes
+        # 新推文按创建时视为刚调整过，放慢前同样需要保持 min_dwell
+        self.changed_at = now
+        # 为 False 时采集服务上的实际频率未知（本进程启动前创建的监控），下一轮强制 PUT 同步
+        self.synced = synced
+        self.accounted_at = now
+        self.velocity = 0.0
+        # 相对默认频率节省的采集服务轮询次数（热门推文加快时为负）
+        self.polls_saved = 0.0
+
+
+class MonitorFrequencyManager:
+    """
+    推文监控更新频率自适应调整
+
+    定期拉取各媒体账号观察窗口内已稳定的互动，按推文统计互动速度（次/小时），
+    据此在配置的最小、最大频率之间选择采集服务的更新频率，并通过 PUT /subnet_tweet_task 更新。
+    为避免频繁切换：只有目标频率超出当前频率的滞后区间才调整，且放慢频率前需要保持一段时间；
+    加快频率立即生效，不错过突发流量。
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        window_minutes: int,
+        levels: List[int],
+        default_minutes: int,
+        target_per_poll: float,
+        hysteresis: float,
+        min_dwell: float
+    ):
+        self._interval = interval
+        self._window_minutes = max(1, window_minutes)
+        self._levels = sorted(levels)
+        self._default_minutes = default_minutes
+        self._target_per_poll = target_per_poll
+        self._hysteresis = max(1.0, hysteresis)
+        self._min_dwell = min_dwell
+        self._tweets: Dict[Tuple[str, str], _TweetState] = {}
+        self._updates = 0
+        self._velocity_requests = 0
+        self._started_at = datetime.now(timezone.utc)
+        # 是否已完成第一轮推文统计
+        self._tracking = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """启动后台调整循环"""
+        if self._task is None:
+            self._started_at = datetime.now(timezone.utc)
+            self._tracking = False
+            self._task = asyncio.create_task(self._run())
+            logger.info("推文监控频率自适应调整已启动")
+
+    async def stop(self) -> None:
+        """停止后台调整循环"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"推文监控频率调整失败: {str(e)}")
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> None:
+        """执行一轮互动速度统计与频率调整"""
+        db = SessionLocal()
+        try:
+            tasks = TaskCRUD.get_active_tasks(db, TaskType.TWITTER_RETWEET.value)
+            tweets_by_account: Dict[str, set] = defaultdict(set)
+            # 任务早于本进程启动的推文，之前的进程可能已调整过其频率；之后创建的监控一定使用默认频率
+            predates = set()
+            for task in tasks:
+                try:
+                    key = (task.twitter_name, Utils.extract_tweet_id(task.url))
+                except Exception:
+                    continue
+                tweets_by_account[key[0]].add(key[1])
+                if task.created_time is None or Utils.to_utc(task.created_time) < self._started_at:
+                    predates.add(key)
+        finally:
+            db.close()
+
+        now = time.time()
+        monitored = {(account, tweet_id) for account, tweet_ids in tweets_by_account.items() for tweet_id in tweet_ids}
+        # 不再监控的推文不再统计
+        for key in [key for key in self._tweets if key not in monitored]:
+            del self._tweets[key]
+        for key in monitored:
+            if key not in self._tweets:
+                if key in predates:
+                    # 实际频率未知，按最慢一档估计，同步前互动最多晚一个最长间隔入库
+                    self._tweets[key] = _TweetState(self._levels[-1], now, synced=False)
+                else:
+                    self._tweets[key] = _TweetState(self._default_minutes, now)
+        self._tracking = True
+
+        for media_account, tweet_ids in tweets_by_account.items():
+            await self._observe_account(media_account, tweet_ids)
+            for tweet_id in tweet_ids:
+                await self._adjust(media_account, tweet_id, self._tweets[(media_account, tweet_id)])
+
+    async def _observe_account(self, media_account: str, tweet_ids: set) -> None:
+        # 采集服务在下一次轮询推文时才写入其互动，推文最近一个更新间隔内的数据尚不完整，
+        # 因此每条推文统计 [now - 当前间隔 - 观察窗口, now - 当前间隔) 内已稳定的互动
+        now = datetime.now(timezone.utc)
+        window = timedelta(minutes=self._window_minutes)
+        ranges: Dict[str, Tuple[datetime, datetime]] = {}
+        for tweet_id in tweet_ids:
+            settled = now - timedelta(minutes=self._tweets[(media_account, tweet_id)].minutes)
+            ranges[tweet_id] = (settled - window, settled)
+        counts: Dict[str, int] = defaultdict(int)
+        async for page in TwitterService.iter_interaction_record_pages(
+            media_account=media_account,
+            start_time=min(start for start, _ in ranges.values()),
+            end_time=max(end for _, end in ranges.values())
+        ):
+            self._velocity_requests += 1
+            for record in page.records:
+                bounds = ranges.get(record.post_id)
+                if bounds is not None and bounds[0] <= record.interaction_time < bounds[1]:
+                    counts[record.post_id] += 1
+        for tweet_id in tweet_ids:
+            self._tweets[(media_account, tweet_id)].velocity = counts[tweet_id] * 60.0 / self._window_minutes
+
+    def raw_minutes(self, velocity: float) -> float:
+        """
+        按互动速度计算理想更新间隔：每次轮询平均采集到 target_per_poll 条新互动
+
+        Args:
+            velocity: 互动速度（次/小时）
+
+        Returns:
+            float: 更新间隔（分钟），没有互动时为无穷大
+        """
+        if velocity <= 0:
+            return float("inf")
+        return 60.0 * self._target_per_poll / velocity
+
+    def target_minutes(self, raw: float) -> int:
+        """
+        取不慢于理想间隔的最近一档更新频率
+
+        Args:
+            raw: 理想更新间隔（分钟）
+
+        Returns:
+            int: 更新间隔（分钟）
+        """
+        candidates = [level for level in self._levels if level <= raw]
+        return candidates[-1] if candidates else self._levels[0]
+
+    async def _adjust(self, media_account: str, tweet_id: str, state: _TweetState) -> None:
+        now = time.time()
+        # 按上一轮的频率累计节省的轮询次数
+        elapsed_minutes = (now - state.accounted_at) / 60
+        state.polls_saved += elapsed_minutes / self._default_minutes - elapsed_minutes / state.minutes
+        state.accounted_at = now
+
+        velocity = state.velocity
+        raw = self.raw_minutes(velocity)
+        target = self.target_minutes(raw)
+        if not state.synced:
+            # 实际频率未知，直接设置为目标频率
+            pass
+        elif target == state.minutes:
+            return
+        elif target < state.minutes:
+            # 加快：理想间隔需要低于滞后区间下沿
+            if raw * self._hysteresis > state.minutes:
+                return
+        else:
+            # 放慢：理想间隔需要高于滞后区间上沿，且当前频率已保持足够时间
+            if raw < state.minutes * self._hysteresis or now - state.changed_at < self._min_dwell:
+                return
+
+        response = await TwitterService.subnet_tweet_task(
+            method="PUT",
+            task_data=SubnetTweetTaskRequest(
+                media_account=media_account,
+                tweet_id=tweet_id,
+                update_frequency=format_frequency(target)
+            ),
+            priority=RequestPriority.BATCH
+        )
+        self._updates += 1
+        if not response.success:
+            metrics.inc("monitor_frequency_update_failures")
+            logger.warning(f"更新推文监控频率失败: media_account={media_account}, tweet_id={tweet_id}, message={response.message}")
+            return
+        metrics.inc("monitor_frequency_updates")
+        logger.info(f"推文监控频率调整: media_account={media_account}, tweet_id={tweet_id}, velocity={velocity:.1f}/h, {state.minutes} -> {target} minutes")
+        state.previous_minutes = state.minutes
+        state.minutes = target
+        state.changed_at = now
+        state.synced = True
+
+    def settle_seconds(self, media_account: str) -> int:
+        """
+        获取媒体账号互动数据的稳定时间
+
+        采集服务在下一次轮询推文时才写入互动，账号内任一推文的互动最多晚一个更新间隔入库；
+        刚切换频率的推文在旧间隔内仍按旧间隔计算。未启用频率调整时所有监控使用默认频率。
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            int: 稳定时间（秒）
+        """
+        if self._task is None:
+            return self._default_minutes * 60
+        now = time.time()
+        # 上一轮之后新建的监控使用默认频率
+        minutes = self._default_minutes
+        for (account, _), state in self._tweets.items():
+            if account != media_account:
+                continue
+            minutes = max(minutes, state.minutes)
+            if now - state.changed_at < state.previous_minutes * 60:
+                minutes = max(minutes, state.previous_minutes)
+        if not self._tracking:
+            # 第一轮统计之前不知道各推文的频率
+            minutes = self._levels[-1]
+        return minutes * 60
+
+    def _net_saved(self) -> float:
+        # 扣除本身产生的采集服务请求（频率更新与互动拉取）
+        return sum(state.polls_saved for state in self._tweets.values()) - self._updates - self._velocity_requests
+
+    def report(self) -> MonitorFrequencyReport:
+        """
+        生成频率调整报告
+
+        Returns:
+            MonitorFrequencyReport: 各推文当前频率、互动速度与节省的轮询次数
+        """
+        items = [
+            MonitorFrequencyItem(
+                media_account=media_account,
+                tweet_id=tweet_id,
+                update_frequency=format_frequency(state.minutes),
+                velocity_per_hour=round(state.velocity, 2),
+                polls_saved=round(state.polls_saved, 1)
+            )
+            for (media_account, tweet_id), state in sorted(self._tweets.items())
+        ]
+        return MonitorFrequencyReport(
+            tweets=items,
+            default_frequency=format_frequency(self._default_minutes),
+            frequency_updates=self._updates,
+            velocity_requests=self._velocity_requests,
+            net_requests_saved=round(self._net_saved(), 1)
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出频率调整指标
+
+        Returns:
+            Dict[str, float]: 监控推文数量与净节省的采集服务请求数
+        """
+        return {
+            "monitor_tracked_tweets": float(len(self._tweets)),
+            "monitor_requests_saved": self._net_saved()
+        }
+
+
+monitor_frequency_manager = MonitorFrequencyManager(
+    interval=settings.MONITOR_FREQUENCY_INTERVAL_SECONDS,
+    window_minutes=settings.MONITOR_VELOCITY_WINDOW_MINUTES,
+    levels=settings.monitor_frequency_levels,
+    default_minutes=settings.MONITOR_DEFAULT_FREQUENCY_MINUTES,
+    target_per_poll=settings.MONITOR_TARGET_INTERACTIONS_PER_POLL,
+    hysteresis=settings.MONITOR_FREQUENCY_HYSTERESIS,
+    min_dwell=settings.MONITOR_FREQUENCY_MIN_DWELL_SECONDS
+)
+metrics.register_collector(monitor_frequency_manager.stats)
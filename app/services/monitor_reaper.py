@@ -0,0 +1,219 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.crud.task import TaskCRUD
+from app.db.base import SessionLocal
+from app.models.task import Task
+from app.schemas.enums import RequestPriority
+from app.schemas.task import MonitorReport
+from app.schemas.twitter import SubnetTweetTaskRequest
+from app.services.monitor_frequency import format_frequency
+from app.services.twitter import TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+
+class MonitorReaper:
+    """
+    到期推文监控回收器
+
+    定期查找已到结束时间的任务，通过 DELETE /subnet_tweet_task 停止采集服务对推文的监控，
+    并在数据库中记录回收状态。DELETE 请求并发数有上限；同一推文仍被其他未到期任务使用时
+    只记录回收状态，不删除监控。删除失败的任务保持未回收状态，下一轮重试。
+    """
+
+    def __init__(self, interval: float, batch_size: int, concurrency: int):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._concurrency = max(1, concurrency)
+        self._task: Optional[asyncio.Task] = None
+        self._last_run_time: Optional[datetime] = None
+        self._deletes_sent = 0
+        self._delete_failures = 0
+
+    def start(self) -> None:
+        """启动后台回收循环"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("到期推文监控回收已启动")
+
+    async def stop(self) -> None:
+        """停止后台回收循环"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"到期推文监控回收失败: {str(e)}")
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> int:
+        """
+        执行一轮回收，直到没有到期任务或本轮全部失败
+
+        Returns:
+            int: 本轮回收的任务数量
+        """
+        reaped = 0
+        db = SessionLocal()
+        try:
+            while True:
+                now = datetime.now(timezone.utc)
+                expired = TaskCRUD.get_expired_monitors(db, now, limit=self._batch_size)
+                if not expired:
+                    break
+                count, failed = await self._reap_batch(db, expired, now)
+                reaped += count
+                if failed:
+                    # 有删除失败的任务，留到下一轮重试，避免本轮反复拉取同一批
+                    break
+        finally:
+            db.close()
+            self._last_run_time = datetime.now(timezone.utc)
+        if reaped:
+            logger.info(f"到期推文监控回收完成: reaped={reaped}")
+        return reaped
+
+    async def _reap_batch(self, db: Session, expired: List[Task], now: datetime) -> Tuple[int, bool]:
+        # 按 (媒体账号, tweet_id) 分组，同一推文只删除一次
+        groups: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        unparsable: List[int] = []
+        for task in expired:
+            try:
+                groups[(task.twitter_name, Utils.extract_tweet_id(task.url))].append(task.task_id)
+            except Exception:
+                # 无法解析 tweet_id 的任务不可能有监控，直接标记
+                unparsable.append(task.task_id)
+
+        twitter_names = list({key[0] for key in groups})
+        # 同一推文（相同 URL）的其他到期任务一并回收，避免之后的批次重复删除已删除的监控
+        batch_ids = {task.task_id for task in expired}
+        batch_keys = list({(task.twitter_name, task.url) for task in expired})
+        for task in TaskCRUD.get_expired_monitors(db, now, keys=batch_keys):
+            if task.task_id in batch_ids:
+                continue
+            try:
+                key = (task.twitter_name, Utils.extract_tweet_id(task.url))
+            except Exception:
+                continue
+            if key in groups:
+                groups[key].append(task.task_id)
+
+        live: Set[Tuple[str, str]] = set()
+        for twitter_name, url in TaskCRUD.get_live_monitors(db, twitter_names, now):
+            try:
+                live.add((twitter_name, Utils.extract_tweet_id(url)))
+            except Exception:
+                continue
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def reap(key: Tuple[str, str]) -> bool:
+            if key in live:
+                # 推文仍被其他未到期任务监控
+                return True
+            async with semaphore:
+                response = await TwitterService.subnet_tweet_task(
+                    method="DELETE",
+                    task_data=SubnetTweetTaskRequest(media_account=key[0], tweet_id=key[1]),
+                    priority=RequestPriority.BATCH
+                )
+            self._deletes_sent += 1
+            if not response.success:
+                self._delete_failures += 1
+                metrics.inc("monitor_reaper_delete_failures")
+                logger.warning(f"删除推文监控失败: media_account={key[0]}, tweet_id={key[1]}, message={response.message}")
+            return response.success
+
+        keys = list(groups)
+        results = await asyncio.gather(*(reap(key) for key in keys))
+        await self._restore_recreated(db, [key for key, ok in zip(keys, results) if ok and key not in live], twitter_names)
+        task_ids = unparsable + [task_id for key, ok in zip(keys, results) if ok for task_id in groups[key]]
+        count = TaskCRUD.mark_monitors_reaped(db, task_ids, datetime.now(timezone.utc))
+        db.commit()
+        metrics.inc("monitor_reaper_reaped", count)
+        return count, not all(results)
+
+    async def _restore_recreated(self, db: Session, deleted: List[Tuple[str, str]], twitter_names: List[str]) -> None:
+        # 检查有效任务与 DELETE 之间可能有新任务创建了同一推文的监控，删除后重新检查并恢复
+        if not deleted:
+            return
+        live: Set[Tuple[str, str]] = set()
+        for twitter_name, url in TaskCRUD.get_live_monitors(db, twitter_names, datetime.now(timezone.utc)):
+            try:
+                live.add((twitter_name, Utils.extract_tweet_id(url)))
+            except Exception:
+                continue
+        for media_account, tweet_id in deleted:
+            if (media_account, tweet_id) not in live:
+                continue
+            response = await TwitterService.subnet_tweet_task(
+                method="POST",
+                task_data=SubnetTweetTaskRequest(
+                    media_account=media_account,
+                    tweet_id=tweet_id,
+                    update_frequency=format_frequency(settings.MONITOR_DEFAULT_FREQUENCY_MINUTES)
+                ),
+                priority=RequestPriority.BATCH
+            )
+            metrics.inc("monitor_reaper_restored")
+            if not response.success:
+                metrics.inc("monitor_reaper_restore_failures")
+                logger.error(f"恢复推文监控失败: media_account={media_account}, tweet_id={tweet_id}, message={response.message}")
+            else:
+                logger.warning(f"推文监控删除期间有新任务创建，已恢复监控: media_account={media_account}, tweet_id={tweet_id}")
+
+    def report(self, db: Session) -> MonitorReport:
+        """
+        生成推文监控回收报告
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            MonitorReport: 有效、待回收与已回收的监控数量及回收统计
+        """
+        counts = TaskCRUD.count_monitors(db, datetime.now(timezone.utc))
+        return MonitorReport(
+            active=counts["active"],
+            expired=counts["expired"],
+            reaped=counts["reaped"],
+            last_run_time=self._last_run_time,
+            deletes_sent=self._deletes_sent,
+            delete_failures=self._delete_failures
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出回收指标
+
+        Returns:
+            Dict[str, float]: 已发送的 DELETE 请求数与失败数
+        """
+        return {
+            "monitor_reaper_deletes_sent": float(self._deletes_sent),
+            "monitor_reaper_delete_failures_total": float(self._delete_failures)
+        }
+
+
+monitor_reaper = MonitorReaper(
+    interval=settings.REAPER_INTERVAL_SECONDS,
+    batch_size=settings.REAPER_BATCH_SIZE,
+    concurrency=settings.REAPER_CONCURRENCY
+)
+metrics.register_collector(monitor_reaper.stats)
@@ -0,0 +1,70 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.crud.project import ProjectCRUD
+from app.schemas.project import ProjectListResponse, ProjectSummary
+from app.core.logger import logger
+
+class ProjectService:
+    """项目服务"""
+    
+    @staticmethod
+    def get_projects_list(
+        db: Session,
+        limit: int = 20,
+        after_id: Optional[int] = None,
+        cached: bool = True
+    ) -> ProjectListResponse:
+        """
+        获取项目列表及任务摘要（keyset 分页）
+        
+        Args:
+            db: 数据库会话
+            limit: 每页数量
+            after_id: 上一页返回的游标（可选）
+            cached: 是否读取缓存的任务摘要
+            
+        Returns:
+            ProjectListResponse: 项目列表响应
+            
+        Raises:
+            HTTPException: 当获取操作失败时抛出
+        """
+        try:
+            logger.info(f"获取项目列表: limit={limit}, after_id={after_id}, cached={cached}")
+            # 多取一行用于判断是否还有下一页
+            rows = ProjectCRUD.get_projects_with_summary(
+                db=db,
+                limit=limit + 1,
+                after_id=after_id,
+                cached=cached
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
+            projects = [
+                ProjectSummary(
+                    id=project.id,
+                    name=project.name,
+                    description=project.description,
+                    icon=project.icon,
+                    created_time=project.created_time,
+                    task_count=task_count or 0,
+                    last_task_time=last_task_time
+                )
+                for project, task_count, last_task_time in rows
+            ]
+            return ProjectListResponse(
+                projects=projects,
+                limit=limit,
+                next_cursor=projects[-1].id if has_more else None,
+                has_more=has_more
+            )
+            
+        except Exception as e:
+            logger.error(f"获取项目列表失败: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to get projects list: {str(e)}"
+            )
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.crud.task import TaskCRUD
+from app.crud.qualifying import QualifyingSnapshotCRUD
+from app.schemas.enums import TaskType
+from app.schemas.task import QualifyingUsersResponse, QualifyingUserInfo
+from app.services.twitter import TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+class QualifyingService:
+    """任务奖励窗口合格用户服务"""
+
+    @staticmethod
+    async def get_qualifying_users(
+        db: Session,
+        task_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 100,
+        offset: int = 0
+    ) -> QualifyingUsersResponse:
+        """
+        获取在时间窗口内 retweet 过任务推文的用户
+
+        对采集服务只做一次遍历；已关闭的时间窗口会把去重后的用户列表保存为快照，
+        重复请求直接从快照分页读取。
+
+        Args:
+            db: 数据库会话
+            task_id: 任务ID
+            start_time: 开始时间
+            end_time: 结束时间
+            limit: 每页数量
+            offset: 偏移量
+
+        Returns:
+            QualifyingUsersResponse: 合格用户响应
+
+        Raises:
+            HTTPException: 当任务不存在、不是转推任务或时间窗口无效时抛出
+        """
+        start_time, end_time = Utils.to_utc(start_time), Utils.to_utc(end_time)
+        if start_time >= end_time:
+            raise HTTPException(
+                status_code=400,
+                detail="start_time must be earlier than end_time"
+            )
+
+        task = TaskCRUD.get_task_by_id(db, task_id)
+        if task is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Task {task_id} not found"
+            )
+        if task.type != TaskType.TWITTER_RETWEET.value:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Task {task_id} is not a {TaskType.TWITTER_RETWEET.value} task"
+            )
+        post_id = Utils.extract_tweet_id(task.url)
+        closed = end_time <= datetime.now(timezone.utc) - timedelta(seconds=settings.interaction_settle_seconds)
+
+        snapshot = QualifyingSnapshotCRUD.get_snapshot(db, task_id, start_time, end_time) if closed else None
+        if snapshot is None:
+            logger.info(f"收集合格用户: task_id={task_id}, media_account={task.twitter_name}, post_id={post_id}, closed={closed}")
+            retweeters = await TwitterService.collect_retweeters(
+                media_account=task.twitter_name,
+                post_id=post_id,
+                start_time=start_time,
+                end_time=end_time
+            )
+            logger.info(f"合格用户收集完成: task_id={task_id}, count={len(retweeters)}")
+
+            if not closed:
+                # 窗口仍在进行中，结果不保存
+                user_ids = sorted(retweeters)[offset:offset + limit]
+                return QualifyingUsersResponse(
+                    task_id=task_id,
+                    post_id=post_id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    users=[QualifyingUserInfo(user_id=u, interaction_time=retweeters[u]) for u in user_ids],
+                    total_count=len(retweeters),
+                    limit=limit,
+                    offset=offset,
+                    has_more=(offset + limit) < len(retweeters)
+                )
+
+            try:
+                snapshot = QualifyingSnapshotCRUD.create_snapshot(
+                    db=db,
+                    task_id=task_id,
+                    post_id=post_id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    users=retweeters
+                )
+                db.commit()
+                logger.info(f"合格用户快照已保存: snapshot_id={snapshot.id}")
+            except IntegrityError:
+                # 并发请求已保存相同窗口的快照
+                db.rollback()
+                snapshot = QualifyingSnapshotCRUD.get_snapshot(db, task_id, start_time, end_time)
+        else:
+            metrics.inc("qualifying_snapshot_hits")
+
+        users = QualifyingSnapshotCRUD.get_users_with_pagination(
+            db=db,
+            snapshot_id=snapshot.id,
+            limit=limit,
+            offset=offset
+        )
+        return QualifyingUsersResponse(
+            task_id=task_id,
+            post_id=post_id,
+            start_time=start_time,
+            end_time=end_time,
+            snapshot_id=snapshot.id,
+            users=[QualifyingUserInfo(user_id=u.user_id, interaction_time=u.interaction_time) for u in users],
+            total_count=snapshot.user_count,
+            limit=limit,
+            offset=offset,
+            has_more=(offset + limit) < snapshot.user_count
+        )
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.utils import Utils
+
+settings = get_settings()
+
+# 每个 (media_account, x_id, post_id) 最多保留的窗口结果数量
+MAX_WINDOWS_PER_KEY = 8
+
+
+@dataclass
+class _WindowResult:
+    """一次窗口扫描的结果"""
+    start_time: datetime
+    end_time: datetime
+    match_time: Optional[datetime]  # 命中的 retweet 时间，未命中为 None
+    expires_at: float
+
+
+class RetweetCheckCache:
+    """
+    Retweet 检测结果缓存
+
+    已命中的 retweet 不会再变化，长期保留；已关闭时间窗口的否定结果同样长期保留；
+    仍在进行中的时间窗口的否定结果只短暂保留。命中记录保存了 interaction_time，
+    因此更宽窗口的扫描结果可以直接回答其中包含该时间点的子窗口查询。
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        positive_ttl: float,
+        closed_ttl: float,
+        open_ttl: float,
+        settle_seconds: float
+    ):
+        self._max_keys = max_keys
+        self._positive_ttl = positive_ttl
+        self._closed_ttl = closed_ttl
+        self._open_ttl = open_ttl
+        self._settle = timedelta(seconds=settle_seconds)
+        self._entries: "OrderedDict[Tuple[str, str, str], List[_WindowResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        media_account: str,
+        x_id: str,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[bool]:
+        """
+        查询缓存
+
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+
+        Returns:
+            Optional[bool]: 缓存可以回答时返回检测结果，否则返回 None
+        """
+        start_time, end_time = Utils.to_utc(start_time), Utils.to_utc(end_time)
+        key = (media_account, x_id, post_id)
+        now = time.monotonic()
+        with self._lock:
+            results = self._entries.get(key)
+            answer = None
+            if results:
+                results[:] = [r for r in results if r.expires_at > now]
+                for result in results:
+                    if result.match_time is not None:
+                        # 命中时间落在查询窗口内即可确定为 True
+                        if start_time <= result.match_time <= end_time:
+                            answer = True
+                            break
+                    elif result.start_time <= start_time and end_time <= result.end_time:
+                        # 覆盖查询窗口的否定结果可以确定为 False
+                        answer = False
+                self._entries.move_to_end(key)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return answer
+
+    def put(
+        self,
+        media_account: str,
+        x_id: str,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        match_time: Optional[datetime]
+    ) -> None:
+        """
+        写入一次扫描结果
+
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+            match_time: 命中的 retweet 时间，未命中为 None
+        """
+        start_time, end_time = Utils.to_utc(start_time), Utils.to_utc(end_time)
+        if match_time is not None:
+            match_time = Utils.to_utc(match_time)
+            ttl = self._positive_ttl
+        elif end_time <= datetime.now(timezone.utc) - self._settle:
+            ttl = self._closed_ttl
+        else:
+            ttl = self._open_ttl
+
+        key = (media_account, x_id, post_id)
+        with self._lock:
+            results = self._entries.setdefault(key, [])
+            results.append(_WindowResult(
+                start_time=start_time,
+                end_time=end_time,
+                match_time=match_time,
+                expires_at=time.monotonic() + ttl
+            ))
+            # 优先保留过期时间最晚的结果
+            if len(results) > MAX_WINDOWS_PER_KEY:
+                results.sort(key=lambda r: r.expires_at, reverse=True)
+                del results[MAX_WINDOWS_PER_KEY:]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_keys:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出缓存指标
+
+        Returns:
+            Dict[str, float]: 缓存条目数、命中次数与命中率
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "retweet_cache_keys": float(len(self._entries)),
+                "retweet_cache_hits": float(self.hits),
+                "retweet_cache_misses": float(self.misses),
+                "retweet_cache_hit_ratio": self.hits / total if total else 0.0
+            }
+
+
+retweet_cache = RetweetCheckCache(
+    max_keys=settings.RETWEET_CACHE_MAX_KEYS,
+    positive_ttl=settings.RETWEET_CACHE_POSITIVE_TTL_SECONDS,
+    closed_ttl=settings.RETWEET_CACHE_CLOSED_TTL_SECONDS,
+    open_ttl=settings.RETWEET_CACHE_OPEN_TTL_SECONDS,
+    settle_seconds=settings.interaction_settle_seconds
+)
+metrics.register_collector(retweet_cache.stats)
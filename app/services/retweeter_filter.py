@@ -0,0 +1,250 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from app.core.bloom import ScalableBloomFilter
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.schemas.twitter import InteractionRecord
+from app.utils import Utils
+
+settings = get_settings()
+
+
+@dataclass
+class _AccountState:
+    """单个媒体账号的过滤器覆盖状态"""
+    # 在此时间之前的 retweet 已全部写入过滤器
+    complete_until: Optional[datetime] = None
+    last_refresh: float = 0.0
+    # 最近一次扫描失败的时间（time.monotonic），失败后退避一段时间再重试
+    last_failure: float = 0.0
+    building: bool = False
+    # 后台建立或增量更新过滤器的任务，保留引用避免扫描中途被回收
+    refresh_task: Optional[asyncio.Task] = None
+    # 因内存上限被淘汰的帖子，这些帖子的过滤器不再完整
+    evicted: Set[str] = field(default_factory=set)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class RetweeterFilterIndex:
+    """
+    每个 (media_account, post_id) 的 retweet 用户布隆过滤器索引
+
+    过滤器由对媒体账号的完整扫描建立，之后按 complete_until 增量扫描更新，扫描均在后台进行。
+    过滤器判定用户不存在时，complete_until 之前的时间段无需再扫描采集服务。
+    帖子过滤器与账号覆盖状态均按最近使用顺序保存，超过 max_posts 时淘汰最久未使用的。
+
+    以默认 1% 误判率计，100 万 retweet 用户的定长过滤器约占 1.2 MB（k=7），
+    可扩展过滤器从 1 万容量起步约占 2.9 MB；CPython 下单次判定约 3-5 微秒，写入约 5-10 微秒。
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int,
+        fp_rate: float,
+        max_bytes_per_post: int,
+        max_posts: int,
+        refresh_seconds: float,
+        retry_seconds: float,
+        settle_seconds: float
+    ):
+        self._initial_capacity = initial_capacity
+        self._fp_rate = fp_rate
+        self._max_bytes_per_post = max_bytes_per_post
+        self._max_posts = max_posts
+        self._refresh_seconds = refresh_seconds
+        self._retry_seconds = retry_seconds
+        self._settle = timedelta(seconds=settle_seconds)
+        self._filters: "OrderedDict[Tuple[str, str], ScalableBloomFilter]" = OrderedDict()
+        self._accounts: "OrderedDict[str, _AccountState]" = OrderedDict()
+
+    def state(self, media_account: str) -> _AccountState:
+        """
+        获取媒体账号的覆盖状态（不存在时创建）
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            _AccountState: 覆盖状态
+        """
+        state = self._accounts.get(media_account)
+        if state is None:
+            state = self._accounts[media_account] = _AccountState()
+            self._evict_accounts()
+        else:
+            self._accounts.move_to_end(media_account)
+        return state
+
+    def needs_refresh(self, media_account: str, end_time: datetime) -> bool:
+        """
+        判断查询窗口是否需要先增量刷新过滤器
+
+        Args:
+            media_account: 媒体账号
+            end_time: 查询窗口结束时间
+
+        Returns:
+            bool: 过滤器已建立、没有进行中的扫描、未覆盖查询窗口、距上次刷新超过刷新间隔且不在失败退避期内时返回 True
+        """
+        state = self.state(media_account)
+        return (
+            state.complete_until is not None
+            and not self.refreshing(media_account)
+            and Utils.to_utc(end_time) > state.complete_until
+            and time.monotonic() - state.last_refresh >= self._refresh_seconds
+            and not self.backing_off(media_account)
+        )
+
+    def refreshing(self, media_account: str) -> bool:
+        """
+        判断媒体账号是否有进行中的后台扫描
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            bool: 正在建立或增量更新过滤器时返回 True
+        """
+        state = self.state(media_account)
+        return state.building or (state.refresh_task is not None and not state.refresh_task.done())
+
+    def backing_off(self, media_account: str) -> bool:
+        """
+        判断媒体账号是否处于扫描失败后的退避期
+
+        Args:
+            media_account: 媒体账号
+
+        Returns:
+            bool: 距上次扫描失败不足 RETWEETER_FILTER_RETRY_SECONDS 时返回 True
+        """
+        state = self.state(media_account)
+        return state.last_failure > 0 and time.monotonic() - state.last_failure < self._retry_seconds
+
+    def mark_failed(self, media_account: str) -> None:
+        """
+        记录一次扫描失败，退避期内不再发起扫描
+
+        Args:
+            media_account: 媒体账号
+        """
+        self.state(media_account).last_failure = time.monotonic()
+        metrics.inc("retweeter_filter_refresh_failures")
+
+    def add_interactions(self, media_account: str, interactions: Iterable[InteractionRecord]) -> None:
+        """
+        将 retweet 互动写入对应帖子的过滤器
+
+        Args:
+            media_account: 媒体账号
+            interactions: 精简互动记录
+        """
+        evicted = self.state(media_account).evicted
+        for interaction in interactions:
+            if interaction.interaction_type != "retweet" or interaction.post_id in evicted:
+                continue
+            key = (media_account, interaction.post_id)
+            bloom = self._filters.get(key)
+            if bloom is None:
+                bloom = self._filters[key] = ScalableBloomFilter(
+                    self._initial_capacity, self._fp_rate, self._max_bytes_per_post
+                )
+                self._evict()
+            bloom.add(interaction.user_id)
+
+    def mark_complete(self, media_account: str, scanned_until: datetime) -> None:
+        """
+        记录一次完整扫描的覆盖范围
+
+        Args:
+            media_account: 媒体账号
+            scanned_until: 本次扫描的截止时间，减去入库延迟后作为新的 complete_until
+        """
+        state = self.state(media_account)
+        state.complete_until = Utils.to_utc(scanned_until) - self._settle
+        state.last_refresh = time.monotonic()
+
+    def covered_until(self, media_account: str, post_id: str) -> Optional[datetime]:
+        """
+        获取帖子过滤器的完整覆盖时间
+
+        Args:
+            media_account: 媒体账号
+            post_id: 帖子ID
+
+        Returns:
+            Optional[datetime]: 覆盖截止时间，过滤器未建立或已被淘汰时返回 None
+        """
+        state = self._accounts.get(media_account)
+        if state is None or post_id in state.evicted:
+            return None
+        return state.complete_until
+
+    def might_contain(self, media_account: str, post_id: str, x_id: str) -> bool:
+        """
+        判断用户是否可能 retweet 过帖子
+
+        Args:
+            media_account: 媒体账号
+            post_id: 帖子ID
+            x_id: 用户ID
+
+        Returns:
+            bool: 返回 False 表示在覆盖时间内一定没有 retweet
+        """
+        key = (media_account, post_id)
+        bloom = self._filters.get(key)
+        if bloom is None:
+            # 完整扫描中未出现该帖子的 retweet
+            return False
+        self._filters.move_to_end(key)
+        return x_id in bloom
+
+    def _evict(self) -> None:
+        while len(self._filters) > self._max_posts:
+            (media_account, post_id), _ = self._filters.popitem(last=False)
+            self.state(media_account).evicted.add(post_id)
+
+    def _evict_accounts(self) -> None:
+        # 正在扫描的账号跳过，其余按最久未使用淘汰，同时丢弃该账号的帖子过滤器，下次使用时重新建立
+        for media_account in list(self._accounts):
+            if len(self._accounts) <= self._max_posts:
+                break
+            state = self._accounts[media_account]
+            if state.lock.locked() or self.refreshing(media_account):
+                continue
+            del self._accounts[media_account]
+            for key in [key for key in self._filters if key[0] == media_account]:
+                del self._filters[key]
+            metrics.inc("retweeter_filter_account_evictions")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        导出过滤器指标
+
+        Returns:
+            Dict[str, float]: 过滤器数量、内存占用与最大估算误判率
+        """
+        filters = list(self._filters.values())
+        return {
+            "retweeter_filter_posts": float(len(filters)),
+            "retweeter_filter_bytes": float(sum(f.nbytes for f in filters)),
+            "retweeter_filter_max_fp_rate": max((f.estimated_fp_rate() for f in filters), default=0.0)
+        }
+
+
+retweeter_filters = RetweeterFilterIndex(
+    initial_capacity=settings.RETWEETER_FILTER_INITIAL_CAPACITY,
+    fp_rate=settings.RETWEETER_FILTER_FP_RATE,
+    max_bytes_per_post=settings.RETWEETER_FILTER_MAX_BYTES_PER_POST,
+    max_posts=settings.RETWEETER_FILTER_MAX_POSTS,
+    refresh_seconds=settings.RETWEETER_FILTER_REFRESH_SECONDS,
+    retry_seconds=settings.RETWEETER_FILTER_RETRY_SECONDS,
+    settle_seconds=settings.interaction_settle_seconds
+)
+metrics.register_collector(retweeter_filters.stats)
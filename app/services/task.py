@@ -1,15 +1,43 @@
-from typing import Dict
+from typing import Dict, Iterator, Optional
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
+import csv
+import hashlib
+import io
+import json
 import re
 from app.schemas.task import TaskCreate, TaskListResponse, TaskInfo, ProjectInfo
 from app.schemas.flux import FluxTaskCreateRequest
 from app.crud.project import ProjectCRUD
 from app.crud.task import TaskCRUD
+from app.db.replica import replica_router
+from app.schemas.enums import ExportFormat
+from app.core.config import get_settings
 from app.services.twitter import TwitterService
 from app.services.flux import FluxService
+from app.services.monitor_frequency import format_frequency
 from fastapi import HTTPException
 from app.utils import Utils
 from app.core.logger import logger
+from app.core.tracing import tracer
+
+settings = get_settings()
+
+EXPORT_COLUMNS = [
+    "task_id",
+    "twitter_name",
+    "description",
+    "type",
+    "url",
+    "user_wallet",
+    "created_time",
+    "project_id",
+    "project_name",
+    "project_description",
+    "project_icon",
+    "project_created_time"
+]
+
 class TaskService:
     """任务服务"""
     
@@ -31,8 +59,15 @@ class TaskService:
         try:
             logger.info(f"开始创建任务: project_name={task_data.project_name}, twitter_name={task_data.twitter_name}")
             
+            if task_data.end_time is not None and Utils.to_utc(task_data.end_time) <= datetime.now(timezone.utc):
+                raise HTTPException(
+                    status_code=400,
+                    detail="end_time must be in the future"
+                )
+            
             # 检查项目是否已存在
-            existing_project = ProjectCRUD.get_project_by_name(db, task_data.project_name)
+            with tracer.span("task.check_project_exists", project_name=task_data.project_name):
+                existing_project = ProjectCRUD.get_project_by_name(db, task_data.project_name)
             if existing_project:
                 logger.warning(f"项目已存在: {task_data.project_name}")
                 raise HTTPException(
@@ -42,31 +77,36 @@ class TaskService:
             
             # 创建项目
             logger.info(f"创建项目: {task_data.project_name}")
-            project = ProjectCRUD.create_project(
-                db=db,
-                name=task_data.project_name,
-                description=task_data.project_description,
-                icon=task_data.project_icon
-            )
+            with tracer.span("task.insert_project"):
+                project = ProjectCRUD.create_project(
+                    db=db,
+                    name=task_data.project_name,
+                    description=task_data.project_description,
+                    icon=task_data.project_icon
+                )
             
             # 刷新会话以获取项目ID
-            db.flush()
+            with tracer.span("task.flush_project"):
+                db.flush()
             logger.info(f"项目创建成功: project_id={project.id}")
             
             # 创建任务
             logger.info(f"创建任务: twitter_name={task_data.twitter_name}, task_type={task_data.task_type}")
-            task = TaskCRUD.create_task(
-                db=db,
-                project_id=project.id,
-                task_type=task_data.task_type,
-                twitter_name=task_data.twitter_name,
-                twitter_url=str(task_data.twitter_url),
-                user_wallet=task_data.user_wallet
-            )
+            with tracer.span("task.insert_task", project_id=project.id):
+                task = TaskCRUD.create_task(
+                    db=db,
+                    project_id=project.id,
+                    task_type=task_data.task_type,
+                    twitter_name=task_data.twitter_name,
+                    twitter_url=str(task_data.twitter_url),
+                    user_wallet=task_data.user_wallet,
+                    end_time=task_data.end_time
+                )
             
             # 刷新会话以获取任务ID
-            db.flush()
-            db.refresh(task)
+            with tracer.span("task.flush_refresh_task"):
+                db.flush()
+                db.refresh(task)
             logger.info(f"任务创建成功: task_id={task.task_id}")
             # 调用 Twitter 服务
             # 从 Twitter URL 中提取 tweet_id
@@ -80,7 +120,7 @@ class TaskService:
                 task_request = SubnetTweetTaskRequest(
                     media_account=task_data.twitter_name,
                     tweet_id=tweet_id,
-                    update_frequency="10 minutes"  
+                    update_frequency=format_frequency(settings.MONITOR_DEFAULT_FREQUENCY_MINUTES)
                 )
                 
                 logger.info(f"调用 Twitter 服务: media_account={task_data.twitter_name}, tweet_id={tweet_id}")
@@ -134,7 +174,8 @@ class TaskService:
                 
                 if flux_response.success:
                     # Flux 服务成功，提交数据库事务
-                    db.commit()
+                    with tracer.span("task.commit"):
+                        db.commit()
                     logger.info(f"任务创建完全成功: task_id={task.task_id}, flux_task_id={flux_response.task_id}")
                     return {
                         "success": True,
@@ -177,26 +218,41 @@ class TaskService:
     def get_tasks_list(
         db: Session,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        user_wallet: Optional[str] = None,
+        project_id: Optional[int] = None,
+        task_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
     ) -> TaskListResponse:
         """
-        获取所有任务列表（带分页）
+        获取任务列表（带过滤和分页）
         
         Args:
             db: 数据库会话
             limit: 每页数量
             offset: 偏移量
+            user_wallet: 用户钱包地址过滤（可选）
+            project_id: 项目ID过滤（可选）
+            task_type: 任务类型过滤（可选）
+            created_from: 创建时间下限（可选）
+            created_to: 创建时间上限（可选）
             
         Returns:
             TaskListResponse: 任务列表响应
         """
         try:
-            logger.info(f"获取任务列表: limit={limit}, offset={offset}")
+            logger.info(f"获取任务列表: limit={limit}, offset={offset}, user_wallet={user_wallet}, project_id={project_id}, type={task_type}, created_from={created_from}, created_to={created_to}")
             # 获取任务数据和总数
             tasks, total_count = TaskCRUD.get_tasks_with_pagination(
                 db=db,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                user_wallet=user_wallet,
+                project_id=project_id,
+                task_type=task_type,
+                created_from=created_from,
+                created_to=created_to
             )
             logger.info(f"查询到 {len(tasks)} 个任务，总数: {total_count}")
             
@@ -221,6 +277,8 @@ class TaskService:
                     url=task.url,
                     user_wallet=task.user_wallet,
                     created_time=task.created_time,
+                    end_time=task.end_time,
+                    monitor_state=task.monitor_state,
                     project=project_info
                 )
                 task_list.append(task_info)
@@ -243,3 +301,111 @@ class TaskService:
                 status_code=500,
                 detail=f"Failed to get tasks list: {str(e)}"
             )
+    
+    @staticmethod
+    def get_tasks_list_etag(
+        db: Session,
+        limit: int = 10,
+        offset: int = 0,
+        user_wallet: Optional[str] = None,
+        project_id: Optional[int] = None,
+        task_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> str:
+        """
+        计算任务列表响应的 ETag
+        
+        由查询参数与过滤结果的 (数量, 最大创建时间, 最大任务ID, 最近监控回收时间) 计算，只需一次聚合查询，
+        不必读取和序列化任务数据
+        
+        Args:
+            db: 数据库会话
+            limit: 每页数量
+            offset: 偏移量
+            user_wallet: 用户钱包地址过滤（可选）
+            project_id: 项目ID过滤（可选）
+            task_type: 任务类型过滤（可选）
+            created_from: 创建时间下限（可选）
+            created_to: 创建时间上限（可选）
+            
+        Returns:
+            str: 带引号的 ETag
+        """
+        version = TaskCRUD.get_tasks_version(
+            db=db,
+            user_wallet=user_wallet,
+            project_id=project_id,
+            task_type=task_type,
+            created_from=created_from,
+            created_to=created_to
+        )
+        key = repr((limit, offset, user_wallet, project_id, task_type, created_from, created_to, version))
+        return f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+    
+    @staticmethod
+    def export_tasks(
+        export_format: ExportFormat,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        task_type: Optional[str] = None,
+        user_wallet: Optional[str] = None,
+        last_write: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        流式导出任务及其项目信息
+        
+        使用独立的数据库会话（优先使用只读备库）和服务端游标，每从游标读取一批数据就输出一次，
+        内存占用与导出总行数无关。
+        
+        Args:
+            export_format: 导出格式（NDJSON 或 CSV）
+            created_from: 创建时间下限（包含，可选）
+            created_to: 创建时间上限（不包含，可选）
+            task_type: 任务类型过滤（可选）
+            user_wallet: 用户钱包地址过滤（可选）
+            last_write: 调用方最近一次写入的 WAL 位置（可选）
+            
+        Yields:
+            str: 导出内容片段
+        """
+        batch_size = settings.TASK_EXPORT_BATCH_SIZE
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+        
+        db = replica_router.read_session(last_write)
+        exported = 0
+        try:
+            logger.info(f"开始导出任务: format={export_format.value}, created_from={created_from}, created_to={created_to}, type={task_type}, user_wallet={user_wallet}")
+            for row in TaskCRUD.iter_tasks_with_project(
+                db=db,
+                created_from=created_from,
+                created_to=created_to,
+                task_type=task_type,
+                user_wallet=user_wallet,
+                batch_size=batch_size
+            ):
+                values = [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in row
+                ]
+                if export_format == ExportFormat.CSV:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+                exported += 1
+                if exported % batch_size == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+            logger.info(f"任务导出完成: count={exported}")
+        except Exception as e:
+            logger.error(f"任务导出失败: exported={exported}, error={str(e)}")
+            raise
+        finally:
+            db.close()
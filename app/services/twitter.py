@@ -1,14 +1,138 @@
-from typing import Optional
-from datetime import datetime
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+from datetime import datetime, timezone
+import asyncio
+import hashlib
+import json
+import math
 import aiohttp
 from fastapi import HTTPException
 
+from app.core.compression import UPSTREAM_ACCEPT_ENCODING, ContentDecoder, DecodedSizeExceeded
 from app.core.config import get_settings
-from app.schemas.twitter import TwitterInteractionResponse, SubnetTweetTaskRequest, SubnetTweetTaskResponse
+from app.core.deadline import Deadline, DeadlineExceeded, create_background_task
+from app.schemas.twitter import Interaction, InteractionRecord, InteractionRecordPage, TwitterInteractionResponse, SubnetTweetTaskRequest, SubnetTweetTaskResponse
 from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.ratelimit import RateLimitExceeded, outbound_limiter
+from app.core.scheduler import outbound_scheduler
+from app.core.tracing import tracer
+from app.schemas.enums import RequestPriority
+from app.services.retweet_cache import retweet_cache
+from app.services.retweeter_filter import retweeter_filters
+from app.utils import Utils
 
 settings = get_settings()
 
+PageT = TypeVar("PageT", TwitterInteractionResponse, InteractionRecordPage)
+
+class InteractionWatermark:
+    """
+    增量拉取互动数据的水位线
+    
+    采集服务的时间过滤精确到秒，因此记录最新一秒内已处理的 interaction_id，
+    下次从该秒开始查询时据此去重。
+    """
+    
+    def __init__(self, since: Optional[datetime] = None, boundary_ids: Optional[Set[str]] = None):
+        self.since = Utils.to_utc(since) if since else None
+        self.boundary_ids: Set[str] = set(boundary_ids or ())
+    
+    def admits(self, interaction: Union[Interaction, InteractionRecord]) -> bool:
+        """
+        判断互动数据是否在水位线之后
+        
+        Args:
+            interaction: 互动数据
+            
+        Returns:
+            bool: 尚未处理过时返回 True
+        """
+        if self.since is None:
+            return True
+        if interaction.interaction_id in self.boundary_ids:
+            return False
+        return Utils.to_utc(interaction.interaction_time) >= self.since.replace(microsecond=0)
+    
+    def advance(self, interactions: List[Union[Interaction, InteractionRecord]]) -> None:
+        """
+        根据新处理的互动数据推进水位线
+        
+        Args:
+            interactions: 新处理的互动数据
+        """
+        if not interactions:
+            return
+        latest = max(Utils.to_utc(i.interaction_time) for i in interactions)
+        latest_second = latest.replace(microsecond=0)
+        if self.since is not None and latest_second < self.since.replace(microsecond=0):
+            return
+        if self.since is None or latest_second > self.since:
+            self.since = latest_second
+            self.boundary_ids = set()
+        self.boundary_ids.update(
+            i.interaction_id for i in interactions
+            if Utils.to_utc(i.interaction_time) >= latest_second
+        )
+
+class PageSnapshot:
+    """
+    多页遍历的快照状态
+    
+    采集服务按页码分页，遍历期间入库或删除的互动会使后续页面整体偏移，导致重复下载或遗漏。
+    遍历按 interaction_id 去重（已见集合有上限，超出后按先进先出淘汰），
+    并记录每页 pagination.total_items，据此检测偏移。
+    """
+    
+    def __init__(self, max_seen: int):
+        self._max_seen = max(1, max_seen)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.total_items: Optional[int] = None
+        self.unique = 0
+        self.shifted = False
+    
+    def observe(self, total_items: int) -> int:
+        """
+        记录当前页的 total_items
+        
+        Args:
+            total_items: 当前页返回的总数
+            
+        Returns:
+            int: 相对上一页的变化量，首页为 0
+        """
+        shift = 0 if self.total_items is None else total_items - self.total_items
+        if shift:
+            self.shifted = True
+        self.total_items = total_items
+        return shift
+    
+    def admit(self, items: List[Union[Interaction, InteractionRecord]]) -> List[Union[Interaction, InteractionRecord]]:
+        """
+        过滤已经返回过的互动数据
+        
+        Args:
+            items: 当前页的互动数据
+            
+        Returns:
+            List[Union[Interaction, InteractionRecord]]: 首次出现的互动数据
+        """
+        admitted = []
+        for item in items:
+            if item.interaction_id in self._seen:
+                continue
+            self._seen[item.interaction_id] = None
+            if len(self._seen) > self._max_seen:
+                self._seen.popitem(last=False)
+            self.unique += 1
+            admitted.append(item)
+        return admitted
+    
+    @property
+    def complete(self) -> bool:
+        """已返回的互动数量是否覆盖最后一次观察到的总数"""
+        return self.total_items is None or self.unique >= self.total_items
+
 class TwitterService:
     """Twitter 服务"""
     
@@ -20,7 +144,8 @@ class TwitterService:
         username: Optional[str] = None,
         x_id: Optional[str] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
     ) -> TwitterInteractionResponse:
         """
         获取 Twitter 互动数据
@@ -33,10 +158,159 @@ class TwitterService:
             x_id: 用户ID过滤
             start_time: 开始时间
             end_time: 结束时间
+            priority: 上游请求优先级（批量扫描使用 BATCH）
             
         Returns:
             TwitterInteractionResponse: Twitter 互动数据响应
             
+        Raises:
+            HTTPException: 当请求失败时抛出
+        """
+        body = await TwitterService._request_interactions(
+            media_account=media_account,
+            page=page,
+            per_page=per_page,
+            username=username,
+            x_id=x_id,
+            start_time=start_time,
+            end_time=end_time,
+            priority=priority
+        )
+        try:
+            return TwitterInteractionResponse.model_validate_json(body)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Internal server error: {str(e)}"
+            )
+    
+    @staticmethod
+    async def get_interactions_conditional(
+        media_account: str,
+        if_none_match: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 10,
+        username: Optional[str] = None,
+        x_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[Optional[TwitterInteractionResponse], str]:
+        """
+        获取 Twitter 互动数据及其 ETag
+        
+        ETag 为采集服务原始响应内容的哈希；与 If-None-Match 匹配时不解析响应内容
+        
+        Args:
+            media_account: 媒体账号
+            if_none_match: 请求头 If-None-Match 的值（可选）
+            page: 页码
+            per_page: 每页数量
+            username: 用户名过滤
+            x_id: 用户ID过滤
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            Tuple[Optional[TwitterInteractionResponse], str]: (互动数据响应，ETag 匹配时为 None, ETag)
+            
+        Raises:
+            HTTPException: 当请求失败时抛出
+        """
+        body = await TwitterService._request_interactions(
+            media_account=media_account,
+            page=page,
+            per_page=per_page,
+            username=username,
+            x_id=x_id,
+            start_time=start_time,
+            end_time=end_time
+        )
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if Utils.etag_matches(if_none_match, etag):
+            metrics.inc("interactions_not_modified")
+            return None, etag
+        try:
+            return TwitterInteractionResponse.model_validate_json(body), etag
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Internal server error: {str(e)}"
+            )
+    
+    @staticmethod
+    async def get_interaction_records(
+        media_account: str,
+        page: int = 1,
+        per_page: int = 100,
+        x_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        priority: RequestPriority = RequestPriority.BATCH
+    ) -> InteractionRecordPage:
+        """
+        获取一页精简互动记录，供内部扫描使用
+        
+        跳过完整 Interaction 模型的校验，只解码扫描需要的字段
+        
+        Args:
+            media_account: 媒体账号
+            page: 页码
+            per_page: 每页数量
+            x_id: 用户ID过滤
+            start_time: 开始时间
+            end_time: 结束时间
+            priority: 上游请求优先级
+            
+        Returns:
+            InteractionRecordPage: 精简记录分页
+            
+        Raises:
+            HTTPException: 当请求失败或响应格式不正确时抛出
+        """
+        body = await TwitterService._request_interactions(
+            media_account=media_account,
+            page=page,
+            per_page=per_page,
+            x_id=x_id,
+            start_time=start_time,
+            end_time=end_time,
+            priority=priority
+        )
+        try:
+            return InteractionRecordPage.from_raw(json.loads(body))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Invalid Twitter service response: {str(e)}"
+            )
+    
+    @staticmethod
+    async def _request_interactions(
+        media_account: str,
+        page: int = 1,
+        per_page: int = 10,
+        username: Optional[str] = None,
+        x_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> bytes:
+        """
+        请求采集服务的互动数据接口，返回未经解析的原始响应内容
+        
+        Args:
+            media_account: 媒体账号
+            page: 页码
+            per_page: 每页数量
+            username: 用户名过滤
+            x_id: 用户ID过滤
+            start_time: 开始时间
+            end_time: 结束时间
+            priority: 上游请求优先级
+            
+        Returns:
+            bytes: 原始响应内容（已解压）
+            
         Raises:
             HTTPException: 当请求失败时抛出
         """
@@ -91,49 +365,407 @@ class TwitterService:
                     detail="Invalid end time format, require YYYY-MM-DDTHH:mm:ssZ format"
                 )
             
-        try:
-            # 添加调试信息
-            logger.info(f"Twitter 服务请求: URL={url}, params={params}")
-            
-            # 使用 aiohttp.ClientSession 的上下文管理器
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    logger.info(f"Twitter 服务响应状态: {response.status}")
-                    
-                    if response.status >= 400:
-                        # 尝试获取错误响应内容
-                        try:
-                            error_data = await response.json()
-                            error_message = error_data.get("message", f"Twitter service returned error: {response.status}")
-                        except:
-                            error_message = f"Twitter service returned error: {response.status}"
+        with tracer.span("twitter.get_interactions", media_account=media_account, page=page, priority=priority.value) as span:
+            try:
+                # 添加调试信息
+                logger.info(f"Twitter 服务请求: URL={url}, params={params}")
+                
+                # 先获取限流配额，再经调度器排队后请求采集服务
+                await outbound_limiter.acquire(media_account)
+                async with outbound_scheduler.slot(media_account, priority), aiohttp.ClientSession(auto_decompress=False, timeout=Deadline.client_timeout()) as session:
+                    # 声明可解码的压缩格式，自行解压以统计实际传输的字节数（分块传输的响应同样计入）
+                    async with session.get(url, params=params, headers=tracer.inject_headers(UPSTREAM_ACCEPT_ENCODING)) as response:
+                        if span is not None:
+                            span.set_attribute("status_code", response.status)
+                        logger.info(f"Twitter 服务响应状态: {response.status}, Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                        content_encoding = response.headers.get("Content-Encoding", "")
                         
-                        logger.error(f"Twitter 服务错误: {error_message}")
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=f"Twitter service error: {error_message}"
-                        )
-                    
-                    # 解析响应数据
-                    data = await response.json()
-                    logger.info(f"Twitter 服务请求成功: 返回 {len(data.get('interactions', []))} 条互动数据")
-                    return TwitterInteractionResponse(**data)
-                    
-        except aiohttp.ClientError as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to fetch Twitter interactions: {str(e)}"
+                        if response.status == 429 or (response.status == 503 and "Retry-After" in response.headers):
+                            # 上游限流，降低请求速率
+                            retry_after = outbound_limiter.parse_retry_after(
+                                response.headers.get("Retry-After"),
+                                default=settings.OUTBOUND_DEFAULT_RETRY_AFTER_SECONDS
+                            )
+                            outbound_limiter.penalize(media_account, retry_after)
+                            raise HTTPException(
+                                status_code=429,
+                                detail="Twitter service rate limited, retry later",
+                                headers={"Retry-After": str(math.ceil(retry_after))}
+                            )
+                        
+                        if response.status >= 400:
+                            # 尝试获取错误响应内容
+                            try:
+                                _, error_body = await TwitterService._read_body(response, content_encoding)
+                                error_data = json.loads(error_body)
+                                error_message = error_data.get("message", f"Twitter service returned error: {response.status}")
+                            except:
+                                error_message = f"Twitter service returned error: {response.status}"
+                            
+                            logger.error(f"Twitter 服务错误: {error_message}")
+                            raise HTTPException(
+                                status_code=response.status,
+                                detail=f"Twitter service error: {error_message}"
+                            )
+                        
+                        # 读取响应内容，由调用方按需解析
+                        wire_bytes, body = await TwitterService._read_body(response, content_encoding)
+                        metrics.inc("upstream_interaction_decoded_bytes", len(body))
+                        outbound_limiter.reward(media_account)
+                        logger.info(f"Twitter 服务请求成功: 传输 {wire_bytes} 字节, 解压后 {len(body)} 字节")
+                        return body
+                        
+            except HTTPException:
+                raise
+            except DecodedSizeExceeded as e:
+                metrics.inc("upstream_interaction_oversized")
+                raise HTTPException(
+                    status_code=502,
+                    detail=f"Twitter service response too large: {str(e)}"
+                )
+            except RateLimitExceeded as e:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many requests to Twitter service, retry later",
+                    headers={"Retry-After": str(math.ceil(e.retry_after))}
+                )
+            except (DeadlineExceeded, asyncio.TimeoutError):
+                raise HTTPException(
+                    status_code=504,
+                    detail="Timed out waiting for Twitter service"
+                )
+            except aiohttp.ClientError as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to fetch Twitter interactions: {str(e)}"
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Internal server error: {str(e)}"
+                )
+        
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse, content_encoding: str) -> Tuple[int, bytes]:
+        """
+        逐块读取并解压响应内容
+
+        每块计入实际传输的字节数；解压后超过 UPSTREAM_MAX_DECODED_BYTES 时抛出 DecodedSizeExceeded
+
+        Args:
+            response: 采集服务响应
+            content_encoding: Content-Encoding 响应头
+
+        Returns:
+            Tuple[int, bytes]: (传输的字节数, 解压后的内容)
+        """
+        decoder = ContentDecoder(content_encoding, settings.UPSTREAM_MAX_DECODED_BYTES)
+        wire_bytes = 0
+        parts = []
+        async for chunk in response.content.iter_chunked(settings.UPSTREAM_READ_CHUNK_BYTES):
+            wire_bytes += len(chunk)
+            metrics.inc("upstream_interaction_bytes", len(chunk))
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.flush())
+        return wire_bytes, b"".join(parts)
+    
+    @staticmethod
+    def _snapshot_end_time(end_time: Optional[datetime]) -> datetime:
+        # 固定遍历的结束时间，遍历期间新产生的互动不会进入结果集
+        now = datetime.now(timezone.utc)
+        return now if end_time is None else min(Utils.to_utc(end_time), now)
+    
+    @staticmethod
+    async def _iter_snapshot_pages(
+        fetch: Callable[[int], Awaitable[PageT]],
+        page_info: Callable[[PageT], Tuple[bool, int]],
+        items_attr: str,
+        per_page: int
+    ) -> AsyncIterator[PageT]:
+        """
+        按页码遍历，去重并修正遍历期间的分页偏移
+        
+        total_items 减少时后续行整体前移，回退页码重新读取可能被跳过的页面
+        （整个遍历最多回退 SNAPSHOT_MAX_STEP_BACKS 次，避免总数来回抖动时无限循环）；
+        total_items 增加时后续行整体后移，重复的行被去重过滤。遍历结束时返回的行数
+        少于总数则说明有行插入到已读位置之前，由于插入位置未知，从第一页补扫，
+        补扫会重新下载已读页面（最多 SNAPSHOT_MAX_RESCANS 次），返回行数达到总数后立即停止。
+        没有偏移时每页只下载一次。
+        
+        Args:
+            fetch: 按页码获取一页
+            page_info: 返回 (是否有下一页, total_items)
+            items_attr: 页面中互动列表的属性名
+            per_page: 每页数量
+            
+        Yields:
+            PageT: 每一页，互动列表只包含首次出现的互动
+        """
+        snapshot = PageSnapshot(settings.SNAPSHOT_SEEN_MAX_IDS)
+        page = 1
+        step_backs = 0
+        rescans = 0
+        while True:
+            response = await fetch(page)
+            has_next, total_items = page_info(response)
+            shift = snapshot.observe(total_items)
+            if shift:
+                metrics.inc("pagination_shifts_detected")
+                logger.warning(f"分页偏移: page={page}, total_items 变化 {shift:+d}")
+            setattr(response, items_attr, snapshot.admit(getattr(response, items_attr)))
+            yield response
+            
+            if rescans and snapshot.complete:
+                # 补扫已找回遗漏的行
+                break
+            if shift < 0 and step_backs < settings.SNAPSHOT_MAX_STEP_BACKS:
+                step_backs += 1
+                page = max(1, page - math.ceil(-shift / per_page))
+            elif has_next:
+                page += 1
+            elif snapshot.shifted and not snapshot.complete and rescans < settings.SNAPSHOT_MAX_RESCANS:
+                rescans += 1
+                metrics.inc("pagination_rescans")
+                logger.warning(f"分页偏移导致遗漏，从第一页补扫: unique={snapshot.unique}, total_items={snapshot.total_items}")
+                page = 1
+            else:
+                break
+    
+    @staticmethod
+    async def iter_interaction_pages(
+        media_account: str,
+        x_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        per_page: int = 100,
+        priority: RequestPriority = RequestPriority.BATCH
+    ) -> AsyncIterator[TwitterInteractionResponse]:
+        """
+        逐页遍历 Twitter 互动数据
+        
+        遍历开始时固定 end_time（默认当前时间），按 interaction_id 去重并修正分页偏移
+        
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID过滤
+            start_time: 开始时间
+            end_time: 结束时间
+            per_page: 每页数量
+            priority: 上游请求优先级
+            
+        Yields:
+            TwitterInteractionResponse: 每一页的互动数据（只包含首次出现的互动）
+        """
+        end_time = TwitterService._snapshot_end_time(end_time)
+        
+        async def fetch(page: int) -> TwitterInteractionResponse:
+            return await TwitterService.get_interactions(
+                media_account=media_account,
+                page=page,
+                per_page=per_page,
+                x_id=x_id,
+                start_time=start_time,
+                end_time=end_time,
+                priority=priority
             )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Internal server error: {str(e)}"
+        
+        async for response in TwitterService._iter_snapshot_pages(
+            fetch,
+            lambda response: (response.pagination.has_next, response.pagination.total_items),
+            "interactions",
+            per_page
+        ):
+            yield response
+    
+    @staticmethod
+    async def iter_interaction_record_pages(
+        media_account: str,
+        x_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        per_page: int = 100,
+        priority: RequestPriority = RequestPriority.BATCH
+    ) -> AsyncIterator[InteractionRecordPage]:
+        """
+        逐页遍历精简互动记录，供内部扫描使用
+        
+        遍历开始时固定 end_time（默认当前时间），按 interaction_id 去重并修正分页偏移
+        
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID过滤
+            start_time: 开始时间
+            end_time: 结束时间
+            per_page: 每页数量
+            priority: 上游请求优先级
+            
+        Yields:
+            InteractionRecordPage: 每一页的精简记录（只包含首次出现的记录）
+        """
+        end_time = TwitterService._snapshot_end_time(end_time)
+        
+        async def fetch(page: int) -> InteractionRecordPage:
+            return await TwitterService.get_interaction_records(
+                media_account=media_account,
+                page=page,
+                per_page=per_page,
+                x_id=x_id,
+                start_time=start_time,
+                end_time=end_time,
+                priority=priority
             )
+        
+        async for records in TwitterService._iter_snapshot_pages(
+            fetch,
+            lambda records: (records.has_next, records.total_items),
+            "records",
+            per_page
+        ):
+            yield records
+    
+    @staticmethod
+    async def _collect_since(
+        pages: AsyncIterator[List[Union[Interaction, InteractionRecord]]],
+        watermark: InteractionWatermark
+    ) -> List[Union[Interaction, InteractionRecord]]:
+        new_interactions = []
+        seen_ids = set(watermark.boundary_ids)
+        async for interactions in pages:
+            for interaction in interactions:
+                if interaction.interaction_id not in seen_ids:
+                    seen_ids.add(interaction.interaction_id)
+                    new_interactions.append(interaction)
+        new_interactions.sort(key=lambda i: Utils.to_utc(i.interaction_time))
+        watermark.advance(new_interactions)
+        return new_interactions
+    
+    @staticmethod
+    async def fetch_interactions_since(
+        media_account: str,
+        watermark: InteractionWatermark,
+        end_time: Optional[datetime] = None
+    ) -> List[Interaction]:
+        """
+        拉取水位线之后的新互动数据并推进水位线
+        
+        Args:
+            media_account: 媒体账号
+            watermark: 水位线（会被更新）
+            end_time: 结束时间（可选）
+            
+        Returns:
+            List[Interaction]: 按 interaction_time 升序排列的新互动数据
+        """
+        return await TwitterService._collect_since(
+            (
+                response.interactions
+                async for response in TwitterService.iter_interaction_pages(
+                    media_account=media_account,
+                    start_time=watermark.since,
+                    end_time=end_time
+                )
+            ),
+            watermark
+        )
+    
+    @staticmethod
+    async def fetch_interaction_records_since(
+        media_account: str,
+        watermark: InteractionWatermark,
+        end_time: Optional[datetime] = None
+    ) -> List[InteractionRecord]:
+        """
+        拉取水位线之后的新精简互动记录并推进水位线
+        
+        Args:
+            media_account: 媒体账号
+            watermark: 水位线（会被更新）
+            end_time: 结束时间（可选）
+            
+        Returns:
+            List[InteractionRecord]: 按 interaction_time 升序排列的新精简记录
+        """
+        return await TwitterService._collect_since(
+            (
+                page.records
+                async for page in TwitterService.iter_interaction_record_pages(
+                    media_account=media_account,
+                    start_time=watermark.since,
+                    end_time=end_time
+                )
+            ),
+            watermark
+        )
+    
+    @staticmethod
+    async def collect_retweeters(
+        media_account: str,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[str, datetime]:
+        """
+        一次遍历采集服务数据，收集时间窗口内 retweet 过指定帖子的用户
+        
+        Args:
+            media_account: 媒体账号
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            Dict[str, datetime]: 去重后的用户ID到窗口内首次 retweet 时间的映射
+        """
+        retweeters: Dict[str, datetime] = {}
+        async for page in TwitterService.iter_interaction_record_pages(
+            media_account=media_account,
+            start_time=start_time,
+            end_time=end_time
+        ):
+            retweeter_filters.add_interactions(media_account, page.records)
+            for record in page.records:
+                if record.interaction_type != "retweet" or record.post_id != post_id:
+                    continue
+                first_time = retweeters.get(record.user_id)
+                if first_time is None or record.interaction_time < first_time:
+                    retweeters[record.user_id] = record.interaction_time
+        return retweeters
+    
+    @staticmethod
+    async def refresh_retweeter_filter(media_account: str) -> None:
+        """
+        建立或增量更新媒体账号的 retweet 用户过滤器
+        
+        首次调用完整扫描该账号的全部互动数据，之后只扫描上次覆盖时间之后的数据
+        
+        Args:
+            media_account: 媒体账号
+        """
+        state = retweeter_filters.state(media_account)
+        async with state.lock:
+            since = state.complete_until
+            scanned_until = datetime.now(timezone.utc)
+            state.building = since is None
+            try:
+                logger.info(f"更新 retweet 过滤器: media_account={media_account}, since={since}")
+                async for page in TwitterService.iter_interaction_record_pages(
+                    media_account=media_account,
+                    start_time=since,
+                    end_time=scanned_until
+                ):
+                    retweeter_filters.add_interactions(media_account, page.records)
+                retweeter_filters.mark_complete(media_account, scanned_until)
+            except Exception as e:
+                retweeter_filters.mark_failed(media_account)
+                logger.error(f"更新 retweet 过滤器失败: media_account={media_account}, error={str(e)}")
+            finally:
+                state.building = False
     
     @staticmethod
     async def subnet_tweet_task(
         method: str,
-        task_data: SubnetTweetTaskRequest
+        task_data: SubnetTweetTaskRequest,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
     ) -> SubnetTweetTaskResponse:
         """
         处理子网推文任务（创建、更新、删除）
@@ -141,6 +773,7 @@ class TwitterService:
         Args:
             method: HTTP 方法 (POST, PUT, DELETE)
             task_data: 任务数据
+            priority: 上游请求优先级（后台回收与频率调整使用 BATCH）
             
         Returns:
             SubnetTweetTaskResponse: 任务操作响应
@@ -160,44 +793,69 @@ class TwitterService:
         if method in ["POST", "PUT"]:
             request_data["update_frequency"] = task_data.update_frequency
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                if method == "DELETE":
-                    async with session.delete(url, json=request_data) as response:
-                        data = await response.json()
-                else:
-                    async with session.post(url, json=request_data) as response:
-                        data = await response.json()
-                
-                if response.status >= 400:
-                    return SubnetTweetTaskResponse(
-                        success=False,
-                        message=data.get("message", f"Request failed with status {response.status}")
-                    )
-                
-                # 根据原始响应的 status 字段判断成功与否
-                if data.get("status") == "success":
-                    return SubnetTweetTaskResponse(
-                        success=True,
-                        message=data.get("message", "Operation completed successfully")
-                    )
-                else:
-                    return SubnetTweetTaskResponse(
-                        success=False,
-                        message=data.get("message", "Operation failed")
-                    )
+        with tracer.span("twitter.subnet_tweet_task", method=method, media_account=task_data.media_account, priority=priority.value) as span:
+            try:
+                await outbound_limiter.acquire(task_data.media_account)
+                async with outbound_scheduler.slot(task_data.media_account, priority), aiohttp.ClientSession(timeout=Deadline.client_timeout()) as session:
+                    if method == "DELETE":
+                        async with session.delete(url, json=request_data, headers=tracer.inject_headers()) as response:
+                            data = await response.json()
+                    elif method == "PUT":
+                        async with session.put(url, json=request_data, headers=tracer.inject_headers()) as response:
+                            data = await response.json()
+                    else:
+                        async with session.post(url, json=request_data, headers=tracer.inject_headers()) as response:
+                            data = await response.json()
+                    if span is not None:
+                        span.set_attribute("status_code", response.status)
                     
-        except aiohttp.ClientError as e:
-            return SubnetTweetTaskResponse(
-                success=False,
-                message=f"Failed to connect to Twitter service: {str(e)}"
-            )
-        except Exception as e:
-            return SubnetTweetTaskResponse(
-                success=False,
-                message=f"Internal server error: {str(e)}"
-            )
-    
+                    if response.status == 429:
+                        outbound_limiter.penalize(
+                            task_data.media_account,
+                            outbound_limiter.parse_retry_after(
+                                response.headers.get("Retry-After"),
+                                default=settings.OUTBOUND_DEFAULT_RETRY_AFTER_SECONDS
+                            )
+                        )
+                    if response.status >= 400:
+                        return SubnetTweetTaskResponse(
+                            success=False,
+                            message=data.get("message", f"Request failed with status {response.status}")
+                        )
+                    
+                    # 根据原始响应的 status 字段判断成功与否
+                    if data.get("status") == "success":
+                        return SubnetTweetTaskResponse(
+                            success=True,
+                            message=data.get("message", "Operation completed successfully")
+                        )
+                    else:
+                        return SubnetTweetTaskResponse(
+                            success=False,
+                            message=data.get("message", "Operation failed")
+                        )
+                        
+            except RateLimitExceeded as e:
+                return SubnetTweetTaskResponse(
+                    success=False,
+                    message=f"Too many requests to Twitter service, retry after {math.ceil(e.retry_after)} seconds"
+                )
+            except (DeadlineExceeded, asyncio.TimeoutError):
+                return SubnetTweetTaskResponse(
+                    success=False,
+                    message="Timed out waiting for Twitter service"
+                )
+            except aiohttp.ClientError as e:
+                return SubnetTweetTaskResponse(
+                    success=False,
+                    message=f"Failed to connect to Twitter service: {str(e)}"
+                )
+            except Exception as e:
+                return SubnetTweetTaskResponse(
+                    success=False,
+                    message=f"Internal server error: {str(e)}"
+                )
+        
     @staticmethod
     async def check_user_retweet(
         media_account: str,
@@ -209,6 +867,8 @@ class TwitterService:
         """
         检测用户在指定时间段内是否有对特定帖子的retweet操作
         
+        先查询结果缓存，缓存无法回答时再扫描采集服务的分页数据并写回缓存
+        
         Args:
             media_account: 媒体账号
             x_id: 用户ID
@@ -222,42 +882,131 @@ class TwitterService:
         Raises:
             HTTPException: 当请求失败时抛出
         """
-        page = 1
-        per_page = 100  # 每页获取更多数据以提高效率
+        cached = retweet_cache.get(media_account, x_id, post_id, start_time, end_time)
+        if cached is not None:
+            logger.info(f"retweet 检测命中缓存: media_account={media_account}, x_id={x_id}, post_id={post_id}, result={cached}")
+            return cached
+        
+        scan_start = await TwitterService._narrow_with_retweeter_filter(
+            media_account=media_account,
+            x_id=x_id,
+            post_id=post_id,
+            start_time=start_time,
+            end_time=end_time
+        )
+        if scan_start is None:
+            match_time = None
+        else:
+            match_time = await TwitterService._scan_user_retweet(
+                media_account=media_account,
+                x_id=x_id,
+                post_id=post_id,
+                start_time=scan_start,
+                end_time=end_time
+            )
+        retweet_cache.put(media_account, x_id, post_id, start_time, end_time, match_time)
+        return match_time is not None
+    
+    @staticmethod
+    async def _narrow_with_retweeter_filter(
+        media_account: str,
+        x_id: str,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[datetime]:
+        """
+        使用 retweet 用户过滤器缩小需要扫描的时间窗口
+        
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            Optional[datetime]: 仍需扫描的窗口开始时间，无需扫描时返回 None
+        """
+        if not settings.RETWEETER_FILTER_ENABLED:
+            return start_time
+        
+        state = retweeter_filters.state(media_account)
+        if state.complete_until is None:
+            # 过滤器尚未建立，在后台完整扫描（失败后退避），本次请求照常扫描
+            if not retweeter_filters.refreshing(media_account) and not retweeter_filters.backing_off(media_account):
+                state.building = True
+                state.refresh_task = create_background_task(TwitterService.refresh_retweeter_filter(media_account))
+            return start_time
+        
+        if retweeter_filters.needs_refresh(media_account, end_time):
+            # 在后台增量更新，本次按当前覆盖时间判断，covered_until 之后的部分照常扫描
+            state.refresh_task = create_background_task(TwitterService.refresh_retweeter_filter(media_account))
+        
+        covered_until = retweeter_filters.covered_until(media_account, post_id)
+        if covered_until is None or retweeter_filters.might_contain(media_account, post_id, x_id):
+            return start_time
+        
+        # 过滤器确定用户在 covered_until 之前没有 retweet
+        if Utils.to_utc(end_time) <= covered_until:
+            metrics.inc("retweeter_filter_skipped_scans")
+            logger.info(f"retweet 过滤器判定不存在: media_account={media_account}, x_id={x_id}, post_id={post_id}")
+            return None
+        metrics.inc("retweeter_filter_narrowed_scans")
+        return max(Utils.to_utc(start_time), covered_until)
+    
+    @staticmethod
+    async def _scan_user_retweet(
+        media_account: str,
+        x_id: str,
+        post_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[datetime]:
+        """
+        逐页扫描采集服务数据，查找用户对特定帖子的retweet操作
+        
+        Args:
+            media_account: 媒体账号
+            x_id: 用户ID
+            post_id: 帖子ID
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            Optional[datetime]: 匹配的 retweet 的 interaction_time，未找到则返回 None
+            
+        Raises:
+            HTTPException: 当请求失败时抛出
+        """
+        page = 0
         
         try:
             logger.info(f"开始检测 retweet: media_account={media_account}, x_id={x_id}, post_id={post_id}")
-            while True:
-                # 调用现有的get_interactions服务获取数据
-                response = await TwitterService.get_interactions(
-                    media_account=media_account,
-                    page=page,
-                    per_page=per_page,
-                    x_id=x_id,
-                    start_time=start_time,
-                    end_time=end_time
-                )
-                
-                logger.info(f"第 {page} 页查询到 {len(response.interactions)} 条互动数据")
-                
-                # 检查当前页的interactions中是否有匹配的retweet操作
-                for interaction in response.interactions:
-                    # 检查是否是retweet操作且post_id匹配
-                    if (interaction.interaction_type.lower() == "retweet" and 
-                        interaction.post_id == post_id):
-                        logger.info(f"找到匹配的 retweet 操作: interaction_id={interaction.interaction_id}")
-                        return True
-                
-                # 如果没有找到retweet操作，检查是否还有下一页
-                if not response.pagination.has_next:
-                    logger.info("已查询完所有页面，未找到匹配的 retweet 操作")
-                    break
-                    
+            # 固定结束时间的快照遍历，只解码扫描需要的字段
+            async for records in TwitterService.iter_interaction_record_pages(
+                media_account=media_account,
+                x_id=x_id,
+                start_time=start_time,
+                end_time=end_time,
+                per_page=100,  # 每页获取更多数据以提高效率
+                priority=RequestPriority.BATCH
+            ):
                 page += 1
+                logger.info(f"第 {page} 页查询到 {len(records.records)} 条互动数据")
                 
+                # 检查当前页是否有匹配的retweet操作
+                for record in records.records:
+                    # 检查是否是retweet操作且post_id匹配
+                    if record.interaction_type == "retweet" and record.post_id == post_id:
+                        logger.info(f"找到匹配的 retweet 操作: interaction_id={record.interaction_id}")
+                        return record.interaction_time
+            
+            logger.info("已查询完所有页面，未找到匹配的 retweet 操作")
+            
             # 遍历完所有页面都没有找到retweet操作
             logger.info("retweet 检测完成: 未找到匹配操作")
-            return False
+            return None
             
         except HTTPException as e:
             # 如果是HTTP异常，重新抛出
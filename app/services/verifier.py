@@ -0,0 +1,172 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.crud.task import TaskCRUD
+from app.crud.verification import VerificationCRUD
+from app.db.base import SessionLocal
+from app.models.task import Task
+from app.schemas.enums import TaskType
+from app.schemas.flux import FluxVerificationBatchRequest, FluxVerifiedRetweet
+from app.services.flux import FluxService
+from app.services.twitter import InteractionWatermark, TwitterService
+from app.utils import Utils
+
+settings = get_settings()
+
+
+class RetweetVerifier:
+    """
+    后台 retweet 持续校验器
+
+    定期遍历全部 retweet 任务，按任务检查点增量拉取新互动，把新校验通过的 (task, user)
+    写入数据库后再分批、限速推送到 Flux。检查点与校验结果在同一事务中提交，
+    重启后从检查点继续，未推送的结果会在下一轮补推。
+    """
+
+    def __init__(self, interval: float, batch_size: int, push_interval: float):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._push_interval = push_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """启动后台校验循环"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("retweet 持续校验已启动")
+
+    async def stop(self) -> None:
+        """停止后台校验循环"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"retweet 持续校验失败: {str(e)}")
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> None:
+        """执行一轮校验与推送"""
+        db = SessionLocal()
+        try:
+            tasks = TaskCRUD.get_active_tasks(db, TaskType.TWITTER_RETWEET.value)
+            tasks_by_account: Dict[str, List[Task]] = defaultdict(list)
+            for task in tasks:
+                tasks_by_account[task.twitter_name].append(task)
+            for media_account, account_tasks in tasks_by_account.items():
+                await self._verify_account(db, media_account, account_tasks)
+            await self._push_pending(db)
+        finally:
+            db.close()
+
+    async def _verify_account(self, db: Session, media_account: str, tasks: List[Task]) -> None:
+        # 同一媒体账号的任务共用一次拉取，从最早的检查点开始
+        watermarks: Dict[int, InteractionWatermark] = {}
+        post_ids: Dict[int, str] = {}
+        for task in tasks:
+            try:
+                post_ids[task.task_id] = Utils.extract_tweet_id(task.url)
+            except Exception:
+                logger.warning(f"任务 URL 无法解析 tweet_id，跳过校验: task_id={task.task_id}")
+                continue
+            checkpoint = VerificationCRUD.get_checkpoint(db, task.task_id)
+            if checkpoint is None:
+                watermarks[task.task_id] = InteractionWatermark()
+            else:
+                watermarks[task.task_id] = InteractionWatermark(
+                    since=checkpoint.last_interaction_time,
+                    boundary_ids=set(json.loads(checkpoint.boundary_ids))
+                )
+        if not watermarks:
+            return
+        since_values = [w.since for w in watermarks.values()]
+        # 检查点之后仍在按原水位线判断，推进后的水位线单独记录，遍历结束后与结果一起提交
+        advanced = {
+            task_id: InteractionWatermark(since=w.since, boundary_ids=w.boundary_ids)
+            for task_id, w in watermarks.items()
+        }
+
+        # 采集服务在下一次轮询推文时才写入互动，只处理已稳定的数据，避免迟到的 retweet 落在检查点之前
+        settled_until = datetime.now(timezone.utc) - timedelta(seconds=settings.interaction_settle_seconds)
+        interaction_count = 0
+        # 逐页处理，不把整个历史读入内存，只保留各任务匹配到的用户
+        users: Dict[int, Dict[str, datetime]] = {task_id: {} for task_id in watermarks}
+        async for page in TwitterService.iter_interaction_record_pages(
+            media_account=media_account,
+            start_time=None if None in since_values else min(since_values),
+            end_time=settled_until
+        ):
+            interaction_count += len(page.records)
+            for task_id, watermark in watermarks.items():
+                task_users = users[task_id]
+                for interaction in page.records:
+                    if (interaction.interaction_type == "retweet"
+                            and interaction.post_id == post_ids[task_id]
+                            and watermark.admits(interaction)):
+                        first_time = task_users.get(interaction.user_id)
+                        if first_time is None or interaction.interaction_time < first_time:
+                            task_users[interaction.user_id] = interaction.interaction_time
+                advanced[task_id].advance(page.records)
+        if not interaction_count:
+            return
+
+        new_pairs = 0
+        for task_id, watermark in advanced.items():
+            new_pairs += VerificationCRUD.add_verified_retweets(db, task_id, users[task_id])
+            VerificationCRUD.save_checkpoint(db, task_id, watermark.since, watermark.boundary_ids)
+        db.commit()
+        metrics.inc("verifier_new_pairs", new_pairs)
+        logger.info(f"retweet 校验完成: media_account={media_account}, tasks={len(tasks)}, interactions={interaction_count}, new_pairs={new_pairs}")
+
+    async def _push_pending(self, db: Session) -> None:
+        tweet_ids: Dict[int, str] = {}
+        while True:
+            pending = VerificationCRUD.get_pending(db, limit=self._batch_size)
+            if not pending:
+                return
+            for item in pending:
+                if item.task_id not in tweet_ids:
+                    task = TaskCRUD.get_task_by_id(db, item.task_id)
+                    tweet_ids[item.task_id] = Utils.extract_tweet_id(task.url)
+            batch = FluxVerificationBatchRequest(verifications=[
+                FluxVerifiedRetweet(
+                    task_id=item.task_id,
+                    tweet_id=tweet_ids[item.task_id],
+                    user_id=item.user_id,
+                    interaction_time=item.interaction_time
+                )
+                for item in pending
+            ])
+            response = await FluxService.push_verified_retweets(batch)
+            if not response.success:
+                # 保留未推送状态，下一轮重试
+                metrics.inc("verifier_push_failures")
+                logger.error(f"推送校验结果到 Flux 失败: {response.message}")
+                return
+            VerificationCRUD.mark_pushed(db, [(item.task_id, item.user_id) for item in pending])
+            db.commit()
+            metrics.inc("verifier_pushed_pairs", len(pending))
+            logger.info(f"推送校验结果到 Flux: count={len(pending)}")
+            # 限速，避免集中请求 Flux
+            await asyncio.sleep(self._push_interval)
+
+
+retweet_verifier = RetweetVerifier(
+    interval=settings.VERIFIER_INTERVAL_SECONDS,
+    batch_size=settings.VERIFIER_BATCH_SIZE,
+    push_interval=settings.VERIFIER_PUSH_INTERVAL_SECONDS
+)
@@ -1,4 +1,6 @@
 import re
+from datetime import datetime, timezone
+from typing import Optional
 from fastapi import HTTPException
 
 class Utils:
@@ -27,3 +29,42 @@ class Utils:
             )
             
         return post_id
+    
+    @staticmethod
+    def to_utc(value: datetime) -> datetime:
+        """
+        将时间统一转换为带时区的 UTC 时间（无时区信息的时间按 UTC 处理）
+        
+        Args:
+            value: 待转换的时间
+            
+        Returns:
+            datetime: UTC 时间
+        """
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        判断 If-None-Match 请求头是否与 ETag 匹配（弱比较）
+        
+        Args:
+            if_none_match: If-None-Match 请求头的值
+            etag: 当前资源的 ETag（带引号）
+            
+        Returns:
+            bool: 匹配时返回 True
+        """
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == etag:
+                return True
+        return False
@@ -24,6 +24,8 @@ if config.config_file_name is not None:
 from app.db.base import Base
 from app.models.task import Task
 from app.models.project import Project
+from app.models.qualifying import QualifyingSnapshot, QualifyingUser
+from app.models.verification import VerifierCheckpoint, VerifiedRetweet
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
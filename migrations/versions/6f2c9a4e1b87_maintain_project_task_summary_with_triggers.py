@@ -0,0 +1,135 @@
+"""maintain project task summary with triggers
+
+Revision ID: 6f2c9a4e1b87
+Revises: 4d8a1f2c6e35
+Create Date: 2026-10-19 21:05:12.418930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2c9a4e1b87'
+down_revision: Union[str, Sequence[str], None] = '4d8a1f2c6e35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 语句级触发器按变更行汇总后更新项目摘要，任何写入 tasks 的路径（含批量删除与外键级联）都保持一致。
+    # 删除的任务包含当前最近任务时间时，通过 (project_id, created_time) 索引重新取最大值
+    op.execute("""
+        CREATE FUNCTION project_task_summary_remove() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects
+            SET task_count = projects.task_count - removed.task_count,
+                last_task_time = CASE
+                    WHEN removed.last_task_time >= projects.last_task_time THEN (
+                        SELECT MAX(tasks.created_time) FROM tasks WHERE tasks.project_id = projects.id
+                    )
+                    ELSE projects.last_task_time
+                END
+            FROM (
+                SELECT project_id, COUNT(*) AS task_count, MAX(created_time) AS last_task_time
+                FROM old_tasks
+                GROUP BY project_id
+            ) AS removed
+            WHERE projects.id = removed.project_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION project_task_summary_add() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects
+            SET task_count = projects.task_count + added.task_count,
+                last_task_time = GREATEST(projects.last_task_time, added.last_task_time)
+            FROM (
+                SELECT project_id, COUNT(*) AS task_count, MAX(created_time) AS last_task_time
+                FROM new_tasks
+                GROUP BY project_id
+            ) AS added
+            WHERE projects.id = added.project_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # 修改任务时只处理 project_id 或 created_time 变化的行，按先移出再加入计算
+    op.execute("""
+        CREATE FUNCTION project_task_summary_move() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects
+            SET task_count = projects.task_count - removed.task_count,
+                last_task_time = CASE
+                    WHEN removed.last_task_time >= projects.last_task_time THEN (
+                        SELECT MAX(tasks.created_time) FROM tasks WHERE tasks.project_id = projects.id
+                    )
+                    ELSE projects.last_task_time
+                END
+            FROM (
+                SELECT old_tasks.project_id, COUNT(*) AS task_count, MAX(old_tasks.created_time) AS last_task_time
+                FROM old_tasks JOIN new_tasks ON new_tasks.task_id = old_tasks.task_id
+                WHERE (old_tasks.project_id, old_tasks.created_time)
+                    IS DISTINCT FROM (new_tasks.project_id, new_tasks.created_time)
+                GROUP BY old_tasks.project_id
+            ) AS removed
+            WHERE projects.id = removed.project_id;
+            UPDATE projects
+            SET task_count = projects.task_count + added.task_count,
+                last_task_time = (
+                    SELECT MAX(tasks.created_time) FROM tasks WHERE tasks.project_id = projects.id
+                )
+            FROM (
+                SELECT new_tasks.project_id, COUNT(*) AS task_count
+                FROM old_tasks JOIN new_tasks ON new_tasks.task_id = old_tasks.task_id
+                WHERE (old_tasks.project_id, old_tasks.created_time)
+                    IS DISTINCT FROM (new_tasks.project_id, new_tasks.created_time)
+                GROUP BY new_tasks.project_id
+            ) AS added
+            WHERE projects.id = added.project_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_project_summary_insert
+        AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_summary_add()
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_project_summary_delete
+        AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_summary_remove()
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_project_summary_update
+        AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_summary_move()
+    """)
+    # 之前由应用在创建任务时自增，最近任务时间取的是写入时间；按任务表重新计算
+    op.execute("""
+        UPDATE projects
+        SET task_count = COALESCE(summary.task_count, 0), last_task_time = summary.last_task_time
+        FROM projects AS p
+        LEFT JOIN (
+            SELECT project_id, COUNT(*) AS task_count, MAX(created_time) AS last_task_time
+            FROM tasks
+            GROUP BY project_id
+        ) AS summary ON summary.project_id = p.id
+        WHERE projects.id = p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_project_summary_update ON tasks")
+    op.execute("DROP TRIGGER tasks_project_summary_delete ON tasks")
+    op.execute("DROP TRIGGER tasks_project_summary_insert ON tasks")
+    op.execute("DROP FUNCTION project_task_summary_move()")
+    op.execute("DROP FUNCTION project_task_summary_remove()")
+    op.execute("DROP FUNCTION project_task_summary_add()")
@@ -0,0 +1,91 @@
+"""
+项目任务摘要测试
+
+创建、批量删除与移动任务后，项目表中由触发器维护的摘要（cached=True）应与实时统计（cached=False）一致。
+需要已执行 alembic upgrade head 的 PostgreSQL（DATABASE_URL），无法连接时跳过。
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.crud.base import CRUDBase
+from app.crud.project import ProjectCRUD
+from app.models.task import Task
+
+settings = get_settings()
+
+task_crud = CRUDBase(Task)
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    engine = create_engine(settings.DATABASE_URL, connect_args={"connect_timeout": 3})
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("DATABASE_URL is not reachable")
+
+    session = sessionmaker(bind=engine)()
+    try:
+        # 测试数据在事务内写入，测试结束后回滚
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        engine.dispose()
+
+
+def _summaries(db: Session, cached: bool, project_ids) -> dict:
+    rows = ProjectCRUD.get_projects_with_summary(db, limit=1000, after_id=min(project_ids) - 1, cached=cached)
+    return {
+        project.id: (task_count or 0, last_task_time)
+        for project, task_count, last_task_time in rows
+        if project.id in project_ids
+    }
+
+
+def _assert_consistent(db: Session, project_ids) -> None:
+    db.flush()
+    db.expire_all()
+    assert _summaries(db, True, project_ids) == _summaries(db, False, project_ids)
+
+
+def test_summary_tracks_task_changes(db: Session):
+    projects = [ProjectCRUD.create_project(db, name=f"summary project {i}") for i in range(2)]
+    db.flush()
+    project_ids = {project.id for project in projects}
+    first, second = projects[0].id, projects[1].id
+    now = datetime.now(timezone.utc)
+
+    task_crud.bulk_create(db, objs_in=[
+        {
+            "twitter_name": "summary",
+            "description": "",
+            "type": "twitter_retweet",
+            "url": f"https://x.com/summary/status/{i}",
+            "project_id": first if i % 2 else second,
+            "created_time": now - timedelta(minutes=i)
+        }
+        for i in range(10)
+    ])
+    _assert_consistent(db, project_ids)
+
+    tasks = db.query(Task).filter(Task.project_id.in_(project_ids)).order_by(Task.created_time.desc()).all()
+    # 删除包含最近任务的一批任务，最近任务时间需要回退
+    task_crud.delete_many(db, ids=[task.task_id for task in tasks[:3]])
+    _assert_consistent(db, project_ids)
+
+    remaining = db.query(Task).filter(Task.project_id == first).all()
+    task_crud.update_many(db, ids=[task.task_id for task in remaining], obj_in={"project_id": second})
+    _assert_consistent(db, project_ids)
+    assert _summaries(db, True, project_ids)[first] == (0, None)
+
+    task_crud.delete_by_id(db, id=tasks[-1].task_id)
+    _assert_consistent(db, project_ids)
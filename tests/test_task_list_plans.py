@@ -0,0 +1,149 @@
+"""
+任务列表查询计划测试
+
+对 TaskCRUD 的列表分页查询与计数查询执行 EXPLAIN，确认每种过滤组合都使用对应的 ix_tasks_* 索引。
+需要已执行 alembic upgrade head 的 PostgreSQL（DATABASE_URL），无法连接时跳过。
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Set
+
+import pytest
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.crud.task import TaskCRUD
+from app.models.task import Task
+
+settings = get_settings()
+
+# 测试数据规模；每个钱包、项目约占 0.5%，查询的任务类型约占 1%
+ROWS = 20000
+WALLETS = 200
+PROJECTS = 200
+RARE_TYPE_EVERY = 100
+
+WALLET = "0xplan7"
+TASK_TYPE = "plan_rare"
+
+WALLET_INDEXES = {"ix_tasks_user_wallet_created_time", "ix_tasks_user_wallet_type_created_time"}
+PROJECT_INDEXES = {"ix_tasks_project_id_created_time", "ix_tasks_project_id_type_created_time"}
+
+# (过滤条件, 分页查询应使用的索引, 计数查询可接受的索引)；project_id 为 None 时使用测试数据中的项目。
+# 分页查询按 created_time 倒序，需要 (过滤列, created_time) 索引直接提供顺序；
+# 计数查询不排序，以过滤列开头的索引均可。钱包与项目同时过滤时没有专门的组合索引，以钱包或项目开头的索引均可
+CASES = [
+    ({"user_wallet": WALLET}, {"ix_tasks_user_wallet_created_time"}, WALLET_INDEXES),
+    ({"project_id": None}, {"ix_tasks_project_id_created_time"}, PROJECT_INDEXES),
+    ({"task_type": TASK_TYPE}, {"ix_tasks_type_created_time"}, {"ix_tasks_type_created_time"}),
+    (
+        {"user_wallet": WALLET, "task_type": TASK_TYPE},
+        {"ix_tasks_user_wallet_type_created_time"},
+        {"ix_tasks_user_wallet_type_created_time"}
+    ),
+    (
+        {"project_id": None, "task_type": TASK_TYPE},
+        {"ix_tasks_project_id_type_created_time"},
+        {"ix_tasks_project_id_type_created_time"}
+    ),
+    ({"user_wallet": WALLET, "project_id": None}, WALLET_INDEXES | PROJECT_INDEXES, WALLET_INDEXES | PROJECT_INDEXES),
+    ({}, {"ix_tasks_created_time"}, {"ix_tasks_created_time"}),
+]
+CASE_IDS = ["+".join(case) or "none" for case, _, _ in CASES]
+
+
+@pytest.fixture(scope="module")
+def db() -> Iterator[Session]:
+    engine = create_engine(settings.DATABASE_URL, connect_args={"connect_timeout": 3})
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("DATABASE_URL is not reachable")
+
+    session = sessionmaker(bind=engine)()
+    try:
+        # 在事务内写入测试数据并收集统计信息，测试结束后回滚
+        project_ids = list(session.execute(
+            text(
+                "INSERT INTO projects (name) SELECT 'plan project ' || i FROM generate_series(1, :projects) AS i "
+                "RETURNING id"
+            ),
+            {"projects": PROJECTS}
+        ).scalars())
+        session.execute(
+            text(
+                "INSERT INTO tasks (twitter_name, description, type, url, user_wallet, created_time, project_id) "
+                "SELECT 'plan', '', CASE WHEN i % :rare_every = 0 THEN 'plan_rare' ELSE 'twitter_retweet' END, "
+                "'https://x.com/plan/status/' || i, '0xplan' || (i % :wallets), now() - (i || ' minutes')::interval, "
+                "(:project_ids)[1 + i % :projects] "
+                "FROM generate_series(1, :rows) AS i"
+            ),
+            {
+                "rare_every": RARE_TYPE_EVERY,
+                "wallets": WALLETS,
+                "projects": PROJECTS,
+                "project_ids": project_ids,
+                "rows": ROWS
+            }
+        )
+        session.execute(text("ANALYZE tasks"))
+        session.execute(text("ANALYZE projects"))
+        # 只比较各索引的代价，避免小表上选择顺序扫描或位图扫描合并多个索引
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        session.info["project_id"] = project_ids[0]
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        engine.dispose()
+
+
+def _index_names(plan: dict) -> Set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _explain(db: Session, statement) -> Set[str]:
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    result = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return {name for name in _index_names(plan[0]["Plan"]) if name.startswith("ix_tasks_")}
+
+
+def _filters(db: Session, case: dict, created_range: bool) -> List:
+    project_id = db.info["project_id"] if "project_id" in case else None
+    now = datetime.now(timezone.utc)
+    created_from: Optional[datetime] = now - timedelta(days=7) if created_range else None
+    created_to: Optional[datetime] = now if created_range else None
+    return TaskCRUD._list_filters(
+        case.get("user_wallet"),
+        project_id,
+        case.get("task_type"),
+        created_from,
+        created_to
+    )
+
+
+@pytest.mark.parametrize("created_range", [False, True], ids=["all_time", "created_range"])
+@pytest.mark.parametrize("case,expected", [(case, page) for case, page, _ in CASES], ids=CASE_IDS)
+def test_list_page_uses_index(db: Session, case: dict, expected: Set[str], created_range: bool):
+    statement = TaskCRUD._list_page_query(db, _filters(db, case, created_range), limit=10, offset=0).statement
+    used = _explain(db, statement)
+    assert used & expected, f"expected one of {sorted(expected)}, plan used {sorted(used)}"
+
+
+@pytest.mark.parametrize("created_range", [False, True], ids=["all_time", "created_range"])
+@pytest.mark.parametrize("case,expected", [(case, count) for case, _, count in CASES], ids=CASE_IDS)
+def test_list_count_uses_index(db: Session, case: dict, expected: Set[str], created_range: bool):
+    if not case and not created_range:
+        pytest.skip("unfiltered count scans the whole table")
+    statement = db.query(func.count(Task.task_id)).filter(*_filters(db, case, created_range)).statement
+    used = _explain(db, statement)
+    assert used & expected, f"expected one of {sorted(expected)}, plan used {sorted(used)}"